@@ -646,6 +646,14 @@ the NVDAObject for IAccessible
 		if None not in (event_windowHandle,event_objectID,event_childID):
 			IAccessibleHandler.liveNVDAObjectTable[(event_windowHandle,event_objectID,event_childID)]=self
 
+	def _get_eventCoalescingKey(self):
+		if None in (self.event_windowHandle,self.event_objectID,self.event_childID):
+			return None
+		# The childID of an MSAA child element could be reused for another element (see isDuplicateIAccessibleEvent).
+		if self.IAccessibleChildID>0:
+			return None
+		return ("IAccessible",self.event_windowHandle,self.event_objectID,self.event_childID)
+
 	def isDuplicateIAccessibleEvent(self,obj):
 		"""Compaires the object of an event to self to see if the event should be treeted as duplicate."""
 		#MSAA child elements do not have unique winEvent params as a childID could be reused if an element was deleted etc
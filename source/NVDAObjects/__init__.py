@@ -324,6 +324,16 @@ class NVDAObject(with_metaclass(DynamicNVDAObjectType, documentBase.TextContaine
 		"""
 		return not self.__eq__(other)
 
+	def _get_eventCoalescingKey(self):
+		"""A hashable key identifying this object when merging superseded events queued for it
+		(see L{eventHandler.coalescedEvents}).
+		APIs often create a new object for every event,
+		so this allows events queued for distinct but equal objects to be merged.
+		Objects with equal keys must be equal.
+		@return: The key, or C{None} to only merge events queued for this instance.
+		"""
+		return None
+
 	focusRedirect=None #: Another object which should be treeted as the focus if focus is ever given to this object.
 
 	def _get_treeInterceptorClass(self):
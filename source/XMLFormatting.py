@@ -3,13 +3,37 @@ import textInfos
 from logHandler import log
 
 class XMLTextParser(object): 
+	"""Parses XML describing text and fields into text and L{textInfos.FieldCommand}s.
+	A parser can be used to parse any number of XML strings, but only one at a time.
+	"""
 
-	def __init__(self):
-		self.parser=expat.ParserCreate('utf-8')
-		self.parser.StartElementHandler=self._startElementHandler
-		self.parser.EndElementHandler=self._EndElementHandler
-		self.parser.CharacterDataHandler=self._CharacterDataHandler
+	#: The number of characters of XML which L{iterParse} parses at a time.
+	CHUNK_SIZE=8192
+
+	def __init__(self,normalizeControlField=None,normalizeFormatField=None):
+		"""
+		@param normalizeControlField: Called with each L{textInfos.ControlField} as soon as it is parsed,
+			returning the field to use in its place; e.g. with attribute values converted from strings.
+		@type normalizeControlField: callable
+		@param normalizeFormatField: Called with each L{textInfos.FormatField} as soon as it is parsed,
+			returning the field to use in its place.
+		@type normalizeFormatField: callable
+		"""
+		self.normalizeControlField=normalizeControlField
+		self.normalizeFormatField=normalizeFormatField
 		self._commandList=[]
+		#: Whether parsing stopped because a normalize function raised an exception,
+		#: in which case the exception is propagated rather than logged as an error in the XML.
+		self._normalizeFailed=False
+
+	def _createParser(self):
+		parser=expat.ParserCreate('utf-8')
+		# Report runs of text in one call rather than splitting them at new lines and entities.
+		parser.buffer_text=True
+		parser.StartElementHandler=self._startElementHandler
+		parser.EndElementHandler=self._EndElementHandler
+		parser.CharacterDataHandler=self._CharacterDataHandler
+		return parser
 
 	def _startElementHandler(self,tagName,attrs):
 		if tagName=='unich':
@@ -23,22 +47,30 @@ class XMLTextParser(object):
 			return
 		elif tagName=='control':
 			newAttrs=textInfos.ControlField(attrs)
-			self._commandList.append(textInfos.FieldCommand("controlStart",newAttrs))
+			command="controlStart"
+			normalize=self.normalizeControlField
 		elif tagName=='text':
 			newAttrs=textInfos.FormatField(attrs)
-			self._commandList.append(textInfos.FieldCommand("formatChange",newAttrs))
+			command="formatChange"
+			normalize=self.normalizeFormatField
 		else:
 			raise ValueError("Unknown tag name: %s"%tagName)
 
 		# Normalise attributes common to both field types.
-		try:
-			newAttrs["_startOfNode"] = newAttrs["_startOfNode"] == "1"
-		except KeyError:
-			pass
-		try:
-			newAttrs["_endOfNode"] = newAttrs["_endOfNode"] == "1"
-		except KeyError:
-			pass
+		# Most fields have neither, so avoid the cost of raising KeyError.
+		startOfNode=attrs.get("_startOfNode")
+		if startOfNode is not None:
+			newAttrs["_startOfNode"] = startOfNode == "1"
+		endOfNode=attrs.get("_endOfNode")
+		if endOfNode is not None:
+			newAttrs["_endOfNode"] = endOfNode == "1"
+		if normalize:
+			try:
+				newAttrs=normalize(newAttrs)
+			except:
+				self._normalizeFailed=True
+				raise
+		self._commandList.append(textInfos.FieldCommand(command,newAttrs))
 
 	def _EndElementHandler(self,tagName):
 		if tagName=="control":
@@ -56,8 +88,56 @@ class XMLTextParser(object):
 			cmdList.append(data)
 
 	def parse(self,XMLText):
+		"""Parses XML text.
+		@param XMLText: The XML to parse.
+		@type XMLText: unicode
+		@return: The text and L{textInfos.FieldCommand}s.
+		@rtype: list
+		"""
+		commandList=self._commandList=[]
+		self._normalizeFailed=False
 		try:
-			self.parser.Parse(XMLText.encode('utf-8'))
+			self._createParser().Parse(XMLText.encode('utf-8'))
 		except:
+			if self._normalizeFailed:
+				raise
 			log.error("XML: %s"%XMLText,exc_info=True)
-		return self._commandList
+		self._commandList=[]
+		return commandList
+
+	def iterParse(self,XMLText):
+		"""Parses XML text, yielding the text and L{textInfos.FieldCommand}s as they are parsed.
+		The XML is parsed in chunks of L{CHUNK_SIZE} characters as the caller iterates,
+		so if the caller stops early, e.g. because it only needs the initial fields,
+		the rest isn't encoded or parsed.
+		The results are the same as those of L{parse}.
+		@param XMLText: The XML to parse.
+		@type XMLText: unicode
+		@rtype: generator
+		"""
+		parser=self._createParser()
+		self._commandList=[]
+		self._normalizeFailed=False
+		length=len(XMLText)
+		start=0
+		while start<length:
+			end=start+self.CHUNK_SIZE
+			# Don't split a surrogate pair, as its halves can't be encoded separately.
+			if end<length and u"\ud800"<=XMLText[end-1]<=u"\udbff":
+				end+=1
+			try:
+				parser.Parse(XMLText[start:end].encode('utf-8'))
+			except:
+				if self._normalizeFailed:
+					raise
+				log.error("XML: %s"%XMLText,exc_info=True)
+				end=length
+			start=end
+			commandList=self._commandList
+			# Text at the end of this chunk might be continued in the next.
+			if start<length and commandList and isinstance(commandList[-1],basestring):
+				self._commandList=[commandList.pop()]
+			else:
+				self._commandList=[]
+			for command in commandList:
+				yield command
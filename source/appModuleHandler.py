@@ -208,6 +208,8 @@ def reloadAppModules():
 		del sys.modules[mod]
 	import appModules
 	initialize()
+	import eventHandler
+	eventHandler.invalidateHandlerCaches()
 	for entry in state:
 		pid = entry.pop("processID")
 		mod = getAppModuleFromProcessID(pid)
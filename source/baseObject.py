@@ -12,6 +12,27 @@ from logHandler import log
 from abc import ABCMeta, abstractproperty
 from six import with_metaclass
 
+#: A value for C{_cache_x} on an L{AutoPropertyObject}
+#: which caches property x until L{AutoPropertyObject.invalidateCache} is called on the object,
+#: rather than only for the current core pump cycle.
+#: Only use this for properties whose value can't change while the object is alive.
+CACHE_UNTIL_INVALIDATED = "untilInvalidated"
+
+#: The current cache generation.
+#: Cached property values fetched in an older generation are out of date.
+#: This is incremented by L{AutoPropertyObject.invalidateCaches}.
+#: @type: int
+_cacheGeneration = 0
+#: Weak references to the instances which cached a property value in the current cache generation.
+#: Their caches are cleared by L{AutoPropertyObject.invalidateCaches},
+#: so that cached values don't keep objects alive beyond the core pump cycle.
+#: @type: list
+_instancesWithCachedValues = []
+#: Maps classes to lists of [hits, misses] for cached properties,
+#: or C{None} if statistics aren't being collected.
+#: @type: dict
+_cacheStatistics = None
+
 class Getter(object):
 
 	def __init__(self,fget, abstract=False):
@@ -38,13 +59,20 @@ class Getter(object):
 
 class CachingGetter(Getter):
 
+	def __init__(self, fget, abstract=False, untilInvalidated=False):
+		super(CachingGetter, self).__init__(fget, abstract)
+		#: Whether the value is cached until the cache of the object is explicitly invalidated,
+		#: rather than only for the current cache generation.
+		#: @type: bool
+		self.untilInvalidated = untilInvalidated
+
 	def __get__(self, instance, owner):
 		if isinstance(self.fget, classmethod):
 			log.warning("Class properties do not support caching")
 			return self.fget.__get__(instance, owner)()
 		elif not instance:
 			return self
-		return instance._getPropertyViaCache(self.fget)
+		return instance._getPropertyViaCache(self.fget, self.untilInvalidated)
 
 class AutoPropertyType(ABCMeta):
 
@@ -91,7 +119,10 @@ class AutoPropertyType(ABCMeta):
 
 			abstract=dict.get('_abstract_%s'%x,False)
 			if g and not (s or d):
-				attr = (CachingGetter if cache else Getter)(g,abstract)
+				if cache:
+					attr = CachingGetter(g, abstract, untilInvalidated=cache == CACHE_UNTIL_INVALIDATED)
+				else:
+					attr = Getter(g, abstract)
 			else:
 				attr = (abstractproperty if abstract else property)(fget=g,fset=s,fdel=d)
 			if abstract:
@@ -115,15 +146,14 @@ class AutoPropertyObject(with_metaclass(AutoPropertyType, object)):
 	For example, several NVDAObject properties are fetched by both braille and speech.
 	Setting _cache_x to C{True} specifies that x should be cached.
 	Setting it to C{False} specifies that it should not be cached.
+	Setting it to L{CACHE_UNTIL_INVALIDATED} specifies that x should be cached
+	until L{invalidateCache} is called on the instance, rather than for one core pump cycle.
 	If _cache_x is not set, L{cachePropertiesByDefault} is used.
 	Properties can also be made abstract.
 	Setting _abstract_x to C{True} specifies that x should be abstract.
 	Setting it to C{False} specifies that it should not be abstract.
 	"""
 
-	#: Tracks the instances of this class; used by L{invalidateCaches}.
-	#: @type: weakref.WeakKeyDictionary
-	__instances=weakref.WeakKeyDictionary()
 	#: Specifies whether properties are cached by default;
 	#: can be overridden for individual properties by setting _cache_propertyName.
 	#: @type: bool
@@ -132,33 +162,90 @@ class AutoPropertyObject(with_metaclass(AutoPropertyType, object)):
 
 	def __new__(cls, *args, **kwargs):
 		self = super(AutoPropertyObject, cls).__new__(cls)
-		#: Maps properties to cached values.
+		#: Maps property getters to tuples of (cache generation, value).
+		#: The generation is C{None} for values cached until invalidated.
 		#: @type: dict
 		self._propertyCache={}
-		self.__instances[self]=None
+		#: The cache generation in which this instance was last added to L{_instancesWithCachedValues}.
+		self._cacheWriteGeneration=None
 		return self
 
-	def _getPropertyViaCache(self,getterMethod=None):
+	def _getPropertyViaCache(self,getterMethod=None,untilInvalidated=False):
 		if not getterMethod:
 			raise ValueError("getterMethod is None")
+		entry=self._propertyCache.get(getterMethod)
+		if entry is not None and (entry[0]==_cacheGeneration or entry[0] is None):
+			if _cacheStatistics is not None:
+				self._countCacheLookup(0)
+			return entry[1]
+		if _cacheStatistics is not None:
+			self._countCacheLookup(1)
+		val=getterMethod(self)
+		if untilInvalidated:
+			self._propertyCache[getterMethod]=(None, val)
+			return val
+		generation=_cacheGeneration
+		self._propertyCache[getterMethod]=(generation, val)
+		if self._cacheWriteGeneration!=generation:
+			self._cacheWriteGeneration=generation
+			_instancesWithCachedValues.append(weakref.ref(self))
+		return val
+
+	def _countCacheLookup(self, index):
 		try:
-			val=self._propertyCache[getterMethod]
+			counts=_cacheStatistics[self.__class__]
 		except KeyError:
-			val=getterMethod(self)
-			self._propertyCache[getterMethod]=val
-		return val
+			counts=_cacheStatistics[self.__class__]=[0, 0]
+		counts[index]+=1
 
 	def invalidateCache(self):
+		"""Invalidate the cache for this instance,
+		including properties cached until invalidated.
+		"""
 		self._propertyCache.clear()
 
 	@classmethod
 	def invalidateCaches(cls):
 		"""Invalidate the caches for all current instances.
+		Properties cached until invalidated are kept.
+		This starts a new cache generation, making all values cached in earlier generations out of date,
+		and releases the values cached by the instances which cached a value in the last generation.
+		Other instances aren't visited.
+		"""
+		global _cacheGeneration, _instancesWithCachedValues
+		_cacheGeneration+=1
+		instances=_instancesWithCachedValues
+		_instancesWithCachedValues=[]
+		for ref in instances:
+			obj=ref()
+			if obj is None:
+				continue
+			cache=obj._propertyCache
+			for key in [key for key,entry in cache.items() if entry[0] is not None]:
+				# Another thread might have removed this entry.
+				cache.pop(key,None)
+
+	@classmethod
+	def enableCacheStatistics(cls, enable=True):
+		"""Starts or stops collecting statistics about cached property lookups.
+		Starting discards any statistics collected so far.
+		@type enable: bool
+		"""
+		global _cacheStatistics
+		_cacheStatistics = {} if enable else None
+
+	@classmethod
+	def getCacheStatistics(cls):
+		"""Gets the number of cached property lookups which found an up to date value (hits)
+		and which had to fetch the value (misses) for each class.
+		@return: Maps class names to dicts with hits and misses,
+			or C{None} if statistics aren't being collected.
+		@rtype: dict
 		"""
-		# We use keys() here instead of iterkeys(), as invalidating the cache on an object may cause instances to disappear,
-		# which would in turn cause an exception due to the dictionary changing size during iteration.
-		for instance in cls.__instances.keys():
-			instance.invalidateCache()
+		if _cacheStatistics is None:
+			return None
+		return {"%s.%s" % (instCls.__module__, instCls.__name__): {"hits": hits, "misses": misses}
+			for instCls, (hits, misses) in _cacheStatistics.iteritems()}
 
 class ScriptableType(AutoPropertyType):
 	"""A metaclass used for collecting and caching gestures on a ScriptableObject"""
@@ -200,6 +287,10 @@ class ScriptableObject(with_metaclass(ScriptableType, AutoPropertyObject)):
 	@type scriptCategory: basestring
 	"""
 
+	#: Incremented whenever L{_gestureMap} changes, so that scripts found for this object can be cached.
+	#: @type: int
+	_gestureMapVersion = 0
+
 	def __init__(self):
 		#: Maps input gestures to script functions.
 		#: @type: dict
@@ -237,6 +328,7 @@ class ScriptableObject(with_metaclass(ScriptableType, AutoPropertyObject)):
 		# Import late to avoid circular import.
 		import inputCore
 		self._gestureMap[inputCore.normalizeGestureIdentifier(gestureIdentifier)] = func
+		self._gestureMapVersion += 1
 
 	def removeGestureBinding(self,gestureIdentifier):
 		"""
@@ -248,11 +340,13 @@ class ScriptableObject(with_metaclass(ScriptableType, AutoPropertyObject)):
 		# Import late to avoid circular import.
 		import inputCore
 		del self._gestureMap[inputCore.normalizeGestureIdentifier(gestureIdentifier)]
+		self._gestureMapVersion += 1
 
 	def clearGestureBindings(self):
 		"""Remove all input gesture bindings from this object.
 		"""
 		self._gestureMap.clear()
+		self._gestureMapVersion += 1
 
 	def bindGestures(self, gestureMap):
 		"""Bind or unbind multiple input gestures.
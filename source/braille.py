@@ -30,10 +30,12 @@ import brailleTables
 import re
 import scriptHandler
 import collections
+import bisect
 import extensionPoints
 import hwPortUtils
 import bdDetect
 import winUser
+import tracing
 
 roleLabels = {
 	# Translators: Displayed in braille for an object which is a
@@ -416,10 +418,10 @@ class Region(object):
 		@postcondition: L{brailleCells}, L{brailleCursorPos}, L{brailleSelectionStart} and L{brailleSelectionEnd} are updated and ready for rendering.
 		"""
 		mode = louis.dotsIO
-		if config.conf["braille"]["expandAtCursor"] and self.cursorPos is not None:
+		if config.conf.getValue(("braille", "expandAtCursor")) and self.cursorPos is not None:
 			mode |= louis.compbrlAtCursor
 		self.brailleCells, self.brailleToRawPos, self.rawToBraillePos, self.brailleCursorPos = louisHelper.translate(
-			[os.path.join(brailleTables.TABLES_DIR, config.conf["braille"]["translationTable"]),
+			[os.path.join(brailleTables.TABLES_DIR, config.conf.getValue(("braille", "translationTable"))),
 				"braille-patterns.cti"],
 			self.rawText,
 			typeform=self.rawTextTypeforms,
@@ -488,7 +490,7 @@ def getBrailleTextForProperties(**propertyValues):
 			roleText = _("h%s") % level
 			level = None
 		elif role == controlTypes.ROLE_LINK and states and controlTypes.STATE_VISITED in states:
-			states = states.copy()
+			states = set(states)
 			states.discard(controlTypes.STATE_VISITED)
 			# Translators: Displayed in braille for a link which has been visited.
 			roleText = _("vlnk")
@@ -904,7 +906,7 @@ class TextInfoRegion(Region):
 		info.obj._brailleFormatFieldAttributesCache = formatFieldAttributesCache
 
 	def _getReadingUnit(self):
-		return textInfos.UNIT_PARAGRAPH if config.conf["braille"]["readByParagraph"] else textInfos.UNIT_LINE
+		return textInfos.UNIT_PARAGRAPH if config.conf.getValue(("braille", "readByParagraph")) else textInfos.UNIT_LINE
 
 	def update(self):
 		formatConfig = config.conf["documentFormatting"]
@@ -1120,6 +1122,38 @@ def rindex(seq, item, start, end):
 			return index
 	raise ValueError("%r is not in sequence" % item)
 
+class _ConcatenatedPositions(collections.Sequence):
+	"""A read-only view of the position mappings of several regions as one mapping for a whole buffer.
+	The mappings aren't copied; a position is found by a binary search of the region starts.
+	"""
+
+	def __init__(self, maps, valueOffsets):
+		"""
+		@param maps: The position mappings of each region.
+		@type maps: list of list of int
+		@param valueOffsets: The offset to add to the positions from each region's mapping.
+		@type valueOffsets: list of int
+		"""
+		self._maps = maps
+		self._valueOffsets = valueOffsets
+		#: The positions in this mapping where each region's mapping starts, plus the total length.
+		self._starts = starts = [0]
+		for positions in maps:
+			starts.append(starts[-1] + len(positions))
+
+	def __len__(self):
+		return self._starts[-1]
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return [self[i] for i in xrange(*index.indices(len(self)))]
+		if index < 0:
+			index += len(self)
+		if not 0 <= index < len(self):
+			raise IndexError("position out of range")
+		regionIndex = bisect.bisect_right(self._starts, index) - 1
+		return self._maps[regionIndex][index - self._starts[regionIndex]] + self._valueOffsets[regionIndex]
+
 class BrailleBuffer(baseObject.AutoPropertyObject):
 
 	def __init__(self, handler):
@@ -1138,6 +1172,22 @@ class BrailleBuffer(baseObject.AutoPropertyObject):
 		#: The position in L{brailleCells} where the display window starts (inclusive).
 		#: @type: int
 		self.windowStartPos = 0
+		self._resetPositions()
+
+	def _resetPositions(self):
+		"""Resets the positions of the visible regions, which are maintained by L{update}."""
+		#: The regions when L{update} was last called, used to check whether a region can be updated on its own.
+		self._updatedRegions = []
+		#: The visible regions when L{update} was last called.
+		self._visibleRegionsList = []
+		#: Maps each visible region to its index in L{_visibleRegionsList}.
+		self._regionIndexes = {}
+		#: The positions in L{brailleCells} where each visible region starts, plus the total length.
+		self._brailleStarts = [0]
+		#: The positions in L{rawText} where each visible region starts, plus the total length.
+		self._rawStarts = [0]
+		self._rawToBraillePos = None
+		self._brailleToRawPos = None
 
 	def clear(self):
 		"""Clear the entire buffer.
@@ -1149,6 +1199,7 @@ class BrailleBuffer(baseObject.AutoPropertyObject):
 		self.brailleCursorPos = None
 		self.brailleCells = []
 		self.windowStartPos = 0
+		self._resetPositions()
 
 	def _get_visibleRegions(self):
 		if not self.regions:
@@ -1160,54 +1211,57 @@ class BrailleBuffer(baseObject.AutoPropertyObject):
 			yield region
 
 	def _get_regionsWithPositions(self):
-		start = 0
-		for region in self.visibleRegions:
-			end = start + len(region.brailleCells)
-			yield RegionWithPositions(region, start, end)
-			start = end
+		"""The visible regions with their start and end positions in L{brailleCells}, as of the last L{update}."""
+		starts = self._brailleStarts
+		for index, region in enumerate(self._visibleRegionsList):
+			yield RegionWithPositions(region, starts[index], starts[index + 1])
 
-	_cache_rawToBraillePos=True
 	def _get_rawToBraillePos(self):
-		"""@return: a list mapping positions in L{rawText} to positions in L{brailleCells} for the entire buffer.
-		@rtype: [int, ...]
+		"""@return: a mapping of positions in L{rawText} to positions in L{brailleCells} for the entire buffer.
+		@rtype: sequence of int
 		"""
-		rawToBraillePos = []
-		for region, regionStart, regionEnd in self.regionsWithPositions:
-			rawToBraillePos.extend(p+regionStart for p in region.rawToBraillePos)
-		return rawToBraillePos
+		if self._rawToBraillePos is None:
+			self._rawToBraillePos = _ConcatenatedPositions(
+				[region.rawToBraillePos for region in self._visibleRegionsList],
+				list(self._brailleStarts)
+			)
+		return self._rawToBraillePos
 
-	_cache_brailleToRawPos=True
 	def _get_brailleToRawPos(self):
-		"""@return: a list mapping positions in L{brailleCells} to positions in L{rawText} for the entire buffer.
-		@rtype: [int, ...]
+		"""@return: a mapping of positions in L{brailleCells} to positions in L{rawText} for the entire buffer.
+		@rtype: sequence of int
 		"""
-		brailleToRawPos = []
-		start = 0
-		for region in self.visibleRegions:
-			brailleToRawPos.extend(p+start for p in region.brailleToRawPos)
-			start+=len(region.rawText)
-		return brailleToRawPos
+		if self._brailleToRawPos is None:
+			self._brailleToRawPos = _ConcatenatedPositions(
+				[region.brailleToRawPos for region in self._visibleRegionsList],
+				list(self._rawStarts)
+			)
+		return self._brailleToRawPos
 
 	def bufferPosToRegionPos(self, bufferPos):
-		for region, start, end in self.regionsWithPositions:
-			if end > bufferPos:
-				return region, bufferPos - start
-		raise LookupError("No such position")
+		starts = self._brailleStarts
+		# Find the last region starting at or before this position.
+		# This skips regions without cells.
+		index = max(bisect.bisect_right(starts, bufferPos) - 1, 0)
+		if index >= len(self._visibleRegionsList):
+			raise LookupError("No such position")
+		return self._visibleRegionsList[index], bufferPos - starts[index]
 
 	def regionPosToBufferPos(self, region, pos, allowNearest=False):
-		for testRegion, start, end in self.regionsWithPositions:
-			if region == testRegion:
-				if pos < end - start:
-					# The requested position is still valid within the region.
-					return start + pos
-				elif allowNearest:
-					# The position within the region isn't valid,
-					# but the region is valid, so return its start.
-					return start
-				break
-		if allowNearest:
+		starts = self._brailleStarts
+		index = self._regionIndexes.get(region)
+		if index is not None:
+			start = starts[index]
+			if pos < starts[index + 1] - start:
+				# The requested position is still valid within the region.
+				return start + pos
+			elif allowNearest:
+				# The position within the region isn't valid,
+				# but the region is valid, so return its start.
+				return start
+		elif allowNearest:
 			# Resort to the start of the last region.
-			return start
+			return starts[-2] if len(starts) > 1 else 0
 		raise LookupError("No such position")
 
 	def bufferPositionsToRawText(self, startPos, endPos):
@@ -1223,7 +1277,7 @@ class BrailleBuffer(baseObject.AutoPropertyObject):
 		cellsLen = len(self.brailleCells)
 		if endPos >= cellsLen:
 			return cellsLen
-		if not config.conf["braille"]["wordWrap"]:
+		if not config.conf.getValue(("braille", "wordWrap")):
 			return endPos
 		try:
 			# Try not to split words across windows.
@@ -1250,7 +1304,7 @@ class BrailleBuffer(baseObject.AutoPropertyObject):
 					# Only scroll to the start of this region.
 					restrictPos = regionStart
 					break
-				elif config.conf["braille"]["focusContextPresentation"]!=CONTEXTPRES_CHANGEDCONTEXT:
+				elif config.conf.getValue(("braille", "focusContextPresentation"))!=CONTEXTPRES_CHANGEDCONTEXT:
 					# We aren't currently dealing with context change presentation
 					# thus, we only need to consider the last region
 					# since it doesn't have focusToHardLeftSet, the window start position isn't restricted
@@ -1261,7 +1315,7 @@ class BrailleBuffer(baseObject.AutoPropertyObject):
 		if startPos <= restrictPos:
 			self.windowStartPos = restrictPos
 			return
-		if not config.conf["braille"]["wordWrap"]:
+		if not config.conf.getValue(("braille", "wordWrap")):
 			self.windowStartPos = startPos
 			return
 		try:
@@ -1328,7 +1382,7 @@ class BrailleBuffer(baseObject.AutoPropertyObject):
 		"""
 		pos = self.regionPosToBufferPos(region, 0)
 		self.windowStartPos = pos
-		if region.focusToHardLeft or config.conf["braille"]["focusContextPresentation"]==CONTEXTPRES_SCROLL:
+		if region.focusToHardLeft or config.conf.getValue(("braille", "focusContextPresentation"))==CONTEXTPRES_SCROLL:
 			return
 		end = self.windowEndPos
 		if end - pos < self.handler.displaySize:
@@ -1336,25 +1390,73 @@ class BrailleBuffer(baseObject.AutoPropertyObject):
 			# Force windowStartPos to be recalculated based on windowEndPos.
 			self.windowEndPos = end
 
-	def update(self):
-		self.rawText = ""
+	def update(self, region=None):
+		"""Update the buffer from its regions.
+		@param region: The only region which changed since the last update, if known.
+			In that case, only the part of the buffer for this region is updated.
+			Otherwise, the entire buffer is rebuilt.
+		@type region: L{Region}
+		"""
+		if region is not None and self._canUpdateRegion(region):
+			self._updateRegion(region)
+		else:
+			self._updateAll()
+		if log.isEnabledFor(log.IO):
+			log.io("Braille regions text: %r" % [r.rawText for r in self._visibleRegionsList])
+
+	def _canUpdateRegion(self, region):
+		return (
+			region in self._regionIndexes
+			# The regions themselves must not have changed.
+			and self.regions == self._updatedRegions
+			and list(self.visibleRegions) == self._visibleRegionsList
+		)
+
+	def _updateAll(self):
+		self._resetPositions()
+		self._updatedRegions = list(self.regions)
+		regions = self._visibleRegionsList = list(self.visibleRegions)
+		brailleStarts = self._brailleStarts
+		rawStarts = self._rawStarts
+		rawTexts = []
 		self.brailleCells = []
 		self.cursorPos = None
-		start = 0
-		if log.isEnabledFor(log.IO):
-			logRegions = []
-		for region in self.visibleRegions:
-			rawText = region.rawText
-			if log.isEnabledFor(log.IO):
-				logRegions.append(rawText)
+		for index, region in enumerate(regions):
+			self._regionIndexes.setdefault(region, index)
 			cells = region.brailleCells
-			self.rawText+=rawText
+			rawTexts.append(region.rawText)
 			self.brailleCells.extend(cells)
 			if region.brailleCursorPos is not None:
-				self.cursorPos = start + region.brailleCursorPos
-			start += len(cells)
-		if log.isEnabledFor(log.IO):
-			log.io("Braille regions text: %r" % logRegions)
+				self.cursorPos = brailleStarts[-1] + region.brailleCursorPos
+			brailleStarts.append(brailleStarts[-1] + len(cells))
+			rawStarts.append(rawStarts[-1] + len(region.rawText))
+		self.rawText = "".join(rawTexts)
+
+	def _updateRegion(self, region):
+		"""Updates only the part of the buffer for the given region,
+		shifting the positions of the following regions if its length changed.
+		"""
+		index = self._regionIndexes[region]
+		brailleStarts = self._brailleStarts
+		rawStarts = self._rawStarts
+		brailleStart, brailleEnd = brailleStarts[index], brailleStarts[index + 1]
+		rawStart, rawEnd = rawStarts[index], rawStarts[index + 1]
+		self.brailleCells[brailleStart:brailleEnd] = region.brailleCells
+		self.rawText = self.rawText[:rawStart] + region.rawText + self.rawText[rawEnd:]
+		brailleDelta = len(region.brailleCells) - (brailleEnd - brailleStart)
+		rawDelta = len(region.rawText) - (rawEnd - rawStart)
+		for later in xrange(index + 1, len(brailleStarts)):
+			brailleStarts[later] += brailleDelta
+			rawStarts[later] += rawDelta
+		self._rawToBraillePos = None
+		self._brailleToRawPos = None
+		# The cursor is in the last region which has one.
+		self.cursorPos = None
+		for index in xrange(len(self._visibleRegionsList) - 1, -1, -1):
+			cursorRegion = self._visibleRegionsList[index]
+			if cursorRegion.brailleCursorPos is not None:
+				self.cursorPos = brailleStarts[index] + cursorRegion.brailleCursorPos
+				break
 
 	def updateDisplay(self):
 		if self is self.handler.buffer:
@@ -1476,7 +1578,7 @@ def getFocusContextRegions(obj, oldFocusRegions=None):
 			continue
 		region = NVDAObjectRegion(parent, appendText=TEXT_SEPARATOR)
 		region._focusAncestorIndex = index
-		if config.conf["braille"]["focusContextPresentation"]==CONTEXTPRES_CHANGEDCONTEXT and not focusToHardLeftSet:
+		if config.conf.getValue(("braille", "focusContextPresentation"))==CONTEXTPRES_CHANGEDCONTEXT and not focusToHardLeftSet:
 			# We are presenting context changes to the user
 			# Thus, only scroll back as far as the start of the first new focus ancestor
 			# focusToHardLeftSet is used since the first new ancestor isn't always represented by a region
@@ -1608,7 +1710,7 @@ class BrailleHandler(baseObject.AutoPropertyObject):
 		self.setTether(tether, auto=False)
 
 	def _get_shouldAutoTether(self):
-		return self.enabled and config.conf["braille"]["autoTether"]
+		return self.enabled and config.conf.getValue(("braille", "autoTether"))
 
 	_lastRequestedDisplayName=None #: the name of the last requested braille display driver with setDisplayByName, even if it failed and has fallen back to no braille.
 	def setDisplayByName(self, name, isFallback=False, detected=None):
@@ -1698,12 +1800,12 @@ class BrailleHandler(baseObject.AutoPropertyObject):
 		if self._cursorBlinkTimer:
 			self._cursorBlinkTimer.Stop()
 			self._cursorBlinkTimer = None
-		self._cursorBlinkUp = showCursor = config.conf["braille"]["showCursor"]
+		self._cursorBlinkUp = showCursor = config.conf.getValue(("braille", "showCursor"))
 		self._displayWithCursor()
 		if self._cursorPos is None or not showCursor:
 			return
-		cursorShouldBlink = config.conf["braille"]["cursorBlink"]
-		blinkRate = config.conf["braille"]["cursorBlinkRate"]
+		cursorShouldBlink = config.conf.getValue(("braille", "cursorBlink"))
+		blinkRate = config.conf.getValue(("braille", "cursorBlinkRate"))
 		if cursorShouldBlink and blinkRate:
 			self._cursorBlinkTimer = gui.NonReEntrantTimer(self._blink)
 			# This is called from the background thread when a display is auto detected.
@@ -1713,7 +1815,7 @@ class BrailleHandler(baseObject.AutoPropertyObject):
 	def _writeCells(self, cells):
 		if not self.display.isThreadSafe:
 			try:
-				self.display.display(cells)
+				self.display._displayIfChanged(cells)
 			except:
 				log.error("Error displaying cells. Disabling display", exc_info=True)
 				self.handleDisplayUnavailable()
@@ -1735,9 +1837,9 @@ class BrailleHandler(baseObject.AutoPropertyObject):
 		cells = list(self._cells)
 		if self._cursorPos is not None and self._cursorBlinkUp:
 			if self.tether == self.TETHER_FOCUS:
-				cells[self._cursorPos] |= config.conf["braille"]["cursorShapeFocus"]
+				cells[self._cursorPos] |= config.conf.getValue(("braille", "cursorShapeFocus"))
 			else:
-				cells[self._cursorPos] |= config.conf["braille"]["cursorShapeReview"]
+				cells[self._cursorPos] |= config.conf.getValue(("braille", "cursorShapeReview"))
 		self._writeCells(cells)
 
 	def _blink(self):
@@ -1753,6 +1855,7 @@ class BrailleHandler(baseObject.AutoPropertyObject):
 		self._cells = cells + [0] * (self.displaySize - len(cells))
 		self._cursorPos = self.buffer.cursorWindowPos
 		self._updateDisplay()
+		tracing.markOutput("braille")
 
 	def scrollForward(self):
 		self.buffer.scrollForward()
@@ -1781,7 +1884,7 @@ class BrailleHandler(baseObject.AutoPropertyObject):
 		If a key is pressed the message will be dismissed by the next text being written to the display.
 		@postcondition: The message is displayed.
 		"""
-		if not self.enabled or config.conf["braille"]["messageTimeout"] == 0 or text is None:
+		if not self.enabled or config.conf.getValue(("braille", "messageTimeout")) == 0 or text is None:
 			return
 		if self.buffer is self.messageBuffer:
 			self.buffer.clear()
@@ -1799,10 +1902,10 @@ class BrailleHandler(baseObject.AutoPropertyObject):
 		"""Reset the message timeout.
 		@precondition: A message is currently being displayed.
 		"""
-		if config.conf["braille"]["noMessageTimeout"]:
+		if config.conf.getValue(("braille", "noMessageTimeout")):
 			return
 		# Configured timeout is in seconds.
-		timeout = config.conf["braille"]["messageTimeout"] * 1000
+		timeout = config.conf.getValue(("braille", "messageTimeout")) * 1000
 		if self._messageCallLater:
 			self._messageCallLater.Restart(timeout)
 		else:
@@ -1835,7 +1938,7 @@ class BrailleHandler(baseObject.AutoPropertyObject):
 		self.mainBuffer.clear()
 		focusToHardLeftSet = False
 		for region in regions:
-			if self.tether == self.TETHER_FOCUS and config.conf["braille"]["focusContextPresentation"]==CONTEXTPRES_CHANGEDCONTEXT:
+			if self.tether == self.TETHER_FOCUS and config.conf.getValue(("braille", "focusContextPresentation"))==CONTEXTPRES_CHANGEDCONTEXT:
 				# Check focusToHardLeft for every region.
 				# If noone of the regions has focusToHardLeft set to True, set it for the first focus region.
 				if region.focusToHardLeft:
@@ -1883,7 +1986,7 @@ class BrailleHandler(baseObject.AutoPropertyObject):
 	def _doCursorMove(self, region):
 		self.mainBuffer.saveWindow()
 		region.update()
-		self.mainBuffer.update()
+		self.mainBuffer.update(region)
 		self.mainBuffer.restoreWindow()
 		self.scrollToCursorOrSelection(region)
 		if self.buffer is self.mainBuffer:
@@ -1938,7 +2041,7 @@ class BrailleHandler(baseObject.AutoPropertyObject):
 			return
 		self.mainBuffer.saveWindow()
 		region.update()
-		self.mainBuffer.update()
+		self.mainBuffer.update(region)
 		self.mainBuffer.restoreWindow()
 		if self.buffer is self.mainBuffer:
 			self.update()
@@ -1980,6 +2083,8 @@ class BrailleHandler(baseObject.AutoPropertyObject):
 		):
 			self.setDisplayByName(display)
 		self._tether = config.conf["braille"]["tetherTo"]
+		# The translation table might have changed.
+		louisHelper.flushTranslationCache()
 
 	def handleDisplayUnavailable(self):
 		"""Called when the braille display becomes unavailable.
@@ -2080,12 +2185,12 @@ class _BgThread:
 		if not data:
 			return
 		try:
-			handler.display.display(data)
+			written = handler.display._displayIfChanged(data)
 		except:
 			log.error("Error displaying cells. Disabling display", exc_info=True)
 			handler.handleDisplayUnavailable()
 		else:
-			if handler.display.receivesAckPackets:
+			if written and handler.display.receivesAckPackets:
 				handler.display._awaitingAck = True
 				winKernel.setWaitableTimer(
 					_BgThread.ackTimerHandle,
@@ -2141,6 +2246,21 @@ def terminate():
 	handler.terminate()
 	handler = None
 
+def getCellWriteStatistics():
+	"""Gets statistics about the cells written to the current braille display for diagnostics.
+	@return: The number of writes, the number of writes skipped because the cells hadn't changed
+		and the total number of changed cells written.
+	@rtype: dict
+	"""
+	display = handler.display if handler else None
+	if not display:
+		return {"writes": 0, "skippedWrites": 0, "changedCells": 0}
+	return {
+		"writes": display._cellWrites,
+		"skippedWrites": display._skippedCellWrites,
+		"changedCells": display._changedCellsWritten,
+	}
+
 class BrailleDisplayDriver(baseObject.AutoPropertyObject):
 	"""Abstract base braille display driver.
 	Each braille display driver should be a separate Python module in the root brailleDisplayDrivers directory containing a BrailleDisplayDriver class which inherits from this base class.
@@ -2185,6 +2305,18 @@ class BrailleDisplayDriver(baseObject.AutoPropertyObject):
 	#: Furthermore, it is used by L{_BgThread} to stop waiting for missed acknowledgement packets.
 	#: @type: float
 	timeout = 0.2
+	#: Whether this driver makes use of the range of cells which changed since the last write.
+	#: If C{True}, NVDA calls L{displayChanged} instead of L{display} when writing cells.
+	#: @type: bool
+	supportsPartialUpdates = False
+	#: The cells last written to this display by NVDA core, or C{None} if they are unknown.
+	#: Writes of cells which are equal to these are skipped.
+	#: Drivers should call L{invalidateCells} rather than changing this.
+	#: @type: list
+	_lastWrittenCells = None
+	_cellWrites = 0
+	_skippedCellWrites = 0
+	_changedCellsWritten = 0
 
 	@classmethod
 	def check(cls):
@@ -2233,6 +2365,65 @@ class BrailleDisplayDriver(baseObject.AutoPropertyObject):
 		@type cells: [int, ...]
 		"""
 
+	def displayChanged(self, cells, start, end):
+		"""Display the given braille cells, of which only those from C{start} up to C{end} changed since the last write.
+		This is called instead of L{display} if L{supportsPartialUpdates} is C{True}.
+		Drivers for displays which can update part of the display, or which keep their own buffers,
+		can override this to only send or convert the changed cells.
+		The base implementation calls L{display}.
+		@param cells: All of the braille cells to display.
+		@type cells: [int, ...]
+		@param start: The index of the first changed cell.
+		@type start: int
+		@param end: The index after the last changed cell.
+		@type end: int
+		"""
+		self.display(cells)
+
+	def invalidateCells(self):
+		"""Forget the cells last written,
+		so that the next write is sent to the display even if the cells didn't change.
+		Drivers must call this when the display no longer shows the cells written by NVDA;
+		e.g. after the display was reset or returned from an internal mode.
+		"""
+		self._lastWrittenCells = None
+
+	def _displayIfChanged(self, cells):
+		"""Displays the given braille cells, unless they are equal to the cells last written.
+		This is called by NVDA core to write cells to the display.
+		@param cells: The braille cells to display.
+		@type cells: [int, ...]
+		@return: C{True} if the cells were written, C{False} if the write was skipped.
+		@rtype: bool
+		"""
+		lastCells = self._lastWrittenCells
+		numCells = len(cells)
+		if lastCells is None or len(lastCells) != numCells:
+			start = 0
+			end = numCells
+		elif lastCells == cells:
+			self._skippedCellWrites += 1
+			return False
+		else:
+			# The cells differ, so the loops below stop before running off either end.
+			start = 0
+			while lastCells[start] == cells[start]:
+				start += 1
+			end = numCells
+			while lastCells[end - 1] == cells[end - 1]:
+				end -= 1
+		# Forget the cells until the write succeeds,
+		# as the display's contents are unknown if it fails part way through.
+		self._lastWrittenCells = None
+		if self.supportsPartialUpdates:
+			self.displayChanged(cells, start, end)
+		else:
+			self.display(cells)
+		self._lastWrittenCells = list(cells)
+		self._cellWrites += 1
+		self._changedCellsWritten += end - start
+		return True
+
 	#: Automatic port constant to be used by braille displays that support the "automatic" port
 	#: Kept for backwards compatibility
 	AUTOMATIC_PORT = AUTOMATIC_PORT
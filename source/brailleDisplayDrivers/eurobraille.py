@@ -10,10 +10,12 @@ from cStringIO import StringIO
 import serial
 import bdDetect
 import braille
+import queueHandler
 import inputCore
 from logHandler import log
 import brailleInput
 import hwIo
+import hwIoFraming
 from baseObject import AutoPropertyObject, ScriptableObject
 import wx
 import threading
@@ -26,6 +28,14 @@ BAUD_RATE = 9600
 STX = b'\x02'
 ETX = b'\x03'
 ACK = b'\x06'
+#: Splits data received from serial displays into packets.
+#: The length of an STX packet includes the length itself, but not the STX and ETX.
+SERIAL_FRAMER = hwIoFraming.FirstByteFramer({
+	ACK: hwIoFraming.FixedSizeFramer(2),
+	STX: hwIoFraming.LengthPrefixedFramer(1, lengthSize=2, extraLength=-1),
+})
+#: The maximum number of bytes to read from a serial port at a time.
+SERIAL_READ_SIZE = 512
 EB_SYSTEM = b'S' # 0x53
 EB_MODE = b'R' # 0x52
 EB_KEY = b'K' # 0x4b
@@ -167,6 +177,7 @@ class BrailleDisplayDriver(braille.BrailleDisplayDriver, ScriptableObject):
 						exclusive=False
 					)
 				else:
+					self._serialReader = hwIoFraming.FramedReader(SERIAL_FRAMER, self._onSerialPackets)
 					self._dev = hwIo.Serial(
 						port,
 						baudrate=BAUD_RATE,
@@ -175,7 +186,8 @@ class BrailleDisplayDriver(braille.BrailleDisplayDriver, ScriptableObject):
 						stopbits=serial.STOPBITS_ONE,
 						timeout=self.timeout,
 						writeTimeout=self.timeout,
-						onReceive=self._onReceive
+						onReceive=self._serialReader.feed,
+						onReceiveSize=SERIAL_READ_SIZE
 					)
 			except EnvironmentError:
 				log.debugWarning("Error while connecting to port %r"%port, exc_info=True)
@@ -229,8 +241,9 @@ class BrailleDisplayDriver(braille.BrailleDisplayDriver, ScriptableObject):
 			stream = StringIO(data)
 			stream.seek(2)
 		else:
-			byte1= data
-			stream = self._dev
+			# Serial data is split into packets before it gets here.
+			stream = StringIO(data)
+			byte1 = stream.read(1)
 		if byte1 == ACK:
 			frame = ord(stream.read(1))
 			self._handleAck(frame)
@@ -249,7 +262,10 @@ class BrailleDisplayDriver(braille.BrailleDisplayDriver, ScriptableObject):
 			elif packetType==EB_MODE:
 				if packetSubType  == EB_MODE_DRIVER:
 					log.debug("Braille display switched to driver mode, updating display...")
-					braille.handler.update()
+					# The display still shows its internal mode content.
+					self.invalidateCells()
+					# This is called from the I/O thread, so the braille handler must be updated in the main thread.
+					queueHandler.queueFunction(queueHandler.eventQueue, braille.handler.update)
 				elif packetSubType  == EB_MODE_INTERNAL:
 					log.debug("Braille display switched to internal mode")
 			elif packetType==EB_KEY:
@@ -270,6 +286,10 @@ class BrailleDisplayDriver(braille.BrailleDisplayDriver, ScriptableObject):
 					packetData
 				))
 
+	def _onSerialPackets(self, packets):
+		for packet in packets:
+			self._onReceive(packet)
+
 	def _handleAck(self, frame):
 		try:
 			super(BrailleDisplayDriver,self)._handleAck()
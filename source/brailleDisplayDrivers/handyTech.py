@@ -15,6 +15,7 @@ import serial # pylint: disable=E0401
 import weakref
 import hwIo
 import braille
+import queueHandler
 import brailleInput
 import inputCore
 import ui
@@ -113,6 +114,10 @@ class Model(AutoPropertyObject):
 	#: @type: int
 	numCells = 0
 
+	#: The cells last sent to the display, which are updated in place by L{_getCellBytes}.
+	#: @type: bytearray
+	_cellBuffer = None
+
 	def __init__(self, display):
 		super(Model, self).__init__()
 		# A weak reference to the driver instance, used due to a circular reference  between Model and Display
@@ -180,25 +185,40 @@ class Model(AutoPropertyObject):
 			0x1E: "n9",
 		})
 
-	def display(self, cells):
+	def _getCellBytes(self, cells, start=0, end=None):
+		"""Get cells as a byte string to send to the display
+
+		Only the cells from start up to end are copied into the buffer kept from
+		the previous call, so the other cells must not have changed since then.
+		"""
+		buf = self._cellBuffer
+		if buf is None or len(buf) != len(cells):
+			buf = self._cellBuffer = bytearray(cells)
+		else:
+			buf[start:end] = cells[start:end]
+		return bytes(buf)
+
+	def display(self, cells, start=0, end=None):
 		"""Display cells on the braille display
 
 		This is the modern protocol, which uses an extended packet to send braille
 		cells. Some displays use an older, simpler protocol. See OldProtocolMixin.
+		If only the cells from start up to end changed since the last call,
+		these can be passed to avoid converting the other cells again.
 		"""
 		self._display.sendExtendedPacket(HT_EXTPKT_BRAILLE,
-			"".join(chr(cell) for cell in cells))
+			self._getCellBytes(cells, start, end))
 
 class OldProtocolMixin(object):
 	"Mixin for displays using an older protocol to send braille cells and handle input"
 
-	def display(self, cells):
+	def display(self, cells, start=0, end=None):
 		"""Write cells to the display according to the old protocol
 
 		This older protocol sends a simple packet starting with HT_PKT_BRAILLE,
 		followed by the cells. No model ID or lenghth are included.
 		"""
-		self._display.sendPacket(HT_PKT_BRAILLE, b"".join(chr(cell) for cell in cells))
+		self._display.sendPacket(HT_PKT_BRAILLE, self._getCellBytes(cells, start, end))
 
 
 class AtcMixin(object):
@@ -307,7 +327,7 @@ class StatusCellMixin(AutoPropertyObject):
 		})
 		return keys
 
-	def display(self, cells):
+	def display(self, cells, start=0, end=None):
 		"""Display braille on the display with empty status cells
 
 		Some displays (e.g. Modular series) have 4 status cells.
@@ -315,7 +335,7 @@ class StatusCellMixin(AutoPropertyObject):
 		support status cells, we just send empty cells.
 		"""
 		cells = [0] * 4 + cells
-		super(StatusCellMixin, self).display(cells)
+		super(StatusCellMixin, self).display(cells, start + 4, None if end is None else end + 4)
 
 
 class ModularConnect88(TripleActionKeysMixin, Model):
@@ -519,6 +539,7 @@ class BrailleDisplayDriver(braille.BrailleDisplayDriver, ScriptableObject):
 	isThreadSafe = True
 	receivesAckPackets = True
 	timeout = 0.2
+	supportsPartialUpdates = True
 
 	@classmethod
 	def getManualPorts(cls):
@@ -556,6 +577,7 @@ class BrailleDisplayDriver(braille.BrailleDisplayDriver, ScriptableObject):
 				continue
 
 			self.sendPacket(HT_PKT_RESET)
+			self.invalidateCells()
 			for _i in xrange(3):
 				# An expected response hasn't arrived yet, so wait for it.
 				self._dev.waitForRead(self.timeout)
@@ -708,6 +730,13 @@ class BrailleDisplayDriver(braille.BrailleDisplayDriver, ScriptableObject):
 				# Somehow the model ID of this display changed, probably another display 
 				# plugged in the same (already open) serial port.
 				self.terminate()
+			elif htPacketType==HT_PKT_OK:
+				# The display was reset, so it no longer shows the cells written before.
+				log.debug("Braille display was reset, updating display...")
+				self.invalidateCells()
+				if braille.handler.display is self:
+					# This is called from the I/O thread, so the braille handler must be updated in the main thread.
+					queueHandler.queueFunction(queueHandler.eventQueue, braille.handler.update)
 
 		if htPacketType==HT_PKT_OK:
 			pass
@@ -767,6 +796,9 @@ class BrailleDisplayDriver(braille.BrailleDisplayDriver, ScriptableObject):
 		# cells will already be padded up to numCells.
 		self._model.display(cells)
 
+	def displayChanged(self, cells, start, end):
+		self._model.display(cells, start, end)
+
 	scriptCategory = SCRCAT_BRAILLE
 
 	def script_toggleBrailleInput(self, _gesture):
@@ -10,8 +10,12 @@ import codecs
 import collections
 import re
 from logHandler import log
+import threading
+import cPickle
 import globalVars
 import config
+import fileUtils
+import lruCache
 
 class LocaleDataMap(object):
 	"""Allows access to locale-specific data objects, dynamically loading them if needed on request"""
@@ -358,11 +362,13 @@ class SpeechSymbols(object):
 		return u"\t".join(fields)
 
 _noSymbolLocalesCache = set()
-def _getSpeechSymbolsForLocale(locale):
+def _getSpeechSymbolsForLocale(locale, includeCLDR=None):
 	if locale in _noSymbolLocalesCache:
 		raise LookupError
+	if includeCLDR is None:
+		includeCLDR = config.conf['speech']['includeCLDR']
 	builtin = SpeechSymbols()
-	if config.conf['speech']['includeCLDR']:
+	if includeCLDR:
 		# Try to load CLDR data when processing is on.
 		# Load the data before loading other symbols,
 		# in order to allow translators to override them.
@@ -387,10 +393,214 @@ def _getSpeechSymbolsForLocale(locale):
 		pass
 	return builtin, user
 
+#: The version of the format of symbol tables persisted by L{_saveSymbolTable}.
+#: Increment this when the format or the way tables are built changes, so that stale tables are ignored.
+SYMBOL_TABLE_VERSION = 2
+
+def _isSymbolTablePersistenceAllowed():
+	# Loading a pickle can run arbitrary code,
+	# so never load tables on secure screens, where NVDA runs with system privileges.
+	# The launcher runs with a temporary configuration, so saving tables there is pointless.
+	return not (globalVars.appArgs.secure or globalVars.appArgs.launcher)
+
+#: Complex symbol expressions compiled by L{warmUpSymbolTables}, keyed by their pattern.
+#: L{SpeechSymbolProcessor} takes its expression from here rather than compiling it again.
+_compiledSymbolPatterns = {}
+
+def _getSymbolTableFileName(locale, includeCLDR):
+	return os.path.join(globalVars.appArgs.configPath, "symbolTables",
+		u"%s%s.pickle" % (locale, "-cldr" if includeCLDR else ""))
+
+def _getSymbolTableKey(locale, includeCLDR):
+	"""Gets a key identifying the versions of all files a symbol table for a locale is built from.
+	If any of these files is changed, added or removed, the key changes.
+	@rtype: tuple
+	"""
+	fileNames = []
+	for l in ((locale,) if locale == "en" else (locale, "en")):
+		if includeCLDR:
+			fileNames.append(os.path.join("locale", l, "cldr.dic"))
+		fileNames.append(os.path.join("locale", l, "symbols.dic"))
+	fileNames.append(os.path.join(globalVars.appArgs.configPath, "symbols-%s.dic" % locale))
+	stamps = []
+	for fileName in fileNames:
+		try:
+			stat = os.stat(fileName)
+		except OSError:
+			stamps.append((fileName, None, None))
+			continue
+		stamps.append((fileName, stat.st_mtime, stat.st_size))
+	return (SYMBOL_TABLE_VERSION, locale, includeCLDR, tuple(stamps))
+
+def _loadSymbolTable(locale, includeCLDR, key):
+	"""Loads a persisted symbol table.
+	@return: The table, or C{None} if there is no table for this key.
+	@rtype: dict
+	"""
+	if not _isSymbolTablePersistenceAllowed():
+		return None
+	fileName = _getSymbolTableFileName(locale, includeCLDR)
+	if not os.path.isfile(fileName):
+		return None
+	try:
+		with open(fileName, "rb") as f:
+			data = cPickle.load(f)
+		if not isinstance(data, dict) or data.get("key") != key:
+			return None
+		return data["table"]
+	except:
+		log.debugWarning("Error loading symbol table %s" % fileName, exc_info=True)
+		return None
+
+def _saveSymbolTable(locale, includeCLDR, key, table):
+	if not _isSymbolTablePersistenceAllowed():
+		return
+	fileName = _getSymbolTableFileName(locale, includeCLDR)
+	try:
+		dirName = os.path.dirname(fileName)
+		if not os.path.isdir(dirName):
+			os.makedirs(dirName)
+		with fileUtils.FaultTolerantFile(fileName) as f:
+			cPickle.dump({"key": key, "table": table}, f, cPickle.HIGHEST_PROTOCOL)
+	except:
+		log.debugWarning("Error saving symbol table %s" % fileName, exc_info=True)
+
+def _discardSymbolTables(locale):
+	if not _isSymbolTablePersistenceAllowed():
+		return
+	for includeCLDR in (False, True):
+		try:
+			os.remove(_getSymbolTableFileName(locale, includeCLDR))
+		except OSError:
+			pass
+
+def _buildSymbolTable(locale, sources):
+	"""Merges symbol data from several sources into a table from which a L{SpeechSymbolProcessor} can be constructed.
+	@param locale: The locale of the table, used for logging.
+	@type locale: str
+	@param sources: The sources in order of priority.
+	@type sources: list of L{SpeechSymbols}
+	@return: The computed symbols as tuples of L{SpeechSymbol} fields,
+		the identifiers of complex symbols in the order of their regexp groups,
+		the single character simple symbols,
+		the regexp pattern and the pattern for everything except single character simple symbols.
+	@rtype: dict
+	"""
+	# The computed symbol information from all sources.
+	symbols = collections.OrderedDict()
+	# An indexable list of complex symbols for use in building/executing the regexp.
+	complexSymbolsList = []
+	# A list of multi-character simple symbols for use in building the regexp.
+	multiChars = []
+	# A list of single character symbols for use in building the regexp.
+	characters = []
+
+	# Add all complex symbols first, as they take priority.
+	for source in sources:
+		for identifier, pattern in source.complexSymbols.iteritems():
+			if identifier in symbols:
+				# Already defined.
+				continue
+			symbol = SpeechSymbol(identifier, pattern)
+			symbols[identifier] = symbol
+			complexSymbolsList.append(symbol)
+
+	# Supplement the data for complex symbols and add all simple symbols.
+	for source in sources:
+		for identifier, sourceSymbol in source.symbols.iteritems():
+			try:
+				symbol = symbols[identifier]
+				# We're updating an already existing symbol.
+			except KeyError:
+				# This is a new simple symbol.
+				# (All complex symbols have already been added.)
+				symbol = symbols[identifier] = SpeechSymbol(identifier)
+				if len(identifier) == 1:
+					characters.append(identifier)
+				else:
+					multiChars.append(identifier)
+			# If fields weren't explicitly specified, inherit the value from later sources.
+			if symbol.replacement is None:
+				symbol.replacement = sourceSymbol.replacement
+			if symbol.level is None:
+				symbol.level = sourceSymbol.level
+			if symbol.preserve is None:
+				symbol.preserve = sourceSymbol.preserve
+			if symbol.displayName is None:
+				symbol.displayName = sourceSymbol.displayName
+
+	# Set defaults for any fields not explicitly set.
+	for symbol in symbols.values():
+		if symbol.replacement is None:
+			# Symbols without a replacement specified are useless.
+			log.warning(u"Replacement not defined in locale {locale} for symbol: {symbol}".format(
+				symbol=symbol.identifier, locale=locale))
+			del symbols[symbol.identifier]
+			try:
+				if len(symbol.identifier) == 1:
+					characters.remove(symbol.identifier)
+				else:
+					multiChars.remove(symbol.identifier)
+			except ValueError:
+				pass
+			try:
+				complexSymbolsList.remove(symbol)
+			except ValueError:
+				pass
+			continue
+		if symbol.level is None:
+			symbol.level = SYMLVL_ALL
+		if symbol.preserve is None:
+			symbol.preserve = SYMPRES_NEVER
+		if symbol.displayName is None:
+			symbol.displayName = symbol.identifier
+
+	singleCharacters = characters
+	# Make characters into a regexp character set.
+	characters = "[%s]" % re.escape("".join(characters))
+	# The simple symbols must be ordered longest first so that the longer symbols will match.
+	multiChars.sort(key=lambda identifier: len(identifier), reverse=True)
+
+	# Build the regexp.
+	patterns = [
+		# Strip repeated spaces from the end of the line to stop them from being picked up by repeated.
+		r"(?P<rstripSpace>  +$)",
+		# Repeated characters: more than 3 repeats.
+		r"(?P<repeated>(?P<repTmp>%s)(?P=repTmp){3,})" % characters
+	]
+	# Complex symbols.
+	# Each complex symbol has its own named group so we know which symbol matched.
+	patterns.extend(
+		u"(?P<c{index}>{pattern})".format(index=index, pattern=symbol.pattern)
+		for index, symbol in enumerate(complexSymbolsList))
+	# Everything except single character simple symbols,
+	# which can be replaced without a regexp; see L{SpeechSymbolProcessor.processText}.
+	# The simple symbol group must come last so that group numbers are the same as in the full regexp.
+	fallbackPatterns = list(patterns)
+	if multiChars:
+		fallbackPatterns.append(ur"(?P<simple>{multiChars})".format(
+			multiChars="|".join(re.escape(identifier) for identifier in multiChars)))
+	# Simple symbols.
+	# These are all handled in one named group.
+	# Because the symbols are just text, we know which symbol matched just by looking at the matched text.
+	patterns.append(ur"(?P<simple>{multiChars}|{singleChars})".format(
+		multiChars="|".join(re.escape(identifier) for identifier in multiChars),
+		singleChars=characters
+	))
+	return {
+		"symbols": [tuple(getattr(symbol, attr) for attr in SpeechSymbol.__slots__) for symbol in symbols.itervalues()],
+		"complexSymbols": [symbol.identifier for symbol in complexSymbolsList],
+		"characters": singleCharacters,
+		"pattern": "|".join(patterns),
+		"fallbackPattern": "|".join(fallbackPatterns),
+	}
+
 class SpeechSymbolProcessor(object):
 	"""
 	Handles processing of symbol pronunciation for a locale.
 	Pronunciation information is taken from one or more L{SpeechSymbols} instances.
+	The merged information is persisted in the user's configuration directory,
+	so that it only needs to be computed again when one of the symbol files changes.
 	"""
 
 	#: Caches symbol data for locales.
@@ -402,121 +612,70 @@ class SpeechSymbolProcessor(object):
 		@type locale: str
 		"""
 		self.locale = locale
+		self._sources = None
 
-		# We need to merge symbol data from several sources.
-		sources = self.sources = []
-		builtin, user = self.localeSymbols.fetchLocaleData(locale,fallback=False)
-		self.builtinSources = [builtin]
-		self.userSymbols = user
-		sources.append(user)
-		sources.append(builtin)
-
-		# Always use English as a base.
-		if locale != "en":
-			# Only the builtin data.
-			enBaseSymbols = self.localeSymbols.fetchLocaleData("en")[0]
-			sources.append(enBaseSymbols)
-			self.builtinSources.append(enBaseSymbols)
+		includeCLDR = config.conf['speech']['includeCLDR']
+		key = _getSymbolTableKey(locale, includeCLDR)
+		table = _loadSymbolTable(locale, includeCLDR, key)
+		if table is None:
+			table = _buildSymbolTable(locale, self.sources)
+			_saveSymbolTable(locale, includeCLDR, key, table)
 
 		# The computed symbol information from all sources.
 		symbols = self.computedSymbols = collections.OrderedDict()
-		# An indexable list of complex symbols for use in building/executing the regexp.
-		complexSymbolsList = self._computedComplexSymbolsList = []
-		# A list of multi-character simple symbols for use in building the regexp.
-		multiChars = []
-		# A list of single character symbols for use in building the regexp.
-		characters = []
-
-		# Add all complex symbols first, as they take priority.
-		for source in sources:
-			for identifier, pattern in source.complexSymbols.iteritems():
-				if identifier in symbols:
-					# Already defined.
-					continue
-				symbol = SpeechSymbol(identifier, pattern)
-				symbols[identifier] = symbol
-				complexSymbolsList.append(symbol)
-
-		# Supplement the data for complex symbols and add all simple symbols.
-		for source in sources:
-			for identifier, sourceSymbol in source.symbols.iteritems():
-				try:
-					symbol = symbols[identifier]
-					# We're updating an already existing symbol.
-				except KeyError:
-					# This is a new simple symbol.
-					# (All complex symbols have already been added.)
-					symbol = symbols[identifier] = SpeechSymbol(identifier)
-					if len(identifier) == 1:
-						characters.append(identifier)
-					else:
-						multiChars.append(identifier)
-				# If fields weren't explicitly specified, inherit the value from later sources.
-				if symbol.replacement is None:
-					symbol.replacement = sourceSymbol.replacement
-				if symbol.level is None:
-					symbol.level = sourceSymbol.level
-				if symbol.preserve is None:
-					symbol.preserve = sourceSymbol.preserve
-				if symbol.displayName is None:
-					symbol.displayName = sourceSymbol.displayName
-
-		# Set defaults for any fields not explicitly set.
-		for symbol in symbols.values():
-			if symbol.replacement is None:
-				# Symbols without a replacement specified are useless.
-				log.warning(u"Replacement not defined in locale {locale} for symbol: {symbol}".format(
-					symbol=symbol.identifier, locale=self.locale))
-				del symbols[symbol.identifier]
-				try:
-					if len(symbol.identifier) == 1:
-						characters.remove(symbol.identifier)
-					else:
-						multiChars.remove(symbol.identifier)
-				except ValueError:
-					pass
-				try:
-					complexSymbolsList.remove(symbol)
-				except ValueError:
-					pass
-				continue
-			if symbol.level is None:
-				symbol.level = SYMLVL_ALL
-			if symbol.preserve is None:
-				symbol.preserve = SYMPRES_NEVER
-			if symbol.displayName is None:
-				symbol.displayName = symbol.identifier
-
-		# Make characters into a regexp character set.
-		characters = "[%s]" % re.escape("".join(characters))
-		# The simple symbols must be ordered longest first so that the longer symbols will match.
-		multiChars.sort(key=lambda identifier: len(identifier), reverse=True)
-
-		# Build the regexp.
-		patterns = [
-			# Strip repeated spaces from the end of the line to stop them from being picked up by repeated.
-			r"(?P<rstripSpace>  +$)",
-			# Repeated characters: more than 3 repeats.
-			r"(?P<repeated>(?P<repTmp>%s)(?P=repTmp){3,})" % characters
-		]
-		# Complex symbols.
-		# Each complex symbol has its own named group so we know which symbol matched.
-		patterns.extend(
-			u"(?P<c{index}>{pattern})".format(index=index, pattern=symbol.pattern)
-			for index, symbol in enumerate(complexSymbolsList))
-		# Simple symbols.
-		# These are all handled in one named group.
-		# Because the symbols are just text, we know which symbol matched just by looking at the matched text.
-		patterns.append(ur"(?P<simple>{multiChars}|{singleChars})".format(
-			multiChars="|".join(re.escape(identifier) for identifier in multiChars),
-			singleChars=characters
-		))
-		pattern = "|".join(patterns)
+		for fields in table["symbols"]:
+			symbol = SpeechSymbol(*fields)
+			symbols[symbol.identifier] = symbol
+		# An indexable list of complex symbols for use in executing the regexp.
+		self._computedComplexSymbolsList = [symbols[identifier] for identifier in table["complexSymbols"]]
 		try:
-			self._regexp = re.compile(pattern, re.UNICODE)
+			self._regexp = _compiledSymbolPatterns.pop(table["pattern"], None) or re.compile(table["pattern"], re.UNICODE)
 		except re.error as e:
 			log.error("Invalid complex symbol regular expression in locale %s: %s" % (locale, e))
 			raise LookupError
+		# Matches everything except single character simple symbols.
+		self._fallbackRegexp = re.compile(table["fallbackPattern"], re.UNICODE)
+		self._characters = table["characters"]
+		#: Maps symbol levels to tables for C{unicode.translate} which replace single character simple symbols.
+		self._translationTables = {}
+
+	def _fetchSources(self):
+		"""Fetches the symbol data this processor is built from.
+		This is only needed when the table must be built or the user edits symbols,
+		so it is deferred until then.
+		"""
+		if self._sources:
+			return self._sources
+		# We need to merge symbol data from several sources.
+		builtin, user = self.localeSymbols.fetchLocaleData(self.locale,fallback=False)
+		sources = [user, builtin]
+		builtinSources = [builtin]
+		# Always use English as a base.
+		if self.locale != "en":
+			# Only the builtin data.
+			enBaseSymbols = self.localeSymbols.fetchLocaleData("en")[0]
+			sources.append(enBaseSymbols)
+			builtinSources.append(enBaseSymbols)
+		self._sources = (sources, builtinSources, user)
+		return self._sources
+
+	def _get_sources(self):
+		return self._fetchSources()[0]
+	#: The sources of symbol data in order of priority.
+	#: @type: list of L{SpeechSymbols}
+	sources = property(_get_sources)
+
+	def _get_builtinSources(self):
+		return self._fetchSources()[1]
+	#: The builtin sources of symbol data.
+	#: @type: list of L{SpeechSymbols}
+	builtinSources = property(_get_builtinSources)
+
+	def _get_userSymbols(self):
+		return self._fetchSources()[2]
+	#: The symbol data defined by the user.
+	#: @type: L{SpeechSymbols}
+	userSymbols = property(_get_userSymbols)
 
 	def _regexpRepl(self, m):
 		group = m.lastgroup
@@ -543,18 +702,52 @@ class SpeechSymbolProcessor(object):
 				# Complex symbol.
 				index = int(group[1:])
 				symbol = self._computedComplexSymbolsList[index]
-			if symbol.preserve == SYMPRES_ALWAYS or (symbol.preserve == SYMPRES_NOREP and self._level < symbol.level):
-				suffix = text
-			else:
-				suffix = " "
-			if self._level >= symbol.level and symbol.replacement:
-				return u" {repl}{suffix}".format(repl=symbol.replacement, suffix=suffix)
-			else:
-				return suffix
+			return self._getSymbolReplacement(symbol, text, self._level)
+
+	def _getSymbolReplacement(self, symbol, text, level):
+		if symbol.preserve == SYMPRES_ALWAYS or (symbol.preserve == SYMPRES_NOREP and level < symbol.level):
+			suffix = text
+		else:
+			suffix = " "
+		if level >= symbol.level and symbol.replacement:
+			return u" {repl}{suffix}".format(repl=symbol.replacement, suffix=suffix)
+		else:
+			return suffix
+
+	def _getTranslationTable(self, level):
+		try:
+			return self._translationTables[level]
+		except KeyError:
+			pass
+		symbols = self.computedSymbols
+		table = self._translationTables[level] = {
+			ord(character): unicode(self._getSymbolReplacement(symbols[character], character, level))
+			for character in self._characters
+		}
+		return table
 
 	def processText(self, text, level):
 		self._level = level
-		return self._regexp.sub(self._regexpRepl, text)
+		if not isinstance(text, unicode):
+			return self._regexp.sub(self._regexpRepl, text)
+		# Most matches are single character simple symbols, which are replaced in bulk with a translation table.
+		# The fallback regexp finds everything else.
+		# Scanning with the full regexp only ever moves one character at a time between these matches,
+		# and gives precedence to the same alternatives in the same order,
+		# so this produces exactly the same output.
+		translationTable = self._getTranslationTable(level)
+		output = []
+		pos = 0
+		for m in self._fallbackRegexp.finditer(text):
+			start, end = m.span()
+			if start == end:
+				# Empty matches are subject to special rules when substituting, so leave them to the regexp.
+				return self._regexp.sub(self._regexpRepl, text)
+			output.append(text[pos:start].translate(translationTable))
+			output.append(self._regexpRepl(m))
+			pos = end
+		output.append(text[pos:].translate(translationTable))
+		return u"".join(output)
 
 	def updateSymbol(self, newSymbol):
 		"""Update information for a symbol if it has changed.
@@ -623,7 +816,28 @@ class SpeechSymbolProcessor(object):
 		"""
 		return any(symbolIdentifier in source.symbols for source in self.builtinSources)
 
-_localeSpeechSymbolProcessors = LocaleDataMap(SpeechSymbolProcessor)
+class _SpeechSymbolProcessorMap(LocaleDataMap):
+	"""Maps locales to L{SpeechSymbolProcessor}s,
+	discarding cached results of L{processSpeechSymbols} whenever a processor is invalidated;
+	e.g. because the user edited symbols.
+	"""
+
+	def invalidateLocaleData(self, locale):
+		super(_SpeechSymbolProcessorMap, self).invalidateLocaleData(locale)
+		# The symbols might have been edited without their file being saved.
+		_discardSymbolTables(locale)
+		# Results are cached for the requested locale, which might have fallen back to this one.
+		_processedTextCache.clear()
+
+	def invalidateAllData(self):
+		super(_SpeechSymbolProcessorMap, self).invalidateAllData()
+		_processedTextCache.clear()
+
+_localeSpeechSymbolProcessors = _SpeechSymbolProcessorMap(SpeechSymbolProcessor)
+
+#: Caches the results of L{processSpeechSymbols}, keyed by (locale, level, text).
+#: Lines are often processed repeatedly; e.g. when reviewing or moving back and forth between lines.
+_processedTextCache = lruCache.LRUCache(maxSize=1000)
 
 def processSpeechSymbols(locale, text, level):
 	"""Process some text, converting symbols according to desired pronunciation.
@@ -633,14 +847,27 @@ def processSpeechSymbols(locale, text, level):
 	@type text: str
 	@param level: The symbol level to use; one of the SYMLVL_* constants.
 	"""
+	key = (locale, level, text)
+	processed = _processedTextCache.get(key)
+	if processed is None:
+		processed = _processedTextCache[key] = _processSpeechSymbols(locale, text, level)
+	return processed
+
+def _processSpeechSymbols(locale, text, level):
 	try:
 		ss = _localeSpeechSymbolProcessors.fetchLocaleData(locale)
 	except LookupError:
 		if not locale.startswith("en_"):
-			return processSpeechSymbols("en", text, level)
+			return _processSpeechSymbols("en", text, level)
 		raise
 	return ss.processText(text, level)
 
+def getProcessedTextCacheStatistics():
+	"""Gets statistics about the cache of results of L{processSpeechSymbols} for diagnostics.
+	@rtype: dict
+	"""
+	return _processedTextCache.getStatistics()
+
 def processSpeechSymbol(locale, symbol):
 	"""Process a single symbol according to desired pronunciation.
 	@param locale: The locale of the symbol.
@@ -660,14 +887,65 @@ def processSpeechSymbol(locale, symbol):
 		pass
 	return symbol
 
+def warmUpSymbolTables(locales):
+	"""Prepares the persisted symbol tables for the given locales in the background,
+	so that switching to one of these locales later does not require symbol files to be parsed and merged.
+	This is intended to be called with the languages of a synthesizer's voices.
+	@param locales: The locales to prepare.
+	@type locales: iterable of str
+	"""
+	if not _isSymbolTablePersistenceAllowed():
+		return
+	thread = threading.Thread(
+		target=_warmUpSymbolTables,
+		args=(list(locales), config.conf['speech']['includeCLDR']),
+		name="characterProcessing.warmUpSymbolTables"
+	)
+	thread.daemon = True
+	thread.start()
+
+def _warmUpSymbolTables(locales, includeCLDR):
+	# This runs in a background thread,
+	# so it must not use the symbol data cached for the main thread.
+	enBaseSymbols = None
+	seen = set()
+	try:
+		for locale in locales:
+			# Mirror the fallback from language_COUNTRY to language used when processing.
+			for l in ((locale, locale.split("_")[0]) if "_" in locale else (locale,)):
+				if l in seen:
+					break
+				seen.add(l)
+				key = _getSymbolTableKey(l, includeCLDR)
+				table = _loadSymbolTable(l, includeCLDR, key)
+				if table is None:
+					try:
+						builtin, user = _getSpeechSymbolsForLocale(l, includeCLDR)
+					except LookupError:
+						continue
+					sources = [user, builtin]
+					if l != "en":
+						if not enBaseSymbols:
+							enBaseSymbols = _getSpeechSymbolsForLocale("en", includeCLDR)[0]
+						sources.append(enBaseSymbols)
+					table = _buildSymbolTable(l, sources)
+					_saveSymbolTable(l, includeCLDR, key, table)
+				_compiledSymbolPatterns[table["pattern"]] = re.compile(table["pattern"], re.UNICODE)
+				break
+	except:
+		log.debugWarning("Error warming up symbol tables", exc_info=True)
+
 def clearSpeechSymbols():
 	"""Clears the symbol data cached by the locale speech symbol processors.
 	This will cause new data to be fetched for the next request to pronounce symbols.
 	"""
 	SpeechSymbolProcessor.localeSymbols.invalidateAllData()
 	_localeSpeechSymbolProcessors.invalidateAllData()
+	_compiledSymbolPatterns.clear()
 
 def handlePostConfigProfileSwitch(prevConf=None):
+	# Results might depend on configuration which has changed.
+	_processedTextCache.clear()
 	if not prevConf:
 		return
 	if prevConf["speech"]["includeCLDR"] is not config.conf["speech"]["includeCLDR"]:
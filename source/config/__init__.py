@@ -344,6 +344,12 @@ class ConfigManager(object):
 		#: @type: bool
 		self.profileTriggersEnabled = True
 		self.validator = Validator()
+		#: Incremented whenever the configuration changes; i.e. the active profiles change or a setting is written.
+		#: Caches of settings can compare this with the value when they were built to check whether they are stale.
+		#: @type: int
+		self.generation = 0
+		#: Caches settings and sections by their full path for L{getValue}, valid for the current L{generation}.
+		self._valueCache = {}
 		self.rootSection = None
 		self._shouldHandleProfileSwitch = True
 		self._pendingHandleProfileSwitch = False
@@ -368,11 +374,17 @@ class ConfigManager(object):
 		init = currentRootSection is None
 		# Reset the cache.
 		self.rootSection = AggregatedSection(self, (), self.spec, self.profiles)
+		self._handleChange()
 		if init:
 			# We're still initialising, so don't notify anyone about this change.
 			return
 		post_configProfileSwitch.notify(prevConf=currentRootSection.dict())
 
+	def _handleChange(self):
+		"""Called whenever the configuration changes, to invalidate caches of settings."""
+		self.generation += 1
+		self._valueCache.clear()
+
 	def _initBaseConf(self, factoryDefaults=False):
 		fn = os.path.join(globalVars.appArgs.configPath, "nvda.ini")
 		if factoryDefaults:
@@ -441,6 +453,29 @@ class ConfigManager(object):
 	def __setitem__(self, key, val):
 		self.rootSection[key] = val
 
+	def getValue(self, path):
+		"""Get a setting or section given the keys leading to it.
+		This is equivalent to looking up each key in turn;
+		e.g. C{conf.getValue(("speech", "symbolLevel"))} returns C{conf["speech"]["symbolLevel"]}.
+		However, the result is cached until the configuration next changes,
+		so repeated lookups of the same path only cost a single dictionary lookup.
+		@param path: The keys, starting from the root of the configuration.
+		@type path: tuple
+		@raise KeyError: If there is no such setting or section.
+		"""
+		try:
+			return self._valueCache[path]
+		except KeyError:
+			pass
+		val = self
+		for key in path:
+			val = val[key]
+		if path[0] not in self.BASE_ONLY_SECTIONS:
+			# Settings in base only sections are changed directly in the base configuration,
+			# so changes to them can't be tracked.
+			self._valueCache[path] = val
+		return val
+
 	def dict(self):
 		return self.rootSection.dict()
 
@@ -810,6 +845,7 @@ class AggregatedSection(object):
 		#: The relevant section in all of the profiles.
 		self.profiles = profiles
 		self._cache = {}
+		self._snapshot = None
 
 	def __getitem__(self, key, checkValidity=True):
 		# Try the cache first.
@@ -932,6 +968,18 @@ class AggregatedSection(object):
 	def copy(self):
 		return dict(self.iteritems())
 
+	def snapshot(self):
+		"""Get an immutable view of this section in which all settings have been validated.
+		Looking up a setting in the view is a plain dictionary lookup,
+		so this is useful where many settings are read in a tight loop.
+		The view is reused until the configuration next changes.
+		@rtype: L{SectionSnapshot}
+		"""
+		snapshot = self._snapshot
+		if snapshot is None or snapshot.generation != self.manager.generation:
+			snapshot = self._snapshot = SectionSnapshot(self)
+		return snapshot
+
 	def dict(self):
 		"""Return a deepcopy of self as a dictionary.
 		Adapted from L{configobj.Section.dict}.
@@ -960,6 +1008,7 @@ class AggregatedSection(object):
 			updateSect = self._getUpdateSection()
 			updateSect[key] = val
 			self.manager._markWriteProfileDirty()
+			self.manager._handleChange()
 			# ConfigObj will have mutated this into a configobj.Section.
 			val = updateSect[key]
 			cache = self._cache.get(key)
@@ -994,6 +1043,7 @@ class AggregatedSection(object):
 		self._getUpdateSection()[key] = val
 		self.manager._markWriteProfileDirty()
 		self._cache[key] = val
+		self.manager._handleChange()
 
 	def _getUpdateSection(self):
 		profile = self.profiles[-1]
@@ -1026,6 +1076,37 @@ class AggregatedSection(object):
 		self._spec.clear()
 		self._spec.update(val)
 
+class SectionSnapshot(dict):
+	"""An immutable view of an L{AggregatedSection} at a point in time, as returned by L{AggregatedSection.snapshot}.
+	Sub-sections are also snapshots and lists are converted to tuples.
+	"""
+
+	def __init__(self, section):
+		"""
+		@param section: The section to take a snapshot of.
+		@type section: L{AggregatedSection}
+		"""
+		#: The L{ConfigManager.generation} when this snapshot was taken.
+		self.generation = section.manager.generation
+		self.path = section.path
+		items = {}
+		for key, val in section.iteritems():
+			if isinstance(val, AggregatedSection):
+				val = val.snapshot()
+			elif isinstance(val, list):
+				val = tuple(val)
+			items[key] = val
+		super(SectionSnapshot, self).__init__(items)
+
+	def _immutable(self, *args, **kwargs):
+		raise TypeError("Configuration snapshots can't be changed")
+
+	__setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _immutable
+
+	def copy(self):
+		"""Return a mutable copy of this snapshot as a dictionary."""
+		return dict(self)
+
 class ProfileTrigger(object):
 	"""A trigger for automatic activation/deactivation of a configuration profile.
 	The user can associate a profile with a trigger.
@@ -37,6 +37,8 @@ schemaVersion = integer(min=0, default={latestSchemaVersion})
 	outputDevice = string(default=default)
 	autoLanguageSwitching = boolean(default=true)
 	autoDialectSwitching = boolean(default=false)
+	# The number of phrases to prepare ahead of time during say all; 0 to prepare speech as it is sent.
+	sayAllReadAhead = integer(default=0,min=0,max=100)
 
 	[[__many__]]
 		capPitchChange = integer(default=30,min=-100,max=100)
@@ -205,9 +207,13 @@ schemaVersion = integer(min=0, default={latestSchemaVersion})
 	gui = boolean(default=false)
 	louis = boolean(default=false)
 	timeSinceInput = boolean(default=false)
+	tracing = boolean(default=false)
 
 [uwpOcr]
 	language = string(default="")
+	# The height in pixels of bands in which to recognize large images, 0 to recognize them at once.
+	# Heights below contentRecog.uwpOcr.MIN_TILE_HEIGHT are raised to it.
+	tileHeight = integer(default=0, min=0)
 
 [upgrade]
 	newLaptopKeyboardLayout = boolean(default=false)
@@ -13,7 +13,9 @@ Recognizers take an image and produce text.
 They are implemented using the L{ContentRecognizer} class.
 """
 
-from collections import namedtuple
+from collections import namedtuple, defaultdict
+from array import array
+from bisect import bisect_right
 import textInfos.offsets
 from abc import ABCMeta, abstractmethod
 from six import with_metaclass
@@ -23,6 +25,14 @@ class ContentRecognizer(with_metaclass(ABCMeta, object)):
 	"""Implementation of a content recognizer.
 	"""
 
+	#: The height in pixels of horizontal bands in which to recognize large images,
+	#: so that only bands which changed since they were last recognized are passed to L{recognize},
+	#: or C{None} to recognize the whole image at once.
+	#: This requires the recognizer to produce L{LinesWordsResult}s and to have a L{cache key<getCacheKey>},
+	#: and text crossing the edge of a band might be recognized poorly.
+	#: @type: int
+	tileHeight = None
+
 	def getResizeFactor(self, width, height):
 		"""Return the factor by which an image must be resized
 		before it is passed to this recognizer.
@@ -35,6 +45,17 @@ class ContentRecognizer(with_metaclass(ABCMeta, object)):
 		"""
 		return 1
 
+	def getCacheKey(self):
+		"""Return a key identifying the results produced by this recognizer,
+		so that the result for an image can be reused if the same image is recognized again.
+		Recognizers with equal keys must produce the same result for the same image;
+		e.g. the key should include the recognition language.
+		Subclasses must override this to have their results reused.
+		@return: A hashable key, or C{None} if results must not be reused.
+		@rtype: object
+		"""
+		return None
+
 	@abstractmethod
 	def recognize(self, pixels, imageInfo, onResult):
 		"""Asynchronously recognize content from an image.
@@ -184,12 +205,23 @@ class LinesWordsResult(RecognitionResult):
 		self._textList = []
 		self.textLen = 0
 		#: End offsets for each line.
-		self.lines = []
+		#: @type: array
+		self.lines = array("l")
 		#: Start offsets and screen coordinates for each word.
 		self.words = []
+		#: Start offsets for each word, to look up words by offset with bisect.
+		self._wordOffsets = array("l")
+		#: End offsets for each word, excluding the space or new line after it.
+		self._wordEnds = array("l")
+		#: Maps the cells of a grid over the screen to the indexes of the words which overlap them.
+		#: This is built by L{getWordIndexAtPoint} when first needed.
+		self._wordGrid = None
 		self._parseData()
 		self.text = "".join(self._textList)
 
+	#: The size in pixels of the cells of the grid used to find words at a point on the screen.
+	WORD_GRID_CELL_SIZE = 64
+
 	def _parseData(self):
 		for line in self.data:
 			firstWordOfLine = True
@@ -205,14 +237,41 @@ class LinesWordsResult(RecognitionResult):
 					self.imageInfo.convertYToScreen(word["y"]),
 					self.imageInfo.convertWidthToScreen(word["width"]),
 					self.imageInfo.convertHeightToScreen(word["height"])))
+				self._wordOffsets.append(self.textLen)
 				text = word["text"]
 				self._textList.append(text)
 				self.textLen += len(text)
+				self._wordEnds.append(self.textLen)
 			# End with new line.
 			self._textList.append("\n")
 			self.textLen += 1
 			self.lines.append(self.textLen)
 
+	def _makeWordGrid(self):
+		grid = defaultdict(list)
+		cellSize = self.WORD_GRID_CELL_SIZE
+		for index, word in enumerate(self.words):
+			for column in xrange(word.left // cellSize, (word.left + max(word.width, 1) - 1) // cellSize + 1):
+				for row in xrange(word.top // cellSize, (word.top + max(word.height, 1) - 1) // cellSize + 1):
+					grid[(column, row)].append(index)
+		return dict(grid)
+
+	def getWordIndexAtPoint(self, x, y):
+		"""Get the index in L{words} of the word at a point on the screen.
+		If words overlap, the first in reading order is returned.
+		@raise LookupError: If there is no word at the point.
+		@rtype: int
+		"""
+		grid = self._wordGrid
+		if grid is None:
+			grid = self._wordGrid = self._makeWordGrid()
+		cellSize = self.WORD_GRID_CELL_SIZE
+		for index in grid.get((x // cellSize, y // cellSize), ()):
+			word = self.words[index]
+			if word.left <= x < word.left + word.width and word.top <= y < word.top + word.height:
+				return index
+		raise LookupError("No word at (%d, %d)" % (x, y))
+
 	def makeTextInfo(self, obj, position):
 		return LwrTextInfo(obj, position, self)
 
@@ -235,32 +294,42 @@ class LwrTextInfo(textInfos.offsets.OffsetsTextInfo):
 		return self.result.textLen
 
 	def _getLineOffsets(self, offset):
-		start = 0
-		for end in self.result.lines:
-			if end > offset:
-				return (start, end)
-			start = end
-		# offset is too big. Fail gracefully by returning the last line.
-		return (start, self.result.textLen)
+		lines = self.result.lines
+		index = bisect_right(lines, offset)
+		start = lines[index - 1] if index > 0 else 0
+		if index == len(lines):
+			# offset is too big. Fail gracefully by returning the last line.
+			return (start, self.result.textLen)
+		return (start, lines[index])
 
 	def _getWordOffsets(self, offset):
-		start = 0
-		for word in self.result.words:
-			if word.offset > offset:
-				return (start, word.offset)
-			start = word.offset
-		# offset is in the last word (or offset is too big).
-		return (start, self.result.textLen)
+		wordOffsets = self.result._wordOffsets
+		index = bisect_right(wordOffsets, offset)
+		start = wordOffsets[index - 1] if index > 0 else 0
+		if index == len(wordOffsets):
+			# offset is in the last word (or offset is too big).
+			return (start, self.result.textLen)
+		return (start, wordOffsets[index])
 
 	def _getBoundingRectFromOffset(self, offset):
-		word = None
-		for nextWord in self.result.words:
-			if nextWord.offset > offset:
-				# Stop! We need the word before this.
-				break
-			word = nextWord
+		# We need the last word which starts at or before offset.
+		index = bisect_right(self.result._wordOffsets, offset) - 1
+		if index < 0:
+			raise LookupError("No word at offset %d" % offset)
+		word = self.result.words[index]
 		return RectLTWH(word.left, word.top, word.width, word.height)
 
+	def _getOffsetFromPoint(self, x, y):
+		result = self.result
+		index = result.getWordIndexAtPoint(x, y)
+		word = result.words[index]
+		length = result._wordEnds[index] - word.offset
+		if length <= 1 or word.width <= 0:
+			return word.offset
+		# Recognizers only give the coordinates of words,
+		# so assume the characters are of equal width.
+		return word.offset + min((x - word.left) * length // word.width, length - 1)
+
 class SimpleTextResult(RecognitionResult):
 	"""A L{RecognitionResult} which presents a simple text string.
 	This should only be used if the recognizer only returns text
@@ -9,8 +9,13 @@ This module provides functionality to capture an image from the screen
 for the current navigator object, pass it to a content recognizer for recognition
 and present the result to the user so they can read it with cursor keys, etc.
 NVDA scripts or GUI call the L{recognizeNavigatorObject} function with the recognizer they wish to use.
+Results are cached, so recognizing the same unchanged content again presents the previous result immediately.
 """
 
+import ctypes
+import functools
+import threading
+import zlib
 import api
 import ui
 import screenBitmap
@@ -22,7 +27,8 @@ import eventHandler
 import textInfos
 from logHandler import log
 import queueHandler
-from . import RecogImageInfo
+import lruCache
+from . import RecogImageInfo, LinesWordsResult
 
 class RecogResultNVDAObject(cursorManager.CursorManager, NVDAObjects.window.Window):
 	"""Fake NVDAObject used to present a recognition result in a cursor manager.
@@ -111,8 +117,153 @@ class RecogResultNVDAObject(cursorManager.CursorManager, NVDAObjects.window.Wind
 		"kb:escape": "exit",
 	}
 
+#: The maximum number of recognition results kept for reuse.
+RESULT_CACHE_SIZE = 10
+#: The maximum number of results kept for bands of images recognized in bands.
+TILE_CACHE_SIZE = 100
+#: Maps (recognizer key, image geometry, pixel hash) to recognition results.
+_resultCache = lruCache.LRUCache(RESULT_CACHE_SIZE)
+#: Maps (recognizer key, width, height, pixel hash) to the lines/words data recognized for a band of an image,
+#: with coordinates relative to the band.
+_tileCache = lruCache.LRUCache(TILE_CACHE_SIZE)
+#: Guards the caches, as recognizers might report results from a background thread.
+_cacheLock = threading.Lock()
+
+def flushResultCache():
+	"""Discards all cached recognition results."""
+	with _cacheLock:
+		_resultCache.clear()
+		_tileCache.clear()
+
+def getResultCacheStatistics():
+	"""Gets statistics about the caches of recognition results for diagnostics.
+	@return: The statistics for whole images (results) and for bands of images (tiles).
+	@rtype: dict
+	"""
+	with _cacheLock:
+		return {
+			"results": _resultCache.getStatistics(),
+			"tiles": _tileCache.getStatistics(),
+		}
+
+def _hashPixels(data):
+	# A collision would present a stale result, so combine two fast checksums.
+	return (zlib.crc32(data), zlib.adler32(data), len(data))
+
+def _getResultCacheKey(recognizer, imgInfo, pixels):
+	recogKey = recognizer.getCacheKey()
+	if recogKey is None:
+		return None
+	return (recogKey, imgInfo.screenLeft, imgInfo.screenTop, imgInfo.screenWidth, imgInfo.screenHeight,
+		imgInfo.resizeFactor, _hashPixels(buffer(pixels)))
+
+def _cacheResult(key, onResult, result):
+	if not isinstance(result, Exception):
+		with _cacheLock:
+			_resultCache[key] = result
+	onResult(result)
+
+class _TiledRecognition(object):
+	"""Recognizes an image in horizontal bands,
+	passing only the bands whose pixels changed since they were last recognized to the recognizer.
+	The lines recognized in the bands are combined into a single L{LinesWordsResult}.
+	Bands are recognized one after the other, as a recognizer can only perform one recognition at a time.
+	"""
+
+	def __init__(self, recognizer, pixels, imgInfo, tileHeight, onResult):
+		self.recognizer = recognizer
+		self.pixels = pixels
+		self.imgInfo = imgInfo
+		self.onResult = onResult
+		recogKey = recognizer.getCacheKey()
+		self._rowType = type(pixels)._type_
+		rowSize = ctypes.sizeof(self._rowType)
+		#: Tuples of (top, height, cache key) for each band.
+		self._tiles = []
+		for top in xrange(0, imgInfo.recogHeight, tileHeight):
+			height = min(tileHeight, imgInfo.recogHeight - top)
+			tileHash = _hashPixels(buffer(pixels, top * rowSize, height * rowSize))
+			self._tiles.append((top, height, (recogKey, imgInfo.recogWidth, height, tileHash)))
+		self._index = 0
+		self._lines = []
+		self._cancelled = False
+
+	def start(self):
+		self._recognizeNext()
+
+	def cancel(self):
+		self._cancelled = True
+		self.recognizer.cancel()
+
+	def _recognizeNext(self):
+		while not self._cancelled and self._index < len(self._tiles):
+			top, height, key = self._tiles[self._index]
+			with _cacheLock:
+				lines = _tileCache.get(key)
+			if lines is None:
+				rowSize = ctypes.sizeof(self._rowType)
+				tilePixels = (self._rowType * height).from_buffer_copy(self.pixels, top * rowSize)
+				imgInfo = self.imgInfo
+				tileInfo = RecogImageInfo(imgInfo.screenLeft, imgInfo.screenTop + top, imgInfo.screenWidth, height, 1)
+				self.recognizer.recognize(tilePixels, tileInfo, self._onTileResult)
+				return
+			self._addLines(top, lines)
+			self._index += 1
+		if not self._cancelled:
+			self.onResult(LinesWordsResult(self._lines, self.imgInfo))
+
+	def _recognizeWhole(self):
+		if not self._cancelled:
+			self.recognizer.recognize(self.pixels, self.imgInfo, self.onResult)
+
+	def _onTileResult(self, result):
+		if self._cancelled:
+			return
+		if isinstance(result, Exception):
+			self.onResult(result)
+			return
+		# Recognizers might not be able to start another recognition from their result callback,
+		# which might also be called from a background thread, so continue in the main thread.
+		if not isinstance(result, LinesWordsResult):
+			log.debugWarning("Can't combine results of type %s, recognizing whole image" % type(result).__name__)
+			queueHandler.queueFunction(queueHandler.eventQueue, self._recognizeWhole)
+			return
+		top, height, key = self._tiles[self._index]
+		with _cacheLock:
+			_tileCache[key] = result.data
+		self._addLines(top, result.data)
+		self._index += 1
+		queueHandler.queueFunction(queueHandler.eventQueue, self._recognizeNext)
+
+	def _addLines(self, top, lines):
+		for line in lines:
+			self._lines.append([dict(word, y=word["y"] + top) for word in line])
+
 #: Keeps track of the recognition in progress, if any.
 _activeRecog = None
+
+def _recognize(recognizer, pixels, imgInfo, onResult):
+	"""Recognize an image, reusing the result if the same image was recognized before.
+	Large images are recognized in bands if the recognizer has a L{ContentRecognizer.tileHeight}.
+	"""
+	global _activeRecog
+	tileHeight = recognizer.tileHeight
+	key = _getResultCacheKey(recognizer, imgInfo, pixels)
+	if key is not None:
+		with _cacheLock:
+			result = _resultCache.get(key)
+		if result is not None:
+			onResult(result)
+			return
+		onResult = functools.partial(_cacheResult, key, onResult)
+	# Tiles are reused by their pixels alone, so this is only done for images which aren't resized.
+	if key is not None and tileHeight and imgInfo.resizeFactor == 1 and imgInfo.recogHeight > tileHeight:
+		_activeRecog = _TiledRecognition(recognizer, pixels, imgInfo, tileHeight, onResult)
+		_activeRecog.start()
+		return
+	_activeRecog = recognizer
+	recognizer.recognize(pixels, imgInfo, onResult)
+
 def recognizeNavigatorObject(recognizer):
 	"""User interface function to recognize content in the navigator object.
 	This should be called from a script or in response to a GUI action.
@@ -146,8 +297,7 @@ def recognizeNavigatorObject(recognizer):
 	ui.message(_("Recognizing"))
 	sb = screenBitmap.ScreenBitmap(imgInfo.recogWidth, imgInfo.recogHeight)
 	pixels = sb.captureImage(left, top, width, height)
-	_activeRecog = recognizer
-	recognizer.recognize(pixels, imgInfo, _recogOnResult)
+	_recognize(recognizer, pixels, imgInfo, _recogOnResult)
 
 def _recogOnResult(result):
 	global _activeRecog
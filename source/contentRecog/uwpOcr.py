@@ -15,6 +15,9 @@ import config
 import languageHandler
 
 uwpOcr_Callback = ctypes.CFUNCTYPE(None, ctypes.c_wchar_p)
+#: The smallest height in pixels of the bands in which large images are recognized.
+#: Lines of text are cut by the edges of narrower bands too often to be recognized well.
+MIN_TILE_HEIGHT = 100
 
 def getLanguages():
 	"""Return the available recognition languages.
@@ -84,8 +87,13 @@ class UwpOcr(ContentRecognizer):
 			self.language = language
 		else:
 			self.language = getConfigLanguage()
+		tileHeight = config.conf["uwpOcr"]["tileHeight"]
+		self.tileHeight = max(tileHeight, MIN_TILE_HEIGHT) if tileHeight else None
 		self._dll = NVDAHelper.getHelperLocalWin10Dll()
 
+	def getCacheKey(self):
+		return (type(self), self.language)
+
 	def recognize(self, pixels, imgInfo, onResult):
 		self._onResult = onResult
 		@uwpOcr_Callback
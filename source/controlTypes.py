@@ -662,7 +662,7 @@ def processPositiveStates(role, states, reason, positiveStates=None):
 	@return: The processed positive states.
 	@rtype: set
 	"""
-	positiveStates = positiveStates.copy() if positiveStates is not None else states.copy()
+	positiveStates = set(positiveStates) if positiveStates is not None else set(states)
 	# The user never cares about certain states.
 	if role==ROLE_EDITABLETEXT:
 		positiveStates.discard(STATE_EDITABLE)
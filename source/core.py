@@ -471,6 +471,7 @@ This initializes all modules such as audio, IAccessible, keyboard, mouse, and GU
 	queueHandler.queueFunction(queueHandler.eventQueue, _setInitialFocus)
 	import watchdog
 	import baseObject
+	import tracing
 
 	# Doing this here is a bit ugly, but we don't want these modules imported
 	# at module level, including wx.
@@ -481,14 +482,25 @@ This initializes all modules such as audio, IAccessible, keyboard, mouse, and GU
 			global _isPumpPending
 			_isPumpPending = False
 			watchdog.alive()
+			tracing.updateEnabled()
+			if tracing.isEnabled:
+				tracing.recordCounter("eventQueue", queueHandler.eventQueue.qsize())
+				tracing.recordCounter("generators", len(queueHandler.generators))
 			try:
-				if touchHandler.handler:
-					touchHandler.handler.pump()
-				JABHandler.pumpAll()
-				IAccessibleHandler.pumpAll()
-				queueHandler.pumpAll()
-				mouseHandler.pumpAll()
-				braille.pumpAll()
+				with tracing.span(tracing.CATEGORY_PUMP, "pump"):
+					if touchHandler.handler:
+						with tracing.span(tracing.CATEGORY_PUMP, "touchHandler"):
+							touchHandler.handler.pump()
+					with tracing.span(tracing.CATEGORY_PUMP, "JABHandler"):
+						JABHandler.pumpAll()
+					with tracing.span(tracing.CATEGORY_PUMP, "IAccessibleHandler"):
+						IAccessibleHandler.pumpAll()
+					with tracing.span(tracing.CATEGORY_PUMP, "queueHandler"):
+						queueHandler.pumpAll()
+					with tracing.span(tracing.CATEGORY_PUMP, "mouseHandler"):
+						mouseHandler.pumpAll()
+					with tracing.span(tracing.CATEGORY_PUMP, "braille"):
+						braille.pumpAll()
 			except:
 				log.exception("errors in this core pump cycle")
 			baseObject.AutoPropertyObject.invalidateCaches()
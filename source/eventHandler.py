@@ -5,6 +5,8 @@
 #Copyright (C) 2007-2017 NV Access Limited, Babbage B.V.
 
 import threading
+import itertools
+from functools import partial
 import queueHandler
 import api
 import speech
@@ -17,6 +19,7 @@ import globalPluginHandler
 import config
 import winUser
 import extensionPoints
+import tracing
 
 #Some dicts to store event counts by name and or obj
 _pendingEventCountsByName={}
@@ -28,6 +31,32 @@ _pendingEventCountsLock=threading.RLock()
 #: the last object queued for a gainFocus event. Useful for code running outside NVDA's core queue 
 lastQueuedFocusObject=None
 
+#: Names of events which are superseded by a later event of the same type for the same object.
+#: When one of these is queued without extra arguments,
+#: any event of the same type for the same object still pending in the queue is dropped.
+#: Unless they are for the last object queued for a gainFocus event,
+#: these events are also deferred to a later core pump
+#: once too much time has been spent processing the queue in the current one,
+#: so that focus and caret events queued after a flood of them are handled promptly.
+#: @type: set
+coalescedEvents={"nameChange","valueChange","stateChange","descriptionChange","locationChange"}
+#: Maps (eventName, object key) to the serial number of the last such event queued, for events which may be superseded.
+#: The object key is the object's L{NVDAObjects.NVDAObject.eventCoalescingKey},
+#: or the object itself if it has none.
+#: Protected by L{_pendingEventCountsLock}.
+_latestCoalescedEvents={}
+_coalescedEventSerials=itertools.count()
+#: Maps app names to dicts containing the number of events which were merged into a later event
+#: or deferred to a later core pump.
+_eventStatistics={}
+
+#: Maps (class, event function name) to whether instances of the class might handle the event.
+#: @type: dict
+_classHandlerCache={}
+#: Maps event function names to tuples of the running global plugins which handle the event.
+#: @type: dict
+_pluginHandlerCache={}
+
 def queueEvent(eventName,obj,**kwargs):
 	"""Queues an NVDA event to be executed.
 	@param eventName: the name of the event type (e.g. 'gainFocus', 'nameChange')
@@ -36,13 +65,29 @@ def queueEvent(eventName,obj,**kwargs):
 	global lastQueuedFocusObject
 	if eventName=="gainFocus":
 		lastQueuedFocusObject=obj
+	coalescingKey=_getCoalescingKey(eventName,obj) if eventName in coalescedEvents and not kwargs else None
 	with _pendingEventCountsLock:
 		_pendingEventCountsByName[eventName]=_pendingEventCountsByName.get(eventName,0)+1
 		_pendingEventCountsByObj[obj]=_pendingEventCountsByObj.get(obj,0)+1
 		_pendingEventCountsByNameAndObj[(eventName,obj)]=_pendingEventCountsByNameAndObj.get((eventName,obj),0)+1
-	queueHandler.queueFunction(queueHandler.eventQueue,_queueEventCallback,eventName,obj,kwargs)
+		if coalescingKey is not None:
+			serial=_latestCoalescedEvents[coalescingKey]=next(_coalescedEventSerials)
+		else:
+			serial=None
+	if serial is not None and obj is not lastQueuedFocusObject:
+		queueHandler.queueDeferrableFunction(queueHandler.eventQueue,partial(_countEvent,obj,"deferred"),_queueEventCallback,eventName,obj,kwargs,serial,coalescingKey)
+	else:
+		queueHandler.queueFunction(queueHandler.eventQueue,_queueEventCallback,eventName,obj,kwargs,serial,coalescingKey)
+
+def _getCoalescingKey(eventName,obj):
+	try:
+		objKey=obj.eventCoalescingKey
+	except:
+		log.debugWarning("Error getting eventCoalescingKey",exc_info=True)
+		objKey=None
+	return (eventName,obj if objKey is None else objKey)
 
-def _queueEventCallback(eventName,obj,kwargs):
+def _queueEventCallback(eventName,obj,kwargs,serial=None,coalescingKey=None):
 	with _pendingEventCountsLock:
 		curCount=_pendingEventCountsByName.get(eventName,0)
 		if curCount>1:
@@ -59,8 +104,40 @@ def _queueEventCallback(eventName,obj,kwargs):
 			_pendingEventCountsByNameAndObj[(eventName,obj)]=(curCount-1)
 		elif curCount==1:
 			del _pendingEventCountsByNameAndObj[(eventName,obj)]
+		superseded=False
+		if serial is not None:
+			if _latestCoalescedEvents.get(coalescingKey)==serial:
+				del _latestCoalescedEvents[coalescingKey]
+			else:
+				superseded=True
+	if superseded:
+		# A later event of this type for this object (or an equal one) is pending.
+		_countEvent(obj,"merged")
+		return
 	executeEvent(eventName,obj,**kwargs)
 
+def _countEvent(obj,statistic):
+	try:
+		appName=obj.appModule.appName
+	except:
+		appName=None
+	counts=_eventStatistics.get(appName)
+	if not counts:
+		counts=_eventStatistics[appName]={"merged":0,"deferred":0}
+	counts[statistic]+=1
+
+def getEventStatistics():
+	"""Gets the number of queued events which were merged into a later event of the same type for the same object
+	and which were deferred to a later core pump, for each app.
+	@return: Maps app names to dicts with merged and deferred counts.
+		The app name is C{None} for objects whose app module couldn't be determined.
+	@rtype: dict
+	"""
+	return {appName:dict(counts) for appName,counts in _eventStatistics.iteritems()}
+
+def resetEventStatistics():
+	_eventStatistics.clear()
+
 def isPendingEvents(eventName=None,obj=None):
 	"""Are there currently any events queued?
 	@param eventName: an optional name of an event type. If given then only if there are events of this type queued will it return True.
@@ -110,7 +187,7 @@ class _EventExecuter(object):
 		funcName = "event_%s" % eventName
 
 		# Global plugin level.
-		for plugin in globalPluginHandler.runningPlugins:
+		for plugin in _getPluginsHandlingEvent(funcName):
 			func = getattr(plugin, funcName, None)
 			if func:
 				yield func, (obj, self.next)
@@ -118,22 +195,53 @@ class _EventExecuter(object):
 		# App module level.
 		app = obj.appModule
 		if app:
-			func = getattr(app, funcName, None)
+			func = _getEventHandler(app, funcName)
 			if func:
 				yield func, (obj, self.next)
 
 		# Tree interceptor level.
 		treeInterceptor = obj.treeInterceptor
 		if treeInterceptor:
-			func = getattr(treeInterceptor, funcName, None)
+			func = _getEventHandler(treeInterceptor, funcName)
 			if func and (getattr(func,'ignoreIsReady',False) or treeInterceptor.isReady):
 				yield func, (obj, self.next)
 
 		# NVDAObject level.
-		func = getattr(obj, funcName, None)
+		func = _getEventHandler(obj, funcName)
 		if func:
 			yield func, ()
 
+def _getPluginsHandlingEvent(funcName):
+	try:
+		return _pluginHandlerCache[funcName]
+	except KeyError:
+		pass
+	plugins = _pluginHandlerCache[funcName] = tuple(plugin for plugin in globalPluginHandler.runningPlugins
+		if getattr(plugin, funcName, None))
+	return plugins
+
+def _getEventHandler(instance, funcName):
+	"""Gets an event function from an object,
+	avoiding the attribute lookup if neither the class nor the instance defines it.
+	@return: The event function or C{None} if there is none.
+	"""
+	cls = instance.__class__
+	try:
+		onClass = _classHandlerCache[(cls, funcName)]
+	except KeyError:
+		onClass = _classHandlerCache[(cls, funcName)] = bool(getattr(cls, funcName, None))
+	if not onClass and funcName not in getattr(instance, "__dict__", ()):
+		return None
+	return getattr(instance, funcName, None)
+
+def invalidateHandlerCaches():
+	"""Discards the cached knowledge of which event functions are defined by global plugins and classes.
+	This must be called whenever global plugins are started or stopped
+	and when app modules are reloaded.
+	"""
+	_classHandlerCache.clear()
+	_pluginHandlerCache.clear()
+
 def executeEvent(eventName,obj,**kwargs):
 	"""Executes an NVDA event.
 	@param eventName: the name of the event type (e.g. 'gainFocus', 'nameChange')
@@ -143,16 +251,17 @@ def executeEvent(eventName,obj,**kwargs):
 	@param kwargs: Additional event parameters as keyword arguments.
 	"""
 	try:
-		# Allow NVDAObjects to redirect focus events to another object of their choosing.
-		if eventName=="gainFocus" and obj.focusRedirect:
-			obj=obj.focusRedirect
-		sleepMode=obj.sleepMode
-		if eventName=="gainFocus" and not doPreGainFocus(obj,sleepMode=sleepMode):
-			return
-		elif not sleepMode and eventName=="documentLoadComplete" and not doPreDocumentLoadComplete(obj):
-			return
-		elif not sleepMode:
-			_EventExecuter(eventName,obj,kwargs)
+		with tracing.span(tracing.CATEGORY_EVENT, eventName):
+			# Allow NVDAObjects to redirect focus events to another object of their choosing.
+			if eventName=="gainFocus" and obj.focusRedirect:
+				obj=obj.focusRedirect
+			sleepMode=obj.sleepMode
+			if eventName=="gainFocus" and not doPreGainFocus(obj,sleepMode=sleepMode):
+				return
+			elif not sleepMode and eventName=="documentLoadComplete" and not doPreDocumentLoadComplete(obj):
+				return
+			elif not sleepMode:
+				_EventExecuter(eventName,obj,kwargs)
 	except:
 		log.exception("error executing event: %s on %s with extra args of %s"%(eventName,obj,kwargs))
 
@@ -32,6 +32,8 @@ def initialize():
 			runningPlugins.add(plugin())
 		except:
 			log.error("Error initializing global plugin %r" % plugin, exc_info=True)
+	import eventHandler
+	eventHandler.invalidateHandlerCaches()
 
 def terminate():
 	for plugin in list(runningPlugins):
@@ -40,6 +42,8 @@ def terminate():
 			plugin.terminate()
 		except:
 			log.exception("Error terminating global plugin %r" % plugin)
+	import eventHandler
+	eventHandler.invalidateHandlerCaches()
 
 def reloadGlobalPlugins():
 	"""Reloads running global plugins.
@@ -34,6 +34,7 @@ import queueHandler
 import braille
 import brailleTables
 import brailleInput
+import louisHelper
 import core
 import keyboardHandler
 import characterProcessing
@@ -2420,7 +2421,10 @@ class BrailleSettingsSubPanel(SettingsPanel):
 			log.debug("Finished making settings, now at %.2f seconds from start"%(time.time() - startTime))
 
 	def onSave(self):
-		config.conf["braille"]["translationTable"] = self.outTableNames[self.outTableList.GetSelection()]
+		outTable = self.outTableNames[self.outTableList.GetSelection()]
+		if outTable != config.conf["braille"]["translationTable"]:
+			config.conf["braille"]["translationTable"] = outTable
+			louisHelper.flushTranslationCache()
 		brailleInput.handler.table = self.inTables[self.inTableList.GetSelection()]
 		config.conf["braille"]["expandAtCursor"] = self.expandAtCursorCheckBox.GetValue()
 		config.conf["braille"]["showCursor"] = self.showCursorCheckBox.GetValue()
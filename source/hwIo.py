@@ -8,6 +8,7 @@
 See the L{Serial} and L{Hid} classes.
 Braille display drivers must be thread-safe to use this, as it utilises a background thread.
 See L{braille.BrailleDisplayDriver.isThreadSafe}.
+L{hwIoFraming} can be used to split received data into packets.
 """
 
 import threading
@@ -55,6 +56,9 @@ class IoBase(object):
 		self._recvEvt = winKernel.createEvent()
 		self._ioDoneInst = LPOVERLAPPED_COMPLETION_ROUTINE(self._ioDone)
 		self._writeOl = OVERLAPPED()
+		self._openTime = time.time()
+		self._writes = 0
+		self._bytesWritten = 0
 		# Do the initial read.
 		@winKernel.PAPCFUNC
 		def init(param):
@@ -91,6 +95,7 @@ class IoBase(object):
 	def write(self, data):
 		if _isDebug():
 			log.debug("Write: %r" % data)
+		self._countWrite(data)
 		size = self._writeSize or len(data)
 		buf = ctypes.create_string_buffer(size)
 		buf.raw = data
@@ -102,6 +107,24 @@ class IoBase(object):
 			bytes = DWORD()
 			ctypes.windll.kernel32.GetOverlappedResult(self._writeFile, byref(self._writeOl), byref(bytes), True)
 
+	def _countWrite(self, data):
+		self._writes += 1
+		self._bytesWritten += len(data)
+
+	def getWriteStatistics(self):
+		"""Gets statistics about the data written since this device was opened.
+		This can be used to check how much a change saves on a given (possibly emulated) display.
+		@return: The number of writes, the number of bytes written
+			and the average number of bytes written per second.
+		@rtype: dict
+		"""
+		elapsed = time.time() - self._openTime
+		return {
+			"writes": self._writes,
+			"bytes": self._bytesWritten,
+			"bytesPerSecond": self._bytesWritten / elapsed if elapsed > 0 else 0.0,
+		}
+
 	def close(self):
 		if _isDebug():
 			log.debug("Closing")
@@ -156,12 +179,19 @@ class Serial(IoBase):
 	def __init__(self, *args, **kwargs):
 		"""Constructor.
 		Pass the arguments you would normally pass to L{serial.Serial}.
-		There is also one additional keyword argument.
+		There are also additional keyword arguments.
 		@param onReceive: A callable taking a byte of received data as its only argument.
 			This callable can then call C{read} to get additional data if desired.
 		@type onReceive: callable(str)
+		@param onReceiveSize: The maximum size of the data with which to call C{onReceive}.
+			If this is more than 1, C{onReceive} is called with whatever data is available
+			as soon as at least one byte is received,
+			which is suitable for use with L{hwIoFraming.FramedReader}.
+		@type onReceiveSize: int
 		"""
 		onReceive = kwargs.pop("onReceive")
+		onReceiveSize = kwargs.pop("onReceiveSize", 1)
+		self._bulkRead = onReceiveSize > 1
 		self._ser = None
 		self.port = args[0] if len(args) >= 1 else kwargs["port"]
 		if _isDebug():
@@ -176,7 +206,7 @@ class Serial(IoBase):
 		# We don't want a timeout while we're waiting for data.
 		self._setTimeout(None)
 		self.inWaiting = self._ser.inWaiting
-		super(Serial, self).__init__(self._ser.hComPort, onReceive)
+		super(Serial, self).__init__(self._ser.hComPort, onReceive, onReceiveSize=onReceiveSize)
 
 	def read(self, size=1):
 		data = self._ser.read(size)
@@ -187,6 +217,7 @@ class Serial(IoBase):
 	def write(self, data):
 		if _isDebug():
 			log.debug("Write: %r" % data)
+		self._countWrite(data)
 		self._ser.write(data)
 
 	def close(self):
@@ -207,7 +238,12 @@ class Serial(IoBase):
 		# Therefore, manually set the timeouts using the Win32 API.
 		# Adapted from pyserial 3.1.1.
 		timeouts = COMMTIMEOUTS()
-		if timeout is not None:
+		if timeout is None and self._bulkRead:
+			# Wait for at least one byte, then return with whatever is available.
+			timeouts.ReadIntervalTimeout = MAXDWORD
+			timeouts.ReadTotalTimeoutMultiplier = MAXDWORD
+			timeouts.ReadTotalTimeoutConstant = MAXDWORD - 1
+		elif timeout is not None:
 			if timeout == 0:
 				timeouts.ReadIntervalTimeout = win32.MAXDWORD
 			else:
@@ -0,0 +1,321 @@
+#hwIoFraming.py
+#A part of NonVisual Desktop Access (NVDA)
+#This file is covered by the GNU General Public License.
+#See the file COPYING for more details.
+#Copyright (C) 2018 NV Access Limited
+
+"""Splitting of data received from braille displays into packets, and a loopback transport for testing.
+Rather than reading a byte at a time and reading the rest of each packet synchronously,
+a driver can read data in bulk (see the C{onReceiveSize} argument of L{hwIo.Serial})
+and pass it to the L{FramedReader.feed} method of a L{FramedReader}.
+The reader collects data in a buffer and uses a framer such as L{LengthPrefixedFramer}
+to split it into packets, which are passed to the driver in batches.
+L{Loopback} provides the interface of L{hwIo} devices without any hardware,
+so that drivers can be tested against an emulated display on any platform.
+This module doesn't depend on Windows.
+"""
+
+import time
+import struct
+from logHandler import log
+
+class Framer(object):
+	"""Base class for framers, which find packets in received data.
+	"""
+
+	def frame(self, buf, pos):
+		"""Find the packet at the given position in the received data.
+		@param buf: The received data.
+		@type buf: bytearray
+		@param pos: The position at which the next packet starts.
+		@type pos: int
+		@return: The packet and the position after it.
+			If there isn't a complete packet yet, the packet is C{None}.
+			In that case, a position after C{pos} means that the data up to it isn't part of a packet and should be discarded.
+		@rtype: tuple
+		"""
+		raise NotImplementedError
+
+class FixedSizeFramer(Framer):
+	"""Splits data into packets of a fixed size.
+	"""
+
+	def __init__(self, size):
+		"""
+		@param size: The size of each packet in bytes.
+		@type size: int
+		"""
+		if size < 1:
+			raise ValueError("size must be at least 1")
+		self.size = size
+
+	def frame(self, buf, pos):
+		end = pos + self.size
+		if end > len(buf):
+			return None, pos
+		return bytes(buf[pos:end]), end
+
+class LengthPrefixedFramer(Framer):
+	"""Splits data into packets which contain their length in a header.
+	The size of a packet is the length given in the header
+	plus the size of the header up to and including the length,
+	plus C{extraLength}.
+	"""
+
+	def __init__(self, lengthOffset, lengthSize=1, extraLength=0, bigEndian=True, startByte=None):
+		"""
+		@param lengthOffset: The offset of the length within a packet.
+		@type lengthOffset: int
+		@param lengthSize: The size of the length in bytes; 1, 2 or 4.
+		@type lengthSize: int
+		@param extraLength: The number of bytes to add to the length given in the header;
+			e.g. the size of a trailer, or a negative number if the length includes the length itself.
+		@type extraLength: int
+		@param bigEndian: Whether the length is big endian.
+		@type bigEndian: bool
+		@param startByte: The byte with which every packet starts, or C{None} if packets can start with any byte.
+			If given, data before this byte is discarded.
+		@type startByte: str
+		"""
+		self.lengthOffset = lengthOffset
+		self.lengthSize = lengthSize
+		self.extraLength = extraLength
+		self._lengthStruct = struct.Struct((">" if bigEndian else "<") + {1: "B", 2: "H", 4: "I"}[lengthSize])
+		self.startByte = None if startByte is None else ord(startByte)
+
+	def frame(self, buf, pos):
+		if self.startByte is not None and buf[pos] != self.startByte:
+			start = buf.find(chr(self.startByte), pos)
+			return None, len(buf) if start == -1 else start
+		headerSize = self.lengthOffset + self.lengthSize
+		if pos + headerSize > len(buf):
+			return None, pos
+		length, = self._lengthStruct.unpack_from(buf, pos + self.lengthOffset)
+		end = pos + max(headerSize + length + self.extraLength, headerSize)
+		if end > len(buf):
+			return None, pos
+		return bytes(buf[pos:end]), end
+
+class DelimitedFramer(Framer):
+	"""Splits data into packets which end with a delimiter.
+	An escape byte can be used to include the delimiter or the escape byte itself in a packet.
+	"""
+
+	def __init__(self, delimiter, escape=None, includeDelimiter=False):
+		"""
+		@param delimiter: The byte which ends a packet.
+		@type delimiter: str
+		@param escape: The byte which causes the byte after it to be taken literally, or C{None} if there is none.
+			Escape bytes are removed from packets.
+		@type escape: str
+		@param includeDelimiter: Whether the delimiter is included at the end of packets.
+		@type includeDelimiter: bool
+		"""
+		self.delimiter = delimiter
+		self.escape = escape
+		self.includeDelimiter = includeDelimiter
+
+	def frame(self, buf, pos):
+		end = buf.find(self.delimiter, pos)
+		escape = self.escape
+		if escape is None or end == -1 or buf.find(escape, pos, end) == -1:
+			if end == -1:
+				return None, pos
+			packet = bytes(buf[pos:end + 1 if self.includeDelimiter else end])
+			return packet, end + 1
+		# Unescape byte by byte, as the delimiter found above might have been escaped.
+		escapeOrd = ord(escape)
+		delimiterOrd = ord(self.delimiter)
+		packet = bytearray()
+		index = pos
+		bufLen = len(buf)
+		while index < bufLen:
+			byte = buf[index]
+			if byte == escapeOrd:
+				if index + 1 == bufLen:
+					break
+				packet.append(buf[index + 1])
+				index += 2
+				continue
+			if byte == delimiterOrd:
+				if self.includeDelimiter:
+					packet.append(byte)
+				return bytes(packet), index + 1
+			packet.append(byte)
+			index += 1
+		return None, pos
+
+class FirstByteFramer(Framer):
+	"""Chooses a framer according to the first byte of each packet.
+	This suits protocols with several kinds of packets, such as acknowledgements and data packets.
+	Bytes which don't start a known kind of packet are discarded.
+	"""
+
+	def __init__(self, framers):
+		"""
+		@param framers: Maps the first byte of each kind of packet to the framer for that kind.
+		@type framers: dict
+		"""
+		self.framers = dict((ord(byte), framer) for byte, framer in framers.iteritems())
+
+	def frame(self, buf, pos):
+		framer = self.framers.get(buf[pos])
+		if framer is None:
+			return None, pos + 1
+		return framer.frame(buf, pos)
+
+class FramedReader(object):
+	"""Collects received data and passes complete packets to a callback.
+	Pass L{feed} as the C{onReceive} callback of a L{hwIo} device or L{Loopback}.
+	All packets completed by a chunk of data are passed to the callback at once,
+	so that bulk reads don't result in a call per packet.
+	"""
+
+	#: The maximum number of bytes kept while waiting for the rest of a packet.
+	#: If more data is received without completing a packet, the buffered data is discarded.
+	#: @type: int
+	maxBufferSize = 65536
+
+	def __init__(self, framer, onPacket):
+		"""
+		@param framer: The framer which splits the data into packets.
+		@type framer: L{Framer}
+		@param onPacket: A callable taking a list of packets as its only argument.
+		@type onPacket: callable([str, ...])
+		"""
+		self.framer = framer
+		self._onPacket = onPacket
+		self._buf = bytearray()
+		#: The number of bytes received.
+		self.bytesReceived = 0
+		#: The number of packets passed to the callback.
+		self.packets = 0
+		#: The number of calls to the callback.
+		self.batches = 0
+		#: The number of bytes discarded because they weren't part of a packet.
+		self.bytesDiscarded = 0
+
+	def feed(self, data):
+		"""Add received data, calling the callback with any packets this completes.
+		@param data: The received data.
+		@type data: str
+		"""
+		buf = self._buf
+		buf.extend(data)
+		self.bytesReceived += len(data)
+		frame = self.framer.frame
+		packets = []
+		pos = 0
+		bufLen = len(buf)
+		while pos < bufLen:
+			packet, nextPos = frame(buf, pos)
+			if packet is not None:
+				packets.append(packet)
+			elif nextPos == pos:
+				# Incomplete packet.
+				break
+			else:
+				self.bytesDiscarded += nextPos - pos
+			pos = nextPos
+		# Deleting the consumed data at once is much cheaper than deleting each packet from the buffer.
+		del buf[:pos]
+		if len(buf) > self.maxBufferSize:
+			log.debugWarning("Discarding %d bytes received without a complete packet" % len(buf))
+			self.bytesDiscarded += len(buf)
+			del buf[:]
+		if packets:
+			self.packets += len(packets)
+			self.batches += 1
+			self._onPacket(packets)
+
+	def reset(self):
+		"""Discard any incomplete packet; e.g. after the device was reset.
+		"""
+		del self._buf[:]
+
+class Loopback(object):
+	"""A transport with the interface of L{hwIo.Serial} which is connected to code in the same process instead of a device.
+	Data written by the driver is passed to C{onWrite}; e.g. a display emulator.
+	Data sent by the emulator with L{receive} is passed to the driver's C{onReceive} callback
+	when L{waitForRead} or L{dispatch} is called,
+	much as L{hwIo} calls it from its background thread.
+	While in that callback, the driver can L{read} further received data synchronously.
+	"""
+
+	def __init__(self, onReceive, onReceiveSize=1, onWrite=None):
+		"""
+		@param onReceive: A callable taking received data as its only argument.
+		@type onReceive: callable(str)
+		@param onReceiveSize: The maximum size of the data with which to call C{onReceive}.
+		@type onReceiveSize: int
+		@param onWrite: A callable taking data written by the driver as its only argument, or C{None}.
+		@type onWrite: callable(str)
+		"""
+		self._onReceive = onReceive
+		self._readSize = onReceiveSize
+		self.onWrite = onWrite
+		self._pending = bytearray()
+		self._openTime = time.time()
+		self._writes = 0
+		self._bytesWritten = 0
+
+	def receive(self, data):
+		"""Queue data as if it was sent by the device.
+		@type data: str
+		"""
+		self._pending.extend(data)
+
+	def dispatch(self):
+		"""Pass queued data to the C{onReceive} callback.
+		@return: C{True} if any data was passed, C{False} if none was queued.
+		@rtype: bool
+		"""
+		pending = self._pending
+		if not pending:
+			return False
+		while pending and self._onReceive:
+			data = bytes(pending[:self._readSize])
+			del pending[:self._readSize]
+			try:
+				self._onReceive(data)
+			except:
+				log.error("", exc_info=True)
+		return True
+
+	def waitForRead(self, timeout):
+		"""Process queued data, as L{hwIo.IoBase.waitForRead} does.
+		This never waits, as data can only be queued by this thread.
+		@return: C{True} if received data was processed, C{False} if none was queued.
+		@rtype: bool
+		"""
+		return self.dispatch()
+
+	def read(self, size=1):
+		data = bytes(self._pending[:size])
+		del self._pending[:size]
+		return data
+
+	def inWaiting(self):
+		return len(self._pending)
+
+	def write(self, data):
+		self._writes += 1
+		self._bytesWritten += len(data)
+		if self.onWrite:
+			self.onWrite(data)
+
+	def getWriteStatistics(self):
+		"""Gets statistics about the data written, as L{hwIo.IoBase.getWriteStatistics} does.
+		@rtype: dict
+		"""
+		elapsed = time.time() - self._openTime
+		return {
+			"writes": self._writes,
+			"bytes": self._bytesWritten,
+			"bytesPerSecond": self._bytesWritten / elapsed if elapsed > 0 else 0.0,
+		}
+
+	def close(self):
+		self._onReceive = None
+		self.onWrite = None
+		del self._pending[:]
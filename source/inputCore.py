@@ -15,6 +15,7 @@ import os
 import itertools
 import weakref
 import time
+from timeit import default_timer
 import configobj
 import sayAllHandler
 import baseObject
@@ -24,6 +25,8 @@ import api
 import speech
 import characterProcessing
 import config
+import tracing
+import lruCache
 from fileUtils import FaultTolerantFile
 import watchdog
 from logHandler import log
@@ -192,6 +195,10 @@ class GlobalGestureMap(object):
 		@type entries: mapping of str to mapping
 		"""
 		self._map = {}
+		#: Caches the classes and script names found by L{getScriptsForGesture}.
+		#: Maps gesture identifiers to the scripts and the modules they were found in.
+		#: @type: dict
+		self._resolvedScripts = {}
 		#: Indicates that the last load or update contained an error.
 		#: @type: bool
 		self.lastUpdateContainedError = False
@@ -205,6 +212,7 @@ class GlobalGestureMap(object):
 		"""Clear this map.
 		"""
 		self._map.clear()
+		self._resolvedScripts.clear()
 		self.lastUpdateContainedError = False
 
 	def add(self, gesture, module, className, script,replace=False):
@@ -229,6 +237,7 @@ class GlobalGestureMap(object):
 		if replace:
 			del scripts[:]
 		scripts.append((module, className, script))
+		self._resolvedScripts.pop(gesture, None)
 
 	def load(self, filename):
 		"""Load map entries from a file.
@@ -301,22 +310,32 @@ class GlobalGestureMap(object):
 		@type gesture: str
 		@return: The Python class and script name for each script;
 			the script name may be C{None} indicating that the gesture should be unbound for this class.
-		@rtype: generator of (class, str)
+		@rtype: tuple of (class, str)
 		"""
 		try:
-			scripts = self._map[gesture]
+			scripts, modules = self._resolvedScripts[gesture]
 		except KeyError:
-			return
-		for moduleName, className, scriptName in scripts:
-			try:
-				module = sys.modules[moduleName]
-			except KeyError:
-				continue
+			pass
+		else:
+			# Classes are only found in modules which have been imported,
+			# so the scripts must be found again if any of the modules have since been imported or reloaded.
+			for moduleName, module in modules:
+				if sys.modules.get(moduleName) is not module:
+					break
+			else:
+				return scripts
+		scripts = []
+		modules = {}
+		for moduleName, className, scriptName in self._map.get(gesture, ()):
+			module = modules[moduleName] = sys.modules.get(moduleName)
 			try:
 				cls = getattr(module, className)
 			except AttributeError:
 				continue
-			yield cls, scriptName
+			scripts.append((cls, scriptName))
+		scripts = tuple(scripts)
+		self._resolvedScripts[gesture] = (scripts, tuple(modules.iteritems()))
+		return scripts
 
 	def getScriptsForAllGestures(self):
 		"""Get all of the scripts and their gestures.
@@ -346,6 +365,7 @@ class GlobalGestureMap(object):
 		except KeyError:
 			raise ValueError("Mapping not found")
 		scripts.remove((module, className, script))
+		self._resolvedScripts.pop(gesture, None)
 
 	def save(self):
 		"""Save this gesture map to disk.
@@ -405,6 +425,7 @@ class InputManager(baseObject.AutoPropertyObject):
 		self.loadLocaleGestureMap()
 		self.loadUserGestureMap()
 		self._lastInputTime = None
+		self.resetScriptLookupStatistics()
 
 	def executeGesture(self, gesture):
 		"""Perform the action associated with a gesture.
@@ -418,7 +439,12 @@ class InputManager(baseObject.AutoPropertyObject):
 			# as well as stopping a flood of actions when the core revives.
 			raise NoInputGestureAction
 
+		lookupStartTime = default_timer()
 		script = gesture.script
+		lookupTime = default_timer() - lookupStartTime
+		self._scriptLookupCount += 1
+		self._scriptLookupTotalTime += lookupTime
+		self._scriptLookupMaxTime = max(self._scriptLookupMaxTime, lookupTime)
 		focus = api.getFocusObject()
 		if focus.sleepMode is focus.SLEEP_FULL or (focus.sleepMode and not getattr(script, 'allowInSleepMode', False)):
 			raise NoInputGestureAction
@@ -441,9 +467,13 @@ class InputManager(baseObject.AutoPropertyObject):
 		elif speechEffect in (gesture.SPEECHEFFECT_PAUSE, gesture.SPEECHEFFECT_RESUME):
 			queueHandler.queueFunction(queueHandler.eventQueue, speech.pauseSpeech, speechEffect == gesture.SPEECHEFFECT_PAUSE)
 
+		if tracing.isEnabled and not gesture.isModifier:
+			tracing.markInput(gesture.identifiers[0])
+			tracing.record(tracing.CATEGORY_INPUT, "scriptLookup", lookupStartTime, lookupTime)
+
 		if log.isEnabledFor(log.IO) and not gesture.isModifier:
 			self._lastInputTime = time.time()
-			log.io("Input: %s" % gesture.identifiers[0])
+			log.io("Input: %s, script lookup took %.3f ms" % (gesture.identifiers[0], lookupTime * 1000))
 
 		if self._captureFunc:
 			try:
@@ -473,6 +503,23 @@ class InputManager(baseObject.AutoPropertyObject):
 
 		raise NoInputGestureAction
 
+	def resetScriptLookupStatistics(self):
+		self._scriptLookupCount = 0
+		self._scriptLookupTotalTime = 0.0
+		self._scriptLookupMaxTime = 0.0
+
+	def getScriptLookupStatistics(self):
+		"""Gets statistics about the time taken to find the script for each gesture executed, for diagnostics.
+		@return: The number of lookups, and the mean and maximum time taken in milliseconds.
+		@rtype: dict
+		"""
+		count = self._scriptLookupCount
+		return {
+			"count": count,
+			"meanTime": self._scriptLookupTotalTime * 1000 / count if count else 0.0,
+			"maxTime": self._scriptLookupMaxTime * 1000,
+		}
+
 	def _get_isInputHelpActive(self):
 		"""Whether input help is enabled, wherein the function of each key pressed by the user is reported but not executed.
 		@rtype: bool
@@ -704,6 +751,9 @@ class AllGesturesScriptInfo(object):
 	def className(self):
 		return self.cls.__name__
 
+#: Caches identifiers normalized by L{normalizeGestureIdentifier}, as this is done several times for every gesture executed.
+_normalizedGestureIdentifiers = lruCache.LRUCache(maxSize=1000)
+
 def normalizeGestureIdentifier(identifier):
 	"""Normalize a gesture identifier so that it matches other identifiers for the same gesture.
 	First, the entire identifier is converted to lower case.
@@ -712,6 +762,12 @@ def normalizeGestureIdentifier(identifier):
 	This is done because, for example, "kb:shift+alt+downArrow"
 	must be treated the same as "kb:alt+shift+downarrow".
 	"""
+	normalized = _normalizedGestureIdentifiers.get(identifier)
+	if normalized is None:
+		normalized = _normalizedGestureIdentifiers[identifier] = _normalizeGestureIdentifier(identifier)
+	return normalized
+
+def _normalizeGestureIdentifier(identifier):
 	identifier = identifier.lower()
 	prefix, main = identifier.split(":", 1)
 	main = main.split("+")
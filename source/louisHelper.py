@@ -9,6 +9,7 @@
 import louis
 from logHandler import log
 import config
+import lruCache
 
 LOUIS_TO_NVDA_LOG_LEVELS = {
 	louis.LOG_ALL: log.DEBUG,
@@ -48,19 +49,53 @@ def terminate():
 	louis.registerLogCallback(None)
 	# Free liblouis resources
 	louis.liblouis.lou_free()
+	flushTranslationCache()
+
+#: Caches the results of L{translate}.
+#: Regions are often translated again with exactly the same input;
+#: e.g. focus ancestors on every focus change and lines when only the caret moves.
+_translationCache = lruCache.LRUCache(maxSize=500)
+
+def flushTranslationCache():
+	"""Discards all cached translations; e.g. when the translation table changes."""
+	_translationCache.clear()
+
+def getTranslationCacheStatistics():
+	"""Gets statistics about the cache of translations for diagnostics.
+	@rtype: dict
+	"""
+	return _translationCache.getStatistics()
 
 def translate(tableList, inbuf, typeform=None, cursorPos=None, mode=0):
 	"""
 	Convenience wrapper for louis.translate that:
-	* returns a list of integers instead of an string with cells, and
-	* distinguishes between cursor position 0 (cursor at first character) and None (no cursor at all)
+	* returns a list of integers instead of an string with cells,
+	* distinguishes between cursor position 0 (cursor at first character) and None (no cursor at all), and
+	* caches translations, so that liblouis is only called if the input hasn't been translated recently.
+	The returned lists are always new lists, so callers may modify them.
 	"""
 	text = unicode(inbuf).replace('\0','')
+	typeform = tuple(typeform) if typeform is not None else None
+	# Unless the braille at the cursor is expanded, the cursor doesn't influence the translation,
+	# so the braille cursor position can be derived from the position mapping.
+	# This isn't possible for a cursor beyond the end of the text, so the cursor is part of the key in that case.
+	cursorIndependent = not mode & louis.compbrlAtCursor and (cursorPos is None or 0 <= cursorPos < len(text))
+	key = (tuple(tableList), text, typeform, mode, None if cursorIndependent else cursorPos)
+	cached = _translationCache.get(key)
+	if cached:
+		braille, brailleToRawPos, rawToBraillePos, brailleCursorPos = cached
+		if cursorIndependent:
+			brailleCursorPos = rawToBraillePos[cursorPos] if cursorPos is not None else None
+		return list(braille), list(brailleToRawPos), list(rawToBraillePos), brailleCursorPos
+	braille, brailleToRawPos, rawToBraillePos, brailleCursorPos = _translate(tableList, text, typeform, cursorPos, mode)
+	_translationCache[key] = (tuple(braille), tuple(brailleToRawPos), tuple(rawToBraillePos), brailleCursorPos)
+	return braille, brailleToRawPos, rawToBraillePos, brailleCursorPos
+
+def _translate(tableList, text, typeform, cursorPos, mode):
 	braille, brailleToRawPos, rawToBraillePos, brailleCursorPos = louis.translate(
 		tableList,
 		text,
-		# liblouis mutates typeform if it is a list.
-		typeform=tuple(typeform) if isinstance(typeform, list) else typeform,
+		typeform=typeform,
 		cursorPos=cursorPos or 0,
 		mode=mode
 	)
@@ -0,0 +1,74 @@
+#lruCache.py
+#A part of NonVisual Desktop Access (NVDA)
+#This file is covered by the GNU General Public License.
+#See the file COPYING for more details.
+#Copyright (C) 2018 NV Access Limited
+
+"""A bounded cache which discards the least recently used items, with statistics for diagnostics."""
+
+from collections import OrderedDict
+
+class LRUCache(object):
+	"""A mapping of a bounded size which discards the least recently used item when it is full.
+	Lookups through L{get} are counted as hits or misses,
+	so that the effectiveness of a cache can be checked with L{getStatistics}.
+	"""
+
+	def __init__(self, maxSize):
+		"""
+		@param maxSize: The maximum number of items to keep.
+		@type maxSize: int
+		"""
+		if maxSize < 1:
+			raise ValueError("maxSize must be at least 1")
+		self.maxSize = maxSize
+		self._items = OrderedDict()
+		#: The number of lookups which found an item.
+		self.hits = 0
+		#: The number of lookups which did not find an item.
+		self.misses = 0
+
+	def get(self, key, default=None):
+		"""Looks up an item, marking it as the most recently used.
+		@return: The item for C{key}, or C{default} if there is none.
+		"""
+		try:
+			value = self._items.pop(key)
+		except KeyError:
+			self.misses += 1
+			return default
+		self._items[key] = value
+		self.hits += 1
+		return value
+
+	def __setitem__(self, key, value):
+		items = self._items
+		items.pop(key, None)
+		items[key] = value
+		if len(items) > self.maxSize:
+			items.popitem(last=False)
+
+	def __contains__(self, key):
+		return key in self._items
+
+	def __len__(self):
+		return len(self._items)
+
+	def clear(self):
+		"""Discards all items. Statistics are kept."""
+		self._items.clear()
+
+	def resetStatistics(self):
+		self.hits = self.misses = 0
+
+	def getStatistics(self):
+		"""Gets statistics about this cache for diagnostics.
+		@return: The number of hits, misses, current size and maximum size.
+		@rtype: dict
+		"""
+		return {
+			"hits": self.hits,
+			"misses": self.misses,
+			"size": len(self._items),
+			"maxSize": self.maxSize,
+		}
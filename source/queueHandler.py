@@ -5,6 +5,8 @@
 #See the file COPYING for more details.
 
 import types
+from collections import deque
+from timeit import default_timer
 try:
 	from Queue import Queue # Python 2.7 import
 except ImportError:
@@ -18,6 +20,19 @@ eventQueue=Queue()
 eventQueue.__name__="eventQueue"
 generators={}
 lastGeneratorObjID=0
+#: The time in seconds which L{flushQueue} may spend executing items from a queue
+#: before it starts deferring functions queued with L{queueDeferrableFunction} to the next core pump.
+#: @type: float
+deferrableTimeBudget=0.05
+#: Maps queues to deques of items deferred by L{flushQueue}.
+#: These are executed before any other items in the queue when it is next flushed.
+_deferredItems={}
+
+class _DeferrableItem(tuple):
+	"""An item queued by L{queueDeferrableFunction}.
+	This contains the function, its positional and keyword arguments
+	and a function to call each time the item is deferred.
+	"""
 
 def registerGeneratorObject(generatorObj):
 	global generators,lastGeneratorObjID
@@ -40,22 +55,56 @@ def queueFunction(queue,func,*args,**kwargs):
 	queue.put_nowait((func,args,kwargs))
 	core.requestPump()
 
+def queueDeferrableFunction(queue,onDefer,func,*args,**kwargs):
+	"""Queues a function which can be deferred to a later core pump
+	if L{flushQueue} has already spent more than L{deferrableTimeBudget} executing items from the queue.
+	This should be used for low priority work which may be delayed behind more important items queued after it.
+	@param onDefer: A function to call with no arguments each time the item is deferred, or C{None}.
+	@type onDefer: callable
+	"""
+	queue.put_nowait(_DeferrableItem((func,args,kwargs,onDefer)))
+	core.requestPump()
+
 def isRunningGenerators():
 	res=len(generators)>0
 	log.debug("generators running: %s"%res)
 
+def _executeItem(queue,item,deferred,startTime):
+	if isinstance(item,_DeferrableItem) and default_timer()-startTime>deferrableTimeBudget:
+		deferred.append(item)
+		onDefer=item[3]
+		if onDefer:
+			try:
+				onDefer()
+			except:
+				log.exception("Error in onDefer for func %s from %s"%(item[0].__name__,queue.__name__))
+		return
+	func,args,kwargs=item[:3]
+	watchdog.alive()
+	try:
+		func(*args,**kwargs)
+	except:
+		log.exception("Error in func %s from %s"%(func.__name__,queue.__name__))
+
 def flushQueue(queue):
+	startTime=default_timer()
+	# Items deferred previously were queued before anything still in the queue, so execute them first.
+	oldDeferred=_deferredItems.pop(queue,None)
+	deferred=deque()
+	while oldDeferred:
+		_executeItem(queue,oldDeferred.popleft(),deferred,startTime)
 	for count in xrange(queue.qsize()+1):
 		if not queue.empty():
-			(func,args,kwargs)=queue.get_nowait()
-			watchdog.alive()
-			try:
-				func(*args,**kwargs)
-			except:
-				log.exception("Error in func %s from %s"%(func.__name__,queue.__name__))
+			_executeItem(queue,queue.get_nowait(),deferred,startTime)
+	if deferred:
+		# Items may have been deferred by a nested flush while executing an item.
+		# Those were queued after the items deferred here.
+		deferred.extend(_deferredItems.pop(queue,()))
+		_deferredItems[queue]=deferred
+		core.requestPump()
 
 def isPendingItems(queue):
-	if not queue.empty():
+	if not queue.empty() or _deferredItems.get(queue):
 		res=True
 	else:
 		res=False
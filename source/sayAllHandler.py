@@ -110,31 +110,55 @@ def readTextHelper_generator(cursor):
 	keepReading=True
 	speakTextInfoState=speech.SpeakTextInfoState(reader.obj)
 	with SayAllProfileTrigger():
+		readAheadSize=config.conf["speech"]["sayAllReadAhead"]
+		if readAheadSize:
+			# Speech for chunks is prepared ahead of time,
+			# so lastSentIndex is the last chunk prepared
+			# and lastSpokenIndex is the last chunk sent to the synth.
+			readAhead=speech.SpeechReadAhead()
+			lastSpokenIndex=0
+		else:
+			readAhead=None
 		while True:
 			if not reader.obj:
 				# The object died, so we should too.
 				return
-			# lastReceivedIndex might be None if other speech was interspersed with this say all.
-			# In this case, we want to send more text in case this was the last chunk spoken.
-			if lastReceivedIndex is None or (lastSentIndex-lastReceivedIndex)<=10:
+			if readAhead is not None:
+				# Send prepared speech when the synth needs more.
+				while readAhead and (lastReceivedIndex is None or (lastSpokenIndex-lastReceivedIndex)<=10):
+					index=readAhead.speakNext()
+					if index is not None:
+						lastSpokenIndex=index
+				shouldFetch=len(readAhead)<readAheadSize
+			else:
+				# lastReceivedIndex might be None if other speech was interspersed with this say all.
+				# In this case, we want to send more text in case this was the last chunk spoken.
+				shouldFetch=lastReceivedIndex is None or (lastSentIndex-lastReceivedIndex)<=10
+			if shouldFetch:
 				if keepReading:
 					bookmark=reader.bookmark
 					index=lastSentIndex+1
 					delta=reader.move(textInfos.UNIT_READINGCHUNK,1,endPoint="end")
 					if delta<=0:
-						speech.speakWithoutPauses(None)
+						_flushSpeech(readAhead)
 						keepReading=False
 						continue
-					speech.speakTextInfo(reader,unit=textInfos.UNIT_READINGCHUNK,reason=controlTypes.REASON_SAYALL,index=index,useCache=speakTextInfoState)
+					if readAhead is not None:
+						readAhead.add(speech.speakTextInfo(reader,unit=textInfos.UNIT_READINGCHUNK,reason=controlTypes.REASON_SAYALL,index=index,useCache=speakTextInfoState,returnSpeech=True))
+						if index-(readAhead.lastPreparedIndex or 0)>=10:
+							# A large chunk of speech is waiting for the end of a phrase, so prepare it now.
+							readAhead.flush()
+					else:
+						speech.speakTextInfo(reader,unit=textInfos.UNIT_READINGCHUNK,reason=controlTypes.REASON_SAYALL,index=index,useCache=speakTextInfoState)
 					lastSentIndex=index
 					cursorIndexMap[index]=(bookmark,speakTextInfoState.copy())
 					try:
 						reader.collapse(end=True)
 					except RuntimeError: #MS Word when range covers end of document
 						# Word specific: without this exception to indicate that further collapsing is not posible, say-all could enter an infinite loop.
-						speech.speakWithoutPauses(None)
+						_flushSpeech(readAhead)
 						keepReading=False
-			else:
+			elif readAhead is None:
 				# We'll wait for speech to catch up a bit before sending more text.
 				if speech.speakWithoutPauses.lastSentIndex is None or (lastSentIndex-speech.speakWithoutPauses.lastSentIndex)>=10:
 					# There is a large chunk of pending speech
@@ -184,6 +208,14 @@ def readTextHelper_generator(cursor):
 		for i in xrange(30):
 			yield
 
+def _flushSpeech(readAhead):
+	"""Speaks or prepares the final incomplete phrase of say all speech.
+	"""
+	if readAhead is not None:
+		readAhead.flush()
+	else:
+		speech.speakWithoutPauses(None)
+
 class SayAllProfileTrigger(config.ProfileTrigger):
 	"""A configuration profile trigger for when say all is in progress.
 	"""
@@ -7,6 +7,7 @@
 import time
 import weakref
 import inspect
+import six
 import config
 import speech
 import sayAllHandler
@@ -18,6 +19,8 @@ import inputCore
 import globalPluginHandler
 import braille
 import keyLabels
+import baseObject
+import tracing
 
 _numScriptsQueued=0 #Number of scripts that are queued to be executed
 #: Number of scripts that send their gestures on that are queued to be executed or are currently being executed.
@@ -26,6 +29,13 @@ _lastScriptTime=0 #Time in MS of when the last script was executed
 _lastScriptRef=None #Holds a weakref to the last script that was executed
 _lastScriptCount=0 #The amount of times the last script was repeated
 _isScriptRunning=False
+#: Caches the scripts found on objects by L{_getObjScript} while the focus and its ancestors don't change.
+#: Maps the id of the object, the gesture identifiers and the global map scripts
+#: to a weak reference to the object, the version of its gesture map, the script and whether the script is a method of the object.
+#: Such methods are stored as functions, so that the cache doesn't keep the object alive.
+_objScriptCache={}
+#: The focus and focus ancestors for which L{_objScriptCache} is valid.
+_objScriptCacheFocus=(None,None)
 
 def _makeKbEmulateScript(scriptName):
 	import keyboardHandler
@@ -57,49 +67,83 @@ def _getObjScript(obj, gesture, globalMapScripts):
 	# Search the object itself for in-built bindings.
 	return obj.getScript(gesture)
 
+def _getCachedObjScript(obj, gesture, identifiers, globalMapScripts):
+	"""Get the script for a gesture on an object as L{_getObjScript} does,
+	reusing the script found previously for the same object, gesture identifiers and global map scripts
+	if the object's gesture bindings haven't changed since.
+	"""
+	version = getattr(obj, "_gestureMapVersion", None)
+	if version is None or six.get_unbound_function(type(obj).getScript) is not _baseGetScript:
+		# The script might depend on more than the object's gesture bindings.
+		return _getObjScript(obj, gesture, globalMapScripts)
+	key = (id(obj), identifiers, globalMapScripts)
+	try:
+		objRef, cachedVersion, func, isMethod = _objScriptCache[key]
+	except KeyError:
+		pass
+	else:
+		# The id might have been reused by another object.
+		if objRef() is obj and cachedVersion == version:
+			return func.__get__(obj, type(obj)) if isMethod else func
+	func = _getObjScript(obj, gesture, globalMapScripts)
+	isMethod = getattr(func, "__self__", None) is obj
+	_objScriptCache[key] = (weakref.ref(obj), version, func.__func__ if isMethod else func, isMethod)
+	return func
+
+_baseGetScript = six.get_unbound_function(baseObject.ScriptableObject.getScript)
+
 def findScript(gesture):
+	global _objScriptCacheFocus
 	focus = api.getFocusObject()
 	if not focus:
 		return None
+	focusAncestors = api.getFocusAncestors()
+	cachedFocus, cachedFocusAncestors = _objScriptCacheFocus
+	if cachedFocus is not focus or cachedFocusAncestors is not focusAncestors:
+		# The focus has changed, so scripts found for the previous focus and its ancestors are no longer useful.
+		_objScriptCache.clear()
+		_objScriptCacheFocus = (focus, focusAncestors)
 
 	# Import late to avoid circular import.
 	# We need to import this here because this might be the first import of this module
 	# and it might be needed by global maps.
 	import globalCommands
 
+	identifiers = tuple(gesture.normalizedIdentifiers)
 	globalMapScripts = []
 	globalMaps = [inputCore.manager.userGestureMap, inputCore.manager.localeGestureMap]
 	globalMap = braille.handler.display.gestureMap
 	if globalMap:
 		globalMaps.append(globalMap)
 	for globalMap in globalMaps:
-		for identifier in gesture.normalizedIdentifiers:
+		for identifier in identifiers:
 			globalMapScripts.extend(globalMap.getScriptsForGesture(identifier))
+	globalMapScripts = tuple(globalMapScripts)
 
 	# Gesture specific scriptable object.
 	obj = gesture.scriptableObject
 	if obj:
-		func = _getObjScript(obj, gesture, globalMapScripts)
+		func = _getCachedObjScript(obj, gesture, identifiers, globalMapScripts)
 		if func:
 			return func
 
 	# Global plugin level.
 	for plugin in globalPluginHandler.runningPlugins:
-		func = _getObjScript(plugin, gesture, globalMapScripts)
+		func = _getCachedObjScript(plugin, gesture, identifiers, globalMapScripts)
 		if func:
 			return func
 
 	# App module level.
 	app = focus.appModule
 	if app:
-		func = _getObjScript(app, gesture, globalMapScripts)
+		func = _getCachedObjScript(app, gesture, identifiers, globalMapScripts)
 		if func:
 			return func
 
 	# Tree interceptor level.
 	treeInterceptor = focus.treeInterceptor
 	if treeInterceptor and treeInterceptor.isReady:
-		func = _getObjScript(treeInterceptor, gesture, globalMapScripts)
+		func = _getCachedObjScript(treeInterceptor, gesture, identifiers, globalMapScripts)
 		from browseMode import BrowseModeTreeInterceptor
 		if isinstance(treeInterceptor,BrowseModeTreeInterceptor):
 			func=treeInterceptor.getAlternativeScript(gesture,func)
@@ -107,16 +151,16 @@ def findScript(gesture):
 			return func
 
 	# NVDAObject level.
-	func = _getObjScript(focus, gesture, globalMapScripts)
+	func = _getCachedObjScript(focus, gesture, identifiers, globalMapScripts)
 	if func:
 		return func
-	for obj in reversed(api.getFocusAncestors()):
-		func = _getObjScript(obj, gesture, globalMapScripts)
+	for obj in reversed(focusAncestors):
+		func = _getCachedObjScript(obj, gesture, identifiers, globalMapScripts)
 		if func and getattr(func, 'canPropagate', False):
 			return func
 
 	# Global commands.
-	func = _getObjScript(globalCommands.commands, gesture, globalMapScripts)
+	func = _getCachedObjScript(globalCommands.commands, gesture, identifiers, globalMapScripts)
 	if func:
 		return func
 
@@ -184,7 +228,8 @@ def executeScript(script,gesture):
 			_lastScriptCount=0
 		_lastScriptRef=scriptRef
 		_lastScriptTime=scriptTime
-		script(gesture)
+		with tracing.span(tracing.CATEGORY_SCRIPT, scriptFunc.__name__):
+			script(gesture)
 	except:
 		log.exception("error executing script: %s with gesture %r"%(script,gesture.displayName))
 	finally:
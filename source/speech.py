@@ -9,6 +9,7 @@
 """ 
 
 import itertools
+import collections
 import weakref
 import unicodedata
 import time
@@ -27,6 +28,8 @@ import queueHandler
 import speechDictHandler
 import characterProcessing
 import languageHandler
+import tracing
+import lruCache
 
 speechMode_off=0
 speechMode_beeps=1
@@ -94,7 +97,7 @@ def cancelSpeech():
 	# Import only for this function to avoid circular import.
 	import sayAllHandler
 	sayAllHandler.stop()
-	speakWithoutPauses._pendingSpeechSequence=[]
+	_phraseAccumulator.clear()
 	speakWithoutPauses.lastSentIndex=None
 	if _speakSpellingGenerator:
 		_speakSpellingGenerator.close()
@@ -128,7 +131,7 @@ def getCurrentLanguage():
 	language=None
 	if  synth:
 		try:
-			language=synth.language if config.conf['speech']['trustVoiceLanguage'] else None
+			language=synth.language if config.conf.getValue(("speech", "trustVoiceLanguage")) else None
 		except NotImplementedError:
 			pass
 	if language:
@@ -139,7 +142,7 @@ def getCurrentLanguage():
 
 def spellTextInfo(info,useCharacterDescriptions=False):
 	"""Spells the text from the given TextInfo, honouring any LangChangeCommand objects it finds if autoLanguageSwitching is enabled."""
-	if not config.conf['speech']['autoLanguageSwitching']:
+	if not config.conf.getValue(("speech", "autoLanguageSwitching")):
 		speakSpelling(info.text,useCharacterDescriptions=useCharacterDescriptions)
 		return
 	curLanguage=None
@@ -165,7 +168,7 @@ def speakSpelling(text,locale=None,useCharacterDescriptions=False):
 		cancelSpeech()
 	beenCanceled=False
 	defaultLanguage=getCurrentLanguage()
-	if not locale or (not config.conf['speech']['autoDialectSwitching'] and locale.split('_')[0]==defaultLanguage.split('_')[0]):
+	if not locale or (not config.conf.getValue(("speech", "autoDialectSwitching")) and locale.split('_')[0]==defaultLanguage.split('_')[0]):
 		locale=defaultLanguage
 
 	if not text:
@@ -242,8 +245,9 @@ def _speakSpellingGen(text,locale,useCharacterDescriptions):
 			index=count+1
 			import inputCore
 			inputCore.logTimeSinceInput()
+			tracing.markOutput("speech")
 			log.io("Speaking character %r"%char)
-			speechSequence=[LangChangeCommand(locale)] if config.conf['speech']['autoLanguageSwitching'] else []
+			speechSequence=[LangChangeCommand(locale)] if config.conf.getValue(("speech", "autoLanguageSwitching")) else []
 			if len(char) == 1 and synthConfig["useSpellingFunctionality"]:
 				speechSequence.append(CharacterModeCommand(True))
 			if index is not None:
@@ -513,6 +517,43 @@ def speak(speechSequence,symbolLevel=None):
 	"""
 	if not speechSequence: #Pointless - nothing to speak 
 		return
+	if not _startSpeaking(speechSequence):
+		return
+	speechSequence,normalizedSequence=_prepareSpeechSequence(speechSequence,symbolLevel,log.isEnabledFor(log.IO))
+	if not speechSequence:
+		# After normalisation, the sequence is empty.
+		# There's nothing to speak.
+		return
+	_logSpeech(normalizedSequence)
+	getSynth().speak(speechSequence)
+
+def prepareSpeech(speechSequence,symbolLevel=None):
+	"""Does the normalisation and text processing which L{speak} does ahead of time,
+	so that the result can be spoken later with L{speakPreparedSpeech}.
+	The current language, symbol level and speech dictionaries are used,
+	so the result should be spoken soon after it is prepared.
+	@param speechSequence: the sequence of text and L{SpeechCommand} objects to prepare
+	@param symbolLevel: The symbol verbosity level; C{None} (default) to use the user's configuration.
+	@return: The sequence to send to the synthesizer, which is empty if there is nothing to speak.
+	@rtype: list
+	"""
+	return _prepareSpeechSequence(speechSequence,symbolLevel)[0]
+
+def speakPreparedSpeech(speechSequence,preparedSequence):
+	"""Speaks speech prepared with L{prepareSpeech}.
+	@param speechSequence: The sequence which was prepared, which is shown in the speech viewer.
+	@param preparedSequence: The sequence returned by L{prepareSpeech}.
+	"""
+	if not speechSequence or not _startSpeaking(speechSequence) or not preparedSequence:
+		return
+	_logSpeech(preparedSequence if log.isEnabledFor(log.IO) else None)
+	getSynth().speak(preparedSequence)
+
+def _startSpeaking(speechSequence):
+	"""Handles the speech mode and state for speech which is about to be spoken.
+	@return: C{True} if the speech should be sent to the synthesizer, C{False} if not.
+	@rtype: bool
+	"""
 	import speechViewer
 	if speechViewer.isActive:
 		for item in speechSequence:
@@ -521,58 +562,71 @@ def speak(speechSequence,symbolLevel=None):
 	global beenCanceled, curWordChars
 	curWordChars=[]
 	if speechMode==speechMode_off:
-		return
+		return False
 	elif speechMode==speechMode_beeps:
 		tones.beep(config.conf["speech"]["beepSpeechModePitch"],speechMode_beeps_ms)
-		return
+		return False
 	if isPaused:
 		cancelSpeech()
 	beenCanceled=False
-	#Filter out redundant LangChangeCommand objects 
-	#And also fill in default values
-	autoLanguageSwitching=config.conf['speech']['autoLanguageSwitching']
-	autoDialectSwitching=config.conf['speech']['autoDialectSwitching']
+	return True
+
+def _prepareSpeechSequence(speechSequence,symbolLevel,keepNormalized=False):
+	"""Normalises a speech sequence and processes its text in a single pass.
+	Redundant L{LangChangeCommand}s and empty strings are removed,
+	language changes are filled in with the current language where needed
+	and text is processed with L{processText}.
+	@param symbolLevel: The symbol verbosity level; C{None} to use the user's configuration.
+	@param keepNormalized: Whether to also return the normalised sequence before text processing, e.g. for logging.
+	@return: The prepared sequence and the normalised sequence, or C{None} instead of the latter if C{keepNormalized} is C{False}.
+	@rtype: tuple
+	"""
+	autoLanguageSwitching=config.conf.getValue(("speech", "autoLanguageSwitching"))
+	autoDialectSwitching=config.conf.getValue(("speech", "autoDialectSwitching"))
+	if symbolLevel is None:
+		symbolLevel=config.conf.getValue(("speech", "symbolLevel"))
 	curLanguage=defaultLanguage=getCurrentLanguage()
 	prevLanguage=None
 	defaultLanguageRoot=defaultLanguage.split('_')[0]
-	oldSpeechSequence=speechSequence
-	speechSequence=[]
-	for item in oldSpeechSequence:
-		if isinstance(item,LangChangeCommand):
+	inCharacterMode=False
+	preparedSequence=[]
+	normalizedSequence=[] if keepNormalized else None
+	for item in speechSequence:
+		if isinstance(item,basestring):
+			if not item: continue
+			if autoLanguageSwitching and curLanguage!=prevLanguage:
+				command=LangChangeCommand(curLanguage)
+				preparedSequence.append(command)
+				if keepNormalized:
+					normalizedSequence.append(command)
+				prevLanguage=curLanguage
+			if keepNormalized:
+				normalizedSequence.append(item)
+			item=processText(curLanguage,item,symbolLevel)
+			if not inCharacterMode:
+				item+=CHUNK_SEPARATOR
+		elif isinstance(item,LangChangeCommand):
+			#Filter out LangChangeCommand objects, adding them back only before the text they apply to
+			#And also fill in default values
 			if not autoLanguageSwitching: continue
 			curLanguage=item.lang
 			if not curLanguage or (not autoDialectSwitching and curLanguage.split('_')[0]==defaultLanguageRoot):
 				curLanguage=defaultLanguage
-		elif isinstance(item,basestring):
-			if not item: continue
-			if autoLanguageSwitching and curLanguage!=prevLanguage:
-				speechSequence.append(LangChangeCommand(curLanguage))
-				prevLanguage=curLanguage
-			speechSequence.append(item)
+			continue
 		else:
-			speechSequence.append(item)
-	if not speechSequence:
-		# After normalisation, the sequence is empty.
-		# There's nothing to speak.
-		return
+			if isinstance(item,CharacterModeCommand):
+				inCharacterMode=item.state
+			if keepNormalized:
+				normalizedSequence.append(item)
+		preparedSequence.append(item)
+	return preparedSequence,normalizedSequence
+
+def _logSpeech(speechSequence):
 	import inputCore
 	inputCore.logTimeSinceInput()
-	log.io("Speaking %r" % speechSequence)
-	if symbolLevel is None:
-		symbolLevel=config.conf["speech"]["symbolLevel"]
-	curLanguage=defaultLanguage
-	inCharacterMode=False
-	for index in xrange(len(speechSequence)):
-		item=speechSequence[index]
-		if isinstance(item,CharacterModeCommand):
-			inCharacterMode=item.state
-		if autoLanguageSwitching and isinstance(item,LangChangeCommand):
-			curLanguage=item.lang
-		if isinstance(item,basestring):
-			speechSequence[index]=processText(curLanguage,item,symbolLevel)
-			if not inCharacterMode:
-				speechSequence[index]+=CHUNK_SEPARATOR
-	getSynth().speak(speechSequence)
+	tracing.markOutput("speech")
+	if speechSequence is not None:
+		log.io("Speaking %r" % speechSequence)
 
 def speakSelectionMessage(message,text):
 	if len(text) < 512:
@@ -754,7 +808,14 @@ def _speakTextInfo_addMath(speechSequence, info, field):
 	except (NotImplementedError, LookupError):
 		return
 
-def speakTextInfo(info,useCache=True,formatConfig=None,unit=None,reason=controlTypes.REASON_QUERY,index=None,onlyInitialFields=False,suppressBlanks=False):
+def speakTextInfo(info,useCache=True,formatConfig=None,unit=None,reason=controlTypes.REASON_QUERY,index=None,onlyInitialFields=False,suppressBlanks=False,returnSpeech=False):
+	"""Speaks the content of a TextInfo, including the fields which have changed since the last call if a cache is used.
+	@param returnSpeech: If C{True}, the speech is returned rather than spoken.
+		This isn't supported when speaking single characters or words, which are spelled.
+	@type returnSpeech: bool
+	@return: The speech if C{returnSpeech} is C{True}.
+	@rtype: list
+	"""
 	onlyCache=reason==controlTypes.REASON_ONLYCACHE
 	if isinstance(useCache,SpeakTextInfoState):
 		speakTextInfoState=useCache
@@ -762,11 +823,14 @@ def speakTextInfo(info,useCache=True,formatConfig=None,unit=None,reason=controlT
 		 speakTextInfoState=SpeakTextInfoState(info.obj)
 	else:
 		speakTextInfoState=None
-	autoLanguageSwitching=config.conf['speech']['autoLanguageSwitching']
+	autoLanguageSwitching=config.conf.getValue(("speech", "autoLanguageSwitching"))
 	extraDetail=unit in (textInfos.UNIT_CHARACTER,textInfos.UNIT_WORD)
 	if not formatConfig:
 		formatConfig=config.conf["documentFormatting"]
 	if extraDetail:
+		if isinstance(formatConfig,config.AggregatedSection):
+			# Copying a snapshot avoids looking up and validating each setting in the section.
+			formatConfig=formatConfig.snapshot()
 		formatConfig=formatConfig.copy()
 		formatConfig['extraDetail']=True
 	reportIndentation=unit==textInfos.UNIT_LINE and ( formatConfig["reportLineIndentation"] or formatConfig["reportLineIndentationWithTones"])
@@ -776,22 +840,25 @@ def speakTextInfo(info,useCache=True,formatConfig=None,unit=None,reason=controlT
 	controlFieldStackCache=speakTextInfoState.controlFieldStackCache if speakTextInfoState else []
 	formatFieldAttributesCache=speakTextInfoState.formatFieldAttributesCache if speakTextInfoState else {}
 	textWithFields=info.getTextWithFields(formatConfig)
+	if isinstance(formatConfig,config.AggregatedSection):
+		# Only reads of the configuration remain, so use a snapshot to make each read while speaking fields a plain dictionary lookup.
+		formatConfig=formatConfig.snapshot()
 	# We don't care about node bounds, especially when comparing fields.
 	# Remove them.
 	for command in textWithFields:
 		if not isinstance(command,textInfos.FieldCommand):
 			continue
 		field=command.field
-		if not field:
+		if not field or ("_startOfNode" not in field and "_endOfNode" not in field):
 			continue
-		try:
-			del field["_startOfNode"]
-		except KeyError:
-			pass
-		try:
-			del field["_endOfNode"]
-		except KeyError:
-			pass
+		if isinstance(field,textInfos.FrozenField):
+			field=field.copy()
+			field.pop("_startOfNode",None)
+			field.pop("_endOfNode",None)
+			command.field=textInfos.internField(field)
+		else:
+			field.pop("_startOfNode",None)
+			field.pop("_endOfNode",None)
 
 	#Make a new controlFieldStack and formatField from the textInfo's initialFields
 	newControlFieldStack=[]
@@ -1026,6 +1093,8 @@ def speakTextInfo(info,useCache=True,formatConfig=None,unit=None,reason=controlT
 		if not isinstance(useCache,SpeakTextInfoState):
 			speakTextInfoState.updateObj()
 
+	if returnSpeech:
+		return speechSequence
 	if not onlyCache and speechSequence:
 		if reason==controlTypes.REASON_SAYALL:
 			speakWithoutPauses(speechSequence)
@@ -1153,13 +1222,85 @@ def getSpeechTextForProperties(reason=controlTypes.REASON_QUERY,**propertyValues
 				textList.append(_('level %s')%propertyValues['positionInfo_level'])
 	return CHUNK_SEPARATOR.join([x for x in textList if x])
 
+#: Caches the speech for format and control fields.
+#: The same fields are often spoken over and over; e.g. the style of every line in a document.
+#: The cache is cleared whenever the configuration changes.
+_fieldSpeechCache=lruCache.LRUCache(maxSize=500)
+#: The configuration generation for which L{_fieldSpeechCache} is valid.
+_fieldSpeechCacheGeneration=None
+
+def _getFieldSpeechCache():
+	global _fieldSpeechCacheGeneration
+	generation=config.conf.generation
+	if generation!=_fieldSpeechCacheGeneration:
+		_fieldSpeechCache.clear()
+		_fieldSpeechCacheGeneration=generation
+	return _fieldSpeechCache
+
+def getFieldSpeechCacheStatistics():
+	"""Gets statistics about the cache of speech for format and control fields for diagnostics.
+	@rtype: dict
+	"""
+	return _fieldSpeechCache.getStatistics()
+
+def _freezeFieldValue(value):
+	if isinstance(value,dict):
+		return (dict,frozenset((key,_freezeFieldValue(val)) for key,val in value.iteritems()))
+	if isinstance(value,(set,frozenset)):
+		return frozenset(value)
+	if isinstance(value,list):
+		return tuple(_freezeFieldValue(val) for val in value)
+	return value
+
+def _freezeField(attrs):
+	"""Gets a hashable representation of a field or other dict.
+	@raise TypeError: If a value can't be hashed.
+	"""
+	if isinstance(attrs,textInfos.FrozenField):
+		return attrs
+	try:
+		# Most fields only contain hashable values.
+		return frozenset(attrs.iteritems())
+	except TypeError:
+		return _freezeFieldValue(attrs)
+
+def _getFieldSpeechCacheKey(attrs,formatConfig,*args):
+	"""Gets a key for L{_fieldSpeechCache} from a field and everything else its speech depends on.
+	@return: The key, or C{None} if the speech can't be cached because some value isn't hashable.
+	"""
+	try:
+		if isinstance(formatConfig,config.SectionSnapshot):
+			formatConfigKey=(formatConfig.path,formatConfig.generation)
+		else:
+			formatConfigKey=_freezeField(formatConfig)
+		key=(_freezeField(attrs),formatConfigKey)+args
+		hash(key)
+	except TypeError:
+		return None
+	return key
+
 def getControlFieldSpeech(attrs,ancestorAttrs,fieldType,formatConfig=None,extraDetail=False,reason=None):
 	if attrs.get('isHidden'):
 		return u""
 	if not formatConfig:
-		formatConfig=config.conf["documentFormatting"]
+		formatConfig=config.conf["documentFormatting"].snapshot()
 
 	presCat=attrs.getPresentationCategory(ancestorAttrs,formatConfig, reason=reason)
+	if presCat!=attrs.PRESCAT_LAYOUT and attrs.get("table-id"):
+		# Speech for tables depends on the previously spoken table cell, so it can't be cached.
+		return _getControlFieldSpeech(attrs,presCat,fieldType,formatConfig,extraDetail,reason)
+	cache=_getFieldSpeechCache()
+	key=_getFieldSpeechCacheKey(attrs,formatConfig,"control",type(attrs),presCat,fieldType,extraDetail,reason)
+	if key is not None:
+		text=cache.get(key)
+		if text is not None:
+			return text
+	text=_getControlFieldSpeech(attrs,presCat,fieldType,formatConfig,extraDetail,reason)
+	if key is not None:
+		cache[key]=text
+	return text
+
+def _getControlFieldSpeech(attrs,presCat,fieldType,formatConfig,extraDetail,reason):
 	childControlCount=int(attrs.get('_childcontrolcount',"0"))
 	if reason==controlTypes.REASON_FOCUS or attrs.get('alwaysReportName',False):
 		name=attrs.get('name',"")
@@ -1289,7 +1430,33 @@ def getControlFieldSpeech(attrs,ancestorAttrs,fieldType,formatConfig=None,extraD
 
 def getFormatFieldSpeech(attrs,attrsCache=None,formatConfig=None,reason=None,unit=None,extraDetail=False , initialFormat=False, separator=CHUNK_SEPARATOR):
 	if not formatConfig:
-		formatConfig=config.conf["documentFormatting"]
+		formatConfig=config.conf["documentFormatting"].snapshot()
+	cache=_getFieldSpeechCache()
+	# The speech depends on the previous format field in attrsCache.
+	# Usually, either there is none or the formatting hasn't changed.
+	if not attrsCache:
+		oldAttrsKey=None
+	elif attrsCache==attrs:
+		oldAttrsKey=True
+	else:
+		try:
+			oldAttrsKey=_freezeField(attrsCache)
+		except TypeError:
+			return _getFormatFieldSpeech(attrs,attrsCache,formatConfig,reason,unit,extraDetail,initialFormat,separator)
+	key=_getFieldSpeechCacheKey(attrs,formatConfig,"format",oldAttrsKey,reason,unit,extraDetail,initialFormat,separator)
+	if key is not None:
+		text=cache.get(key)
+		if text is not None:
+			if attrsCache is not None:
+				attrsCache.clear()
+				attrsCache.update(attrs)
+			return text
+	text=_getFormatFieldSpeech(attrs,attrsCache,formatConfig,reason,unit,extraDetail,initialFormat,separator)
+	if key is not None:
+		cache[key]=text
+	return text
+
+def _getFormatFieldSpeech(attrs,attrsCache,formatConfig,reason,unit,extraDetail,initialFormat,separator):
 	textList=[]
 	if formatConfig["reportTables"]:
 		tableInfo=attrs.get("table-info")
@@ -1752,45 +1919,12 @@ def speakWithoutPauses(speechSequence,detectBreaks=True):
 		if lastStartIndex<sequenceLen:
 			speakWithoutPauses(speechSequence[lastStartIndex:],detectBreaks=False)
 		return
-	finalSpeechSequence=[] #To be spoken now
-	pendingSpeechSequence=[] #To be saved off for speaking  later
 	if speechSequence is None: #Requesting flush
-		if speakWithoutPauses._pendingSpeechSequence: 
-			#Place the last incomplete phrase in to finalSpeechSequence to be spoken now
-			finalSpeechSequence=speakWithoutPauses._pendingSpeechSequence
-			speakWithoutPauses._pendingSpeechSequence=[]
+		#Speak the last incomplete phrase now
+		finalSpeechSequence=_phraseAccumulator.flush()
 	else: #Handling normal speech
-		#Scan the given speech and place all completed phrases in finalSpeechSequence to be spoken,
-		#And place the final incomplete phrase in pendingSpeechSequence
-		for index in xrange(len(speechSequence)-1,-1,-1): 
-			item=speechSequence[index]
-			if isinstance(item,basestring):
-				m=re_last_pause.match(item)
-				if m:
-					before,after=m.groups()
-					if after:
-						pendingSpeechSequence.append(after)
-					if before:
-						finalSpeechSequence.extend(speakWithoutPauses._pendingSpeechSequence)
-						speakWithoutPauses._pendingSpeechSequence=[]
-						finalSpeechSequence.extend(speechSequence[0:index])
-						finalSpeechSequence.append(before)
-						# Apply the last language change to the pending sequence.
-						# This will need to be done for any other speech change commands introduced in future.
-						for changeIndex in xrange(index-1,-1,-1):
-							change=speechSequence[changeIndex]
-							if not isinstance(change,LangChangeCommand):
-								continue
-							pendingSpeechSequence.append(change)
-							break
-						break
-				else:
-					pendingSpeechSequence.append(item)
-			else:
-				pendingSpeechSequence.append(item)
-		if pendingSpeechSequence:
-			pendingSpeechSequence.reverse()
-			speakWithoutPauses._pendingSpeechSequence.extend(pendingSpeechSequence)
+		#Speak all completed phrases and save the final incomplete phrase for later
+		finalSpeechSequence=_phraseAccumulator.add(speechSequence)
 	#Scan the final speech sequence backwards
 	for item in reversed(finalSpeechSequence):
 		if isinstance(item,IndexCommand):
@@ -1799,16 +1933,133 @@ def speakWithoutPauses(speechSequence,detectBreaks=True):
 	if finalSpeechSequence:
 		speak(finalSpeechSequence)
 speakWithoutPauses.lastSentIndex=None
-speakWithoutPauses._pendingSpeechSequence=[]
+
+class _PhraseAccumulator(object):
+	"""Accumulates the speech given to L{speakWithoutPauses}.
+	Speech up to the last phrase or sentence boundary is taken to be spoken,
+	while the final incomplete phrase is kept pending until more speech completes it or it is flushed.
+	"""
+
+	def __init__(self):
+		#: The final incomplete phrase.
+		#: @type: collections.deque
+		self.pending=collections.deque()
+
+	def clear(self):
+		self.pending.clear()
+
+	def flush(self):
+		"""Takes all pending speech.
+		@rtype: list
+		"""
+		speechSequence=list(self.pending)
+		self.pending.clear()
+		return speechSequence
+
+	def add(self,speechSequence):
+		"""Adds speech, taking the completed phrases.
+		Only the new speech is scanned, backwards from its end to its last phrase boundary.
+		@return: The pending speech and the new speech up to its last phrase boundary,
+			or an empty list if the new speech contains no boundary.
+		@rtype: list
+		"""
+		newPending=collections.deque()
+		for index in xrange(len(speechSequence)-1,-1,-1):
+			item=speechSequence[index]
+			# Only run the regular expression for text which might contain the end of a sentence.
+			if isinstance(item,basestring) and ("." in item or "!" in item or "?" in item):
+				m=re_last_pause.match(item)
+				if m:
+					before,after=m.groups()
+					if after:
+						newPending.appendleft(after)
+					# Apply the last language change to the pending sequence.
+					# This will need to be done for any other speech change commands introduced in future.
+					for changeIndex in xrange(index-1,-1,-1):
+						change=speechSequence[changeIndex]
+						if isinstance(change,LangChangeCommand):
+							newPending.appendleft(change)
+							break
+					finalSpeechSequence=list(self.pending)
+					finalSpeechSequence.extend(itertools.islice(speechSequence,index))
+					finalSpeechSequence.append(before)
+					self.pending=newPending
+					return finalSpeechSequence
+			newPending.appendleft(item)
+		self.pending.extend(newPending)
+		return []
+
+_phraseAccumulator=_PhraseAccumulator()
+
+class SpeechReadAhead(object):
+	"""Prepares speech which would be spoken with L{speakWithoutPauses} ahead of time.
+	Speech is added with L{add} as it would be passed to L{speakWithoutPauses}.
+	Completed phrases are prepared with L{prepareSpeech} straight away
+	and wait in this object until they are spoken with L{speakNext}.
+	"""
+
+	def __init__(self):
+		self._accumulator=_PhraseAccumulator()
+		#: Tuples of (speech sequence, prepared sequence, last index) waiting to be spoken.
+		#: @type: collections.deque
+		self._ready=collections.deque()
+		#: The last index command prepared, or C{None} if none has been.
+		#: @type: int
+		self.lastPreparedIndex=None
+
+	def __len__(self):
+		"""The number of prepared sequences waiting to be spoken."""
+		return len(self._ready)
+
+	def _prepare(self,speechSequence):
+		if not speechSequence:
+			return
+		lastIndex=None
+		for item in reversed(speechSequence):
+			if isinstance(item,IndexCommand):
+				lastIndex=self.lastPreparedIndex=item.index
+				break
+		self._ready.append((speechSequence,prepareSpeech(speechSequence),lastIndex))
+
+	def add(self,speechSequence):
+		"""Adds speech, preparing any phrases it completes.
+		As with L{speakWithoutPauses}, L{SpeakWithoutPausesBreakCommand}s end the current phrase.
+		"""
+		lastStartIndex=0
+		for index,item in enumerate(speechSequence):
+			if isinstance(item,SpeakWithoutPausesBreakCommand):
+				self._prepare(self._accumulator.add(speechSequence[lastStartIndex:index]))
+				self._prepare(self._accumulator.flush())
+				lastStartIndex=index+1
+		self._prepare(self._accumulator.add(speechSequence[lastStartIndex:] if lastStartIndex else speechSequence))
+
+	def flush(self):
+		"""Prepares the final incomplete phrase."""
+		self._prepare(self._accumulator.flush())
+
+	def speakNext(self):
+		"""Speaks the next prepared sequence.
+		@return: The last index in the sequence, or C{None} if it has none.
+		@rtype: int
+		"""
+		speechSequence,preparedSequence,lastIndex=self._ready.popleft()
+		speakPreparedSpeech(speechSequence,preparedSequence)
+		if lastIndex is not None:
+			speakWithoutPauses.lastSentIndex=lastIndex
+		return lastIndex
 
 
 class SpeechCommand(object):
 	"""
 	The base class for objects that can be inserted between string of text for parituclar speech functions that convey  things such as indexing or voice parameter changes.
+	Commands are created for almost every piece of speech,
+	so subclasses should define C{__slots__} to keep them small and quick to create.
 	"""
+	__slots__=()
 
 class IndexCommand(SpeechCommand):
 	"""Represents an index within some speech."""
+	__slots__=("index",)
 
 	def __init__(self,index):
 		"""
@@ -1822,7 +2073,23 @@ class IndexCommand(SpeechCommand):
 		return "IndexCommand(%r)" % self.index
 
 class CharacterModeCommand(SpeechCommand):
-	"""Turns character mode on and off for speech synths."""
+	"""Turns character mode on and off for speech synths.
+	There are only two possible commands, so they are shared.
+	"""
+	__slots__=("state",)
+	_instances={}
+
+	def __new__(cls,state):
+		if cls is not CharacterModeCommand:
+			return super(CharacterModeCommand,cls).__new__(cls)
+		try:
+			return cls._instances[state]
+		except KeyError:
+			pass
+		instance=super(CharacterModeCommand,cls).__new__(cls)
+		if isinstance(state,bool):
+			cls._instances[state]=instance
+		return instance
 
 	def __init__(self,state):
 		"""
@@ -1836,7 +2103,26 @@ class CharacterModeCommand(SpeechCommand):
 		return "CharacterModeCommand(%r)" % self.state
 
 class LangChangeCommand(SpeechCommand):
-	"""A command to switch the language within speech."""
+	"""A command to switch the language within speech.
+	Commands for the same language are shared, as they are created for almost every piece of speech.
+	"""
+	__slots__=("lang",)
+	#: Maps languages to shared commands.
+	_instances={}
+	#: The maximum number of languages for which commands are shared.
+	_MAX_INSTANCES=100
+
+	def __new__(cls,lang):
+		if cls is not LangChangeCommand:
+			return super(LangChangeCommand,cls).__new__(cls)
+		try:
+			return cls._instances[lang]
+		except KeyError:
+			pass
+		instance=super(LangChangeCommand,cls).__new__(cls)
+		if len(cls._instances)<cls._MAX_INSTANCES:
+			cls._instances[lang]=instance
+		return instance
 
 	def __init__(self,lang):
 		"""
@@ -1853,10 +2139,12 @@ class SpeakWithoutPausesBreakCommand(SpeechCommand):
 	This should only be used with the L{speakWithoutPauses} function.
 	This will be removed during processing.
 	"""
+	__slots__=()
 
 class BreakCommand(SpeechCommand):
 	"""Insert a break between words.
 	"""
+	__slots__=("time",)
 
 	def __init__(self, time=0):
 		"""
@@ -1871,6 +2159,7 @@ class BreakCommand(SpeechCommand):
 class PitchCommand(SpeechCommand):
 	"""Change the pitch of the voice.
 	"""
+	__slots__=("multiplier",)
 
 	def __init__(self, multiplier=1):
 		"""
@@ -1886,6 +2175,7 @@ class PitchCommand(SpeechCommand):
 class VolumeCommand(SpeechCommand):
 	"""Change the volume of the voice.
 	"""
+	__slots__=("multiplier",)
 
 	def __init__(self, multiplier=1):
 		"""
@@ -1901,6 +2191,7 @@ class VolumeCommand(SpeechCommand):
 class RateCommand(SpeechCommand):
 	"""Change the rate of the voice.
 	"""
+	__slots__=("multiplier",)
 
 	def __init__(self, multiplier=1):
 		"""
@@ -1918,6 +2209,7 @@ class PhonemeCommand(SpeechCommand):
 	This command accepts Unicode International Phonetic Alphabet (IPA) characters.
 	Note that this is not well supported by synthesizers.
 	"""
+	__slots__=("ipa","text")
 
 	def __init__(self, ipa, text=None):
 		"""
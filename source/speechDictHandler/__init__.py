@@ -5,6 +5,10 @@
 #See the file COPYING for more details.
 
 import re
+import sre_parse
+import sre_constants
+import bisect
+import collections
 import globalVars
 from logHandler import log
 import os
@@ -45,8 +49,209 @@ class SpeechDictEntry:
 		replacement=self.replacement
 		return self.compiled.sub(replacement, text)
 
+class _LiteralTrie(object):
+	"""An Aho-Corasick automaton which finds all of a set of literal strings occurring in a text in a single pass.
+	Each added string is associated with a value; L{findValues} returns the values of all strings found, including overlapping ones.
+	"""
+
+	def __init__(self):
+		# Node 0 is the root.
+		self._goto=[{}]
+		self._fail=[0]
+		self._output=[()]
+
+	def __nonzero__(self):
+		return len(self._goto)>1
+
+	def add(self, string, value):
+		node=0
+		for char in string:
+			nextNode=self._goto[node].get(char)
+			if nextNode is None:
+				nextNode=len(self._goto)
+				self._goto[node][char]=nextNode
+				self._goto.append({})
+				self._fail.append(0)
+				self._output.append(())
+			node=nextNode
+		self._output[node]+=(value,)
+
+	def finalize(self):
+		"""Calculates the failure links of the automaton.
+		This must be called after the last string has been added and before L{findValues} is used.
+		"""
+		goto=self._goto
+		fail=self._fail
+		output=self._output
+		queue=collections.deque(goto[0].itervalues())
+		while queue:
+			node=queue.popleft()
+			for char,child in goto[node].iteritems():
+				queue.append(child)
+				state=fail[node]
+				while state and char not in goto[state]:
+					state=fail[state]
+				fallback=goto[state].get(char,0)
+				fail[child]=fallback if fallback!=child else 0
+				output[child]+=output[fail[child]]
+
+	def findValues(self, text):
+		"""Returns the set of values of all strings which occur in the given text."""
+		goto=self._goto
+		fail=self._fail
+		output=self._output
+		found=set()
+		node=0
+		for char in text:
+			while node and char not in goto[node]:
+				node=fail[node]
+			node=goto[node].get(char,0)
+			if output[node]:
+				found.update(output[node])
+		return found
+
+def _getEntryFlags(entry):
+	"""Gets the flags an entry's pattern is compiled with, excluding any set inline by the pattern itself."""
+	flags = re.U
+	if not entry.caseSensitive: flags|=re.IGNORECASE
+	return flags
+
+def _isCombinable(entry):
+	"""Whether the pattern of a regular expression entry keeps its meaning when it is placed in an alternation with other patterns.
+	Patterns which refer to their own groups by number or name, or which set global flags inline, do not.
+	"""
+	flags=_getEntryFlags(entry)
+	try:
+		parsed=sre_parse.parse(entry.pattern,flags)
+	except (sre_constants.error, OverflowError):
+		return False
+	if parsed.pattern.flags!=flags:
+		return False
+	stack=[parsed]
+	while stack:
+		for op,av in stack.pop():
+			if op in (sre_constants.GROUPREF,sre_constants.GROUPREF_EXISTS):
+				return False
+			if isinstance(av,sre_parse.SubPattern):
+				stack.append(av)
+			elif isinstance(av,(tuple,list)):
+				for item in av:
+					if isinstance(item,sre_parse.SubPattern):
+						stack.append(item)
+					elif isinstance(item,(tuple,list)):
+						stack.extend(i for i in item if isinstance(i,sre_parse.SubPattern))
+	return True
+
+class CompiledSpeechDict(object):
+	"""A compiled form of a list of speech dictionary entries, which avoids running every entry over the text.
+	Plain (anywhere and whole word) entries are found with a single pass of a L{_LiteralTrie} over the text,
+	so that only those entries whose pattern actually occurs are run.
+	Consecutive regular expression entries are merged into as few combined expressions as their semantics allow;
+	a batch is skipped entirely when its combined expression does not match.
+	Entries which could match are still run one after another in dictionary order,
+	and the text is rescanned whenever it is changed by an entry,
+	so the output is always identical to running every entry in sequence.
+	"""
+
+	#: The maximum number of groups in a combined expression; Python's re module supports at most 100.
+	MAX_COMBINED_GROUPS = 99
+
+	def __init__(self, entries):
+		#: The entries this dictionary was compiled from, in order.
+		self.entries = list(entries)
+		self._caseTrie = _LiteralTrie()
+		self._noCaseTrie = _LiteralTrie()
+		#: Maps the index of the first entry of each batch of entries which must always be considered
+		#: to the index after its last entry and the combined expression deciding whether the batch can match (or C{None}).
+		self._batches = {}
+		batch = []
+		batchGroups = 0
+		for index, entry in enumerate(self.entries):
+			if entry.type != ENTRY_TYPE_REGEXP and entry.pattern:
+				self._addBatch(batch)
+				batch = []
+				if entry.caseSensitive:
+					self._caseTrie.add(entry.pattern, index)
+				else:
+					self._noCaseTrie.add(entry.pattern.lower(), index)
+				continue
+			if entry.type != ENTRY_TYPE_REGEXP or not _isCombinable(entry):
+				# An empty plain pattern matches everywhere, and an uncombinable pattern must be run alone.
+				self._addBatch(batch)
+				batch = []
+				self._batches[index] = (index + 1, None)
+				continue
+			groups = entry.compiled.groups
+			if batch and (
+				entry.caseSensitive != batch[0][1].caseSensitive
+				or batchGroups + groups > self.MAX_COMBINED_GROUPS
+			):
+				self._addBatch(batch)
+				batch = []
+			if not batch:
+				batchGroups = 0
+			batch.append((index, entry))
+			batchGroups += groups
+		self._addBatch(batch)
+		self._caseTrie.finalize()
+		self._noCaseTrie.finalize()
+		self._batchStarts = sorted(self._batches)
+
+	def _addBatch(self, batch):
+		if not batch:
+			return
+		firstIndex, firstEntry = batch[0]
+		endIndex = batch[-1][0] + 1
+		try:
+			searchRegexp = re.compile(
+				"|".join("(?:%s)" % entry.pattern for index, entry in batch),
+				_getEntryFlags(firstEntry)
+			)
+		except (re.error, OverflowError, AssertionError):
+			# For example, several patterns define the same group name.
+			for index, entry in batch:
+				self._batches[index] = (index + 1, None)
+			return
+		self._batches[firstIndex] = (endIndex, searchRegexp)
+
+	def _getCandidates(self, text, start):
+		"""Gets the indexes from start onwards of entries or batches which might match the text.
+		@return: The indexes in descending order, so that the next one can be popped from the end.
+		@rtype: list of int
+		"""
+		found = set()
+		if self._caseTrie:
+			found |= self._caseTrie.findValues(text)
+		if self._noCaseTrie:
+			found |= self._noCaseTrie.findValues(text.lower())
+		candidates = [index for index in found if index >= start]
+		candidates.extend(self._batchStarts[bisect.bisect_left(self._batchStarts, start):])
+		candidates.sort(reverse=True)
+		return candidates
+
+	def sub(self, text):
+		entries = self.entries
+		candidates = self._getCandidates(text, 0)
+		while candidates:
+			index = candidates.pop()
+			endIndex, searchRegexp = self._batches.get(index, (index + 1, None))
+			if searchRegexp and not searchRegexp.search(text):
+				continue
+			newText = text
+			for entryIndex in xrange(index, endIndex):
+				newText = entries[entryIndex].sub(newText)
+			if newText != text:
+				text = newText
+				# Later entries might now match differently.
+				candidates = self._getCandidates(text, endIndex)
+		return text
+
 class SpeechDict(list):
 
+	#: The compiled form of the entries, built lazily by L{sub}.
+	#: @type: L{CompiledSpeechDict}
+	_compiled = None
+
 	def load(self, fileName):
 		self.fileName=fileName
 		comment=""
@@ -98,9 +303,11 @@ class SpeechDict(list):
 		file.close()
 
 	def sub(self, text):
-		for entry in self:
-			text = entry.sub(text)
-		return text
+		compiled = self._compiled
+		# Compare the entries (by identity first) so that the dictionary is only recompiled after it is loaded or edited.
+		if compiled is None or compiled.entries != self:
+			compiled = self._compiled = CompiledSpeechDict(self)
+		return compiled.sub(text)
 
 def processText(text):
 	if not globalVars.speechDictionaryProcessing:
@@ -16,6 +16,7 @@ from logHandler import log
 from  synthSettingsRing import SynthSettingsRing
 import languageHandler
 import speechDictHandler
+import characterProcessing
 import synthDrivers
 
 _curSynth=None
@@ -113,6 +114,7 @@ def setSynth(name,isFallback=False):
 		if not isFallback:
 			config.conf["speech"]["synth"]=name
 		log.info("Loaded synthDriver %s"%name)
+		_warmUpSymbolTables(_curSynth)
 		return True
 	except:
 		log.error("setSynth", exc_info=True)
@@ -131,6 +133,22 @@ def setSynth(name,isFallback=False):
 				setSynth(newName,isFallback=True)
 		return False
 
+def _warmUpSymbolTables(synth):
+	"""Prepares speech symbol data for the languages of the voices of a synthesizer,
+	so that switching to one of these voices or languages is quick.
+	"""
+	if not synth.isSupported("voice"):
+		return
+	try:
+		languages = set(languageHandler.normalizeLanguage(voice.language)
+			for voice in synth.availableVoices.itervalues() if voice.language)
+	except:
+		log.debugWarning("Couldn't get languages of voices", exc_info=True)
+		return
+	languages.discard(None)
+	if languages:
+		characterProcessing.warmUpSymbolTables(sorted(languages))
+
 def handlePostConfigProfileSwitch():
 	conf = config.conf["speech"]
 	if conf["synth"] != _curSynth.name or conf["outputDevice"] != _audioOutputDevice:
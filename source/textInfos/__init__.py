@@ -125,6 +125,93 @@ class ControlField(Field):
 
 		return self.PRESCAT_LAYOUT
 
+class FrozenField(object):
+	"""A mix-in for fields which can't be changed and which are shared between all equal fields.
+	Frozen fields are hashable,
+	and comparing two equal frozen fields is just an identity check.
+	Frozen fields should only be obtained using L{internField}.
+	"""
+
+	def __init__(self, items, contentHash):
+		super(FrozenField, self).__init__(items)
+		self._hash = contentHash
+
+	def __hash__(self):
+		return self._hash
+
+	def __eq__(self, other):
+		if self is other:
+			return True
+		if isinstance(other, FrozenField) and self._hash != other._hash:
+			return False
+		return dict.__eq__(self, other)
+
+	def __ne__(self, other):
+		equal = self.__eq__(other)
+		if equal is NotImplemented:
+			return equal
+		return not equal
+
+	def _immutable(self, *args, **kwargs):
+		raise TypeError("Frozen fields can't be changed")
+
+	__setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _immutable
+
+	def copy(self):
+		"""Return a mutable copy of this field."""
+		return self._mutableType(self)
+
+class FrozenFormatField(FrozenField, FormatField):
+	"""A L{FormatField} which can't be changed. See L{FrozenField}."""
+	_mutableType = FormatField
+
+class FrozenControlField(FrozenField, ControlField):
+	"""A L{ControlField} which can't be changed. See L{FrozenField}."""
+	_mutableType = ControlField
+
+_frozenFieldTypes = {
+	FormatField: FrozenFormatField,
+	ControlField: FrozenControlField,
+}
+#: Maps the content of frozen fields to the shared fields.
+#: Fields are discarded once nothing else refers to them.
+_internedFields = weakref.WeakValueDictionary()
+
+def internField(field):
+	"""Gets a frozen field equal to the given field which is shared with all other equal fields.
+	When the same fields are retrieved repeatedly, e.g. for successive lines of a document,
+	this saves memory and makes comparing them much quicker.
+	Sets and lists in the field are converted to frozensets and tuples.
+	Fields which are instances of other classes or contain values which can't be hashed are returned unchanged.
+	@param field: The field to intern.
+	@type field: L{Field}
+	@return: The shared frozen field, or C{field} itself if it can't be frozen.
+	@rtype: L{Field}
+	"""
+	frozenType = _frozenFieldTypes.get(type(field))
+	if not frozenType:
+		return field
+	try:
+		# Most fields only contain hashable values.
+		frozenItems = frozenset(field.iteritems())
+	except TypeError:
+		items = []
+		for key, value in field.iteritems():
+			if isinstance(value, set):
+				value = frozenset(value)
+			elif isinstance(value, list):
+				value = tuple(value)
+			items.append((key, value))
+		try:
+			frozenItems = frozenset(items)
+		except TypeError:
+			return field
+	content = (frozenType, frozenItems)
+	frozen = _internedFields.get(content)
+	if frozen is None:
+		frozen = _internedFields[content] = frozenType(frozenItems, hash(frozenItems))
+	return frozen
+
 class FieldCommand(object):
 	"""A command indicating a L{Field} in a sequence of text and fields.
 	When retrieving text with its associated fields, a L{TextInfo} provides a sequence of text strings and L{FieldCommand}s.
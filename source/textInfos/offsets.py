@@ -8,12 +8,15 @@ from abc import abstractmethod
 import re
 import ctypes
 import unicodedata
+import bisect
 import NVDAHelper
 import config
 import textInfos
 from locationHelper import RectLTWH
 from treeInterceptorHandler import TreeInterceptor
 import api
+import lruCache
+import six
 from six.moves import range
 
 HIGH_SURROGATE_FIRST = u"\uD800"
@@ -96,6 +99,101 @@ def findEndOfLine(text,offset,lineLength=None):
 		end=len(text)-1
 	return end+1
 
+class LineStartIndex(object):
+	"""The offsets at which each line in a text starts, so that line offsets and numbers can be found with a binary search rather than by searching the text.
+	Lines are delimited as by L{findStartOfLine} and L{findEndOfLine}.
+	"""
+
+	_lineBreakRegexp=re.compile(r"\r\n?|\n")
+
+	def __init__(self,text):
+		"""
+		@param text: The text to index.
+		@type text: unicode
+		"""
+		self.text=text
+		textLength=len(text)
+		#: The start offset of each line, in ascending order.
+		#: @type: list of int
+		self.lineStarts=[0]
+		self.lineStarts.extend(m.end() for m in self._lineBreakRegexp.finditer(text) if m.end()<textLength)
+		# findStartOfLine and findEndOfLine only treat a carriage return as a line break if there is no line feed to be found,
+		# so offsets can only be looked up in the index if every carriage return is part of a CRLF pair.
+		#: Whether line offsets found in this index are exactly those found by L{findStartOfLine} and L{findEndOfLine}.
+		#: If C{False}, the text contains lone carriage returns, so line offsets are found by searching the text
+		#: and line numbers are only approximate.
+		#: @type: bool
+		self.isExact="\r" not in text or text.count("\r")==text.count("\r\n")
+		# Maps the start and end offsets of lines to their word boundaries.
+		self._wordBoundaries={}
+
+	@property
+	def lineCount(self):
+		return len(self.lineStarts)
+
+	def _clampOffset(self,offset):
+		return max(min(offset,len(self.text)-1),0)
+
+	def getLineNumFromOffset(self,offset):
+		"""Gets the 0 based number of the line containing an offset.
+		@rtype: int
+		"""
+		return bisect.bisect_right(self.lineStarts,self._clampOffset(offset))-1
+
+	def getLineOffsets(self,offset):
+		"""Gets the start and end offsets of the line containing an offset.
+		@rtype: list of int
+		"""
+		text=self.text
+		if not self.isExact:
+			return [findStartOfLine(text,offset),findEndOfLine(text,offset)]
+		if not text:
+			return [0,0]
+		return self.getLineOffsetsFromLineNum(self.getLineNumFromOffset(offset))
+
+	def getLineOffsetsFromLineNum(self,lineNum):
+		"""Gets the start and end offsets of a line given its 0 based number.
+		@rtype: list of int
+		"""
+		lineStarts=self.lineStarts
+		end=lineStarts[lineNum+1] if lineNum+1<len(lineStarts) else len(self.text)
+		return [lineStarts[lineNum],end]
+
+	def getWordBoundaries(self,lineStart,lineEnd):
+		"""Gets the L{WordBoundaries} of a line, which are only calculated the first time they are needed.
+		@param lineStart: The start offset of the line.
+		@type lineStart: int
+		@param lineEnd: The end offset of the line.
+		@type lineEnd: int
+		@rtype: L{WordBoundaries}
+		"""
+		key=(lineStart,lineEnd)
+		boundaries=self._wordBoundaries.get(key)
+		if boundaries is None:
+			#Convert NULL and non-breaking space to space to make sure that words will break on them
+			lineText=self.text[lineStart:lineEnd].translate({0:u' ',0xa0:u' '})
+			boundaries=self._wordBoundaries[key]=WordBoundaries(lineText)
+		return boundaries
+
+#: The most recently built L{LineStartIndex}, reused while the story text it was built from is returned again.
+_lastLineStartIndex=None
+
+def getLineStartIndex(text):
+	"""Gets a L{LineStartIndex} for the given text.
+	The last index built is reused if it was built from this very text object.
+	The text is not compared by value, as that would mean searching the whole text for every lookup.
+	Story texts are usually cached by the objects providing them, such as L{NVDAObjects.NVDAObject.basicText},
+	so the same object is returned until the text changes.
+	@type text: unicode
+	@rtype: L{LineStartIndex}
+	"""
+	global _lastLineStartIndex
+	text=text or u""
+	index=_lastLineStartIndex
+	if index is None or index.text is not text:
+		index=_lastLineStartIndex=LineStartIndex(text)
+	return index
+
 def findStartOfWord(text,offset,lineLength=None):
 	"""Searches backwards through the given text from the given offset, until it finds the offset that is the start of the word. It checks to see if a character is alphanumeric, or is another symbol , or is white space.
 @param text: the text to search
@@ -140,6 +238,113 @@ def findEndOfWord(text,offset,lineLength=None):
 		offset+=1
 	return offset
 
+#: The class of a character for finding word boundaries, as used in L{WordBoundaries.classes}.
+CHARCLASS_WORD=u"w" #: A letter, mark or number (Unicode categories L, M and N).
+CHARCLASS_SEPARATOR=u"z" #: A space separator (Unicode category Z).
+CHARCLASS_SPACE=u"s" #: Other white space, such as tab.
+CHARCLASS_OTHER=u"o" #: Any other character, such as punctuation.
+
+class _CharacterClassTable(dict):
+	"""A translation table from characters to their L{CHARCLASS_*<CHARCLASS_WORD>} constant.
+	The class of a character is only calculated the first time it is translated.
+	"""
+
+	def __missing__(self,char):
+		c=six.unichr(char)
+		category=unicodedata.category(c)[0]
+		if category in "LMN":
+			charClass=CHARCLASS_WORD
+		elif category=="Z":
+			charClass=CHARCLASS_SEPARATOR
+		elif c.isspace():
+			charClass=CHARCLASS_SPACE
+		else:
+			charClass=CHARCLASS_OTHER
+		self[char]=charClass
+		return charClass
+
+_characterClassTable=_CharacterClassTable()
+
+class WordBoundaries(object):
+	"""The word boundaries of a text, calculated for all offsets at once.
+	Offsets are the same as those found by L{findStartOfWord} and L{findEndOfWord},
+	but the class of each character is only calculated once rather than every time the text is searched.
+	"""
+
+	_runRegexp=re.compile(u"%s+|[%s%s]+"%(CHARCLASS_WORD,CHARCLASS_SEPARATOR,CHARCLASS_SPACE))
+
+	def __init__(self,text):
+		"""
+		@param text: The text, usually a single line.
+		@type text: unicode
+		"""
+		self.text=text
+		#: The L{CHARCLASS_*<CHARCLASS_WORD>} constant for each character in the text.
+		#: @type: unicode
+		self.classes=text.translate(_characterClassTable) if text else u""
+		textLength=len(text)
+		# The start and end of the run of word characters or white space containing each offset.
+		self._runStarts=runStarts=list(range(textLength))
+		self._runEnds=runEnds=list(range(1,textLength+1))
+		for m in self._runRegexp.finditer(self.classes):
+			start,end=m.span()
+			runStarts[start:end]=[start]*(end-start)
+			runEnds[start:end]=[end]*(end-start)
+
+	def getStartOfWord(self,offset):
+		"""Gets the start of the word at an offset, as L{findStartOfWord} would."""
+		classes=self.classes
+		if offset>=len(classes):
+			return offset
+		if classes[offset] in (CHARCLASS_SEPARATOR,CHARCLASS_SPACE):
+			# Move back to the character before this white space.
+			offset=max(self._runStarts[offset]-1,0)
+		if classes[offset]!=CHARCLASS_WORD:
+			return offset
+		return self._runStarts[offset]
+
+	def getEndOfWord(self,offset):
+		"""Gets the end of the word at an offset including any trailing white space, as L{findEndOfWord} would."""
+		classes=self.classes
+		if offset>=len(classes):
+			return offset+1
+		charClass=classes[offset]
+		if charClass==CHARCLASS_WORD:
+			offset=self._runEnds[offset]
+		elif charClass!=CHARCLASS_SEPARATOR:
+			offset+=1
+		if offset<len(classes) and classes[offset] in (CHARCLASS_SEPARATOR,CHARCLASS_SPACE):
+			offset=self._runEnds[offset]
+		return offset
+
+	def getWordOffsets(self,offset):
+		"""Gets the start and end offsets of the word at an offset.
+		@rtype: list of int
+		"""
+		return [self.getStartOfWord(offset),self.getEndOfWord(offset)]
+
+#: Word boundaries of recently used lines, keyed by line text.
+#: This is used when lines aren't looked up in a L{LineStartIndex}, which keeps the word boundaries of its lines itself.
+_wordBoundariesCache=lruCache.LRUCache(maxSize=100)
+#: The most recently used L{WordBoundaries}, which is checked before looking in L{_wordBoundariesCache},
+#: as moving by word usually stays within the same line.
+_lastWordBoundaries=None
+
+def getWordBoundaries(text):
+	"""Gets the L{WordBoundaries} of a text, reusing those calculated previously for the same text.
+	@type text: unicode
+	@rtype: L{WordBoundaries}
+	"""
+	global _lastWordBoundaries
+	boundaries=_lastWordBoundaries
+	if boundaries is not None and boundaries.text==text:
+		return boundaries
+	boundaries=_wordBoundariesCache.get(text)
+	if boundaries is None:
+		boundaries=_wordBoundariesCache[text]=WordBoundaries(text)
+	_lastWordBoundaries=boundaries
+	return boundaries
+
 class OffsetsTextInfo(textInfos.TextInfo):
 	"""An abstract TextInfo for text implementations which represent ranges using numeric offsets relative to the start of the text.
 	In such implementations, the start of the text is represented by 0 and the end is the length of the entire text.
@@ -160,6 +365,10 @@ class OffsetsTextInfo(textInfos.TextInfo):
 
 	detectFormattingAfterCursorMaybeSlow=True #: honours documentFormatting config option if true - set to false if this is not at all slow.
 	useUniscribe=True #Use uniscribe to calculate word offsets etc
+	#: Whether the base implementation of L{_getLineOffsets} should look up lines in a L{LineStartIndex} of the story text, rather than searching the text for every line.
+	#: When used, the index also allows moving by several lines at once.
+	#: The index is rebuilt whenever L{_getStoryText} returns a different object, so this should be disabled if it never returns the same one.
+	useLineStartIndex=True
 
 	def __eq__(self,other):
 		if self is other or (isinstance(other,OffsetsTextInfo) and self._startOffset==other._startOffset and self._endOffset==other._endOffset):
@@ -325,6 +534,12 @@ class OffsetsTextInfo(textInfos.TextInfo):
 		return offset, offset + 1
 
 	def _getWordOffsets(self,offset):
+		lineStartIndex=None if self.useUniscribe else self._getLineStartIndex()
+		if lineStartIndex is not None:
+			# The index keeps the word boundaries of each line, so the text of the line needn't be extracted.
+			lineStart,lineEnd=lineStartIndex.getLineOffsets(offset)
+			start,end=lineStartIndex.getWordBoundaries(lineStart,lineEnd).getWordOffsets(offset-lineStart)
+			return [start+lineStart,end+lineStart]
 		lineStart,lineEnd=self._getLineOffsets(offset)
 		lineText=self._getTextRange(lineStart,lineEnd)
 		#Convert NULL and non-breaking space to space to make sure that words will break on them
@@ -338,16 +553,29 @@ class OffsetsTextInfo(textInfos.TextInfo):
 			if NVDAHelper.localLib.calculateWordOffsets(lineText,len(lineText),offset-lineStart,ctypes.byref(start),ctypes.byref(end)):
 				return start.value+lineStart,min(end.value+lineStart,lineEnd)
 		#Fall back to the older word offsets detection that only breaks on non alphanumeric
-		start=findStartOfWord(lineText,offset-lineStart)+lineStart
-		end=findEndOfWord(lineText,offset-lineStart)+lineStart
-		return [start,end]
+		start,end=getWordBoundaries(lineText).getWordOffsets(offset-lineStart)
+		return [start+lineStart,end+lineStart]
 
 	def _getLineNumFromOffset(self,offset):
 		return None
 
+	def _getLineStartIndex(self):
+		"""Gets a L{LineStartIndex} of the story text, if lines are found by the base implementation of L{_getLineOffsets}.
+		@return: The index, or C{None} if it is not used or lines are provided by a subclass.
+		@rtype: L{LineStartIndex}
+		"""
+		if not self.useLineStartIndex or six.get_unbound_function(type(self)._getLineOffsets) is not six.get_unbound_function(OffsetsTextInfo._getLineOffsets):
+			return None
+		try:
+			text=self._getStoryText()
+		except NotImplementedError:
+			return None
+		return getLineStartIndex(text)
 
 	def _getLineOffsets(self,offset):
 		text=self._getStoryText()
+		if self.useLineStartIndex:
+			return getLineStartIndex(text).getLineOffsets(offset)
 		start=findStartOfLine(text,offset)
 		end=findEndOfLine(text,offset)
 		return [start,end]
@@ -552,6 +780,11 @@ class OffsetsTextInfo(textInfos.TextInfo):
 			# #2096: There is often an uncounted character at the end of the text
 			# where the caret is placed to append text.
 			highLimit+=1
+		lineStartIndex=self._getLineStartIndex() if unit==textInfos.UNIT_LINE else None
+		if lineStartIndex and lineStartIndex.isExact and len(lineStartIndex.text)==highLimit:
+			# Jump straight to the line rather than moving through each line in between.
+			offset,count=self._moveByLines(lineStartIndex,offset,direction)
+			lastOffset=offset
 		while count!=direction and (lastOffset is None or (direction>0 and offset>lastOffset) or (direction<0 and offset<lastOffset)) and (offset<highLimit or direction<0) and (offset>lowLimit or direction>0):
 			lastOffset=offset
 			if direction<0 and offset>lowLimit:
@@ -580,6 +813,24 @@ class OffsetsTextInfo(textInfos.TextInfo):
 			self._endOffset=tempOffset
 		return count
 
+	def _moveByLines(self,lineStartIndex,offset,direction):
+		"""Finds where moving the given number of lines from an offset would end, as the loop in L{move} would.
+		@return: The new offset and the number of lines moved.
+		@rtype: tuple of (int, int)
+		"""
+		storyLength=len(lineStartIndex.text)
+		if direction>0:
+			if offset>=storyLength:
+				return offset,0
+			lineNum=lineStartIndex.getLineNumFromOffset(offset)
+			count=min(direction,lineStartIndex.lineCount-lineNum)
+			return lineStartIndex.getLineOffsetsFromLineNum(lineNum+count-1)[1],count
+		if offset<=0:
+			return offset,0
+		lineNum=lineStartIndex.getLineNumFromOffset(offset-1)
+		count=min(-direction,lineNum+1)
+		return lineStartIndex.lineStarts[lineNum-count+1],-count
+
 	def find(self,text,caseSensitive=False,reverse=False):
 		if reverse:
 			# When searching in reverse, we reverse both strings and do a forwards search.
@@ -0,0 +1,222 @@
+#tracing.py
+#A part of NonVisual Desktop Access (NVDA)
+#Copyright (C) 2018 NV Access Limited
+#This file is covered by the GNU General Public License.
+#See the file COPYING for more details.
+
+"""Low overhead tracing of where time is spent in NVDA's core.
+When enabled with the debugLog tracing setting,
+the duration of each stage of a core pump, each event and each script,
+queue depths and the latency between input and the resulting speech or braille output
+are recorded into a ring buffer.
+The records can be summarised with L{getSummary}
+or saved with L{dumpChromeTrace} for viewing in the Chrome trace viewer (chrome://tracing).
+When disabled, the cost is a check of L{isEnabled}.
+"""
+
+import os
+import json
+import tempfile
+import thread
+from collections import deque
+from timeit import default_timer
+import config
+from logHandler import log
+
+CATEGORY_PUMP = "pump"
+CATEGORY_EVENT = "event"
+CATEGORY_SCRIPT = "script"
+CATEGORY_INPUT = "input"
+CATEGORY_LATENCY = "latency"
+CATEGORY_COUNTER = "counter"
+
+#: The maximum number of records kept.
+#: When more are recorded, the oldest are discarded.
+MAX_RECORDS = 50000
+
+#: Whether tracing is enabled.
+#: This is updated from the configuration by L{updateEnabled}.
+#: @type: bool
+isEnabled = False
+#: The configuration generation for which L{isEnabled} was last updated.
+_configGeneration = None
+#: Tuples of (category, name, start time, duration, thread id, args).
+#: The duration is C{None} for counters.
+_records = deque(maxlen=MAX_RECORDS)
+_startTime = default_timer()
+#: The time and name of the last input, or C{None} if there was none since tracing was enabled.
+_lastInput = None
+#: The outputs for which latency has already been recorded since the last input.
+_outputsSinceInput = set()
+
+def updateEnabled():
+	"""Updates L{isEnabled} from the configuration if it has changed since this was last called.
+	This is cheap enough to be called on every core pump,
+	so tracing can be toggled without restarting NVDA.
+	"""
+	global isEnabled, _configGeneration, _lastInput
+	conf = config.conf
+	if not conf or conf.generation == _configGeneration:
+		return
+	_configGeneration = conf.generation
+	enabled = conf["debugLog"]["tracing"]
+	if enabled and not isEnabled:
+		_lastInput = None
+		log.info("Tracing enabled")
+	isEnabled = enabled
+
+def record(category, name, startTime, duration, args=None):
+	"""Records a span of time.
+	Callers should check L{isEnabled} first.
+	@param startTime: The start time as given by C{timeit.default_timer}.
+	@type startTime: float
+	@param duration: The duration in seconds.
+	@type duration: float
+	@param args: Extra information to include in the trace.
+	@type args: dict
+	"""
+	_records.append((category, name, startTime, duration, thread.get_ident(), args))
+
+def recordCounter(name, value):
+	"""Records the value of a counter such as the depth of a queue.
+	Callers should check L{isEnabled} first.
+	"""
+	_records.append((CATEGORY_COUNTER, name, default_timer(), None, thread.get_ident(), {name: value}))
+
+class _Span(object):
+	__slots__ = ("category", "name", "args", "startTime")
+
+	def __init__(self, category, name, args):
+		self.category = category
+		self.name = name
+		self.args = args
+
+	def __enter__(self):
+		self.startTime = default_timer()
+
+	def __exit__(self, excType, excVal, traceback):
+		record(self.category, self.name, self.startTime, default_timer() - self.startTime, self.args)
+
+class _NullSpan(object):
+
+	def __enter__(self):
+		pass
+
+	def __exit__(self, excType, excVal, traceback):
+		pass
+
+_nullSpan = _NullSpan()
+
+def span(category, name, args=None):
+	"""Gets a context manager which records the time spent in its block.
+	If tracing is disabled, nothing is recorded.
+	"""
+	if not isEnabled:
+		return _nullSpan
+	return _Span(category, name, args)
+
+def markInput(name):
+	"""Notes that input was received, so that the latency until output can be recorded.
+	Callers should check L{isEnabled} first.
+	@param name: The name of the input; e.g. a gesture identifier.
+	@type name: basestring
+	"""
+	global _lastInput
+	_lastInput = (default_timer(), name)
+	_outputsSinceInput.clear()
+
+def markOutput(output):
+	"""Notes that output was produced,
+	recording the latency since the last input if this is the first such output since then.
+	@param output: The kind of output; e.g. "speech" or "braille".
+	@type output: str
+	"""
+	if not isEnabled or not _lastInput or output in _outputsSinceInput:
+		return
+	_outputsSinceInput.add(output)
+	inputTime, inputName = _lastInput
+	record(CATEGORY_LATENCY, "input to %s" % output, inputTime, default_timer() - inputTime, {"input": inputName})
+
+def clear():
+	"""Discards all records."""
+	global _lastInput
+	_records.clear()
+	_lastInput = None
+
+def _percentile(sortedValues, percent):
+	index = int(round(percent / 100.0 * (len(sortedValues) - 1)))
+	return sortedValues[index]
+
+def getSummary():
+	"""Summarises the recorded durations.
+	@return: Maps (category, name) to dicts containing the count
+		and the mean, 50th, 90th and 99th percentile and maximum durations in milliseconds.
+	@rtype: dict
+	"""
+	durations = {}
+	for category, name, startTime, duration, threadId, args in list(_records):
+		if duration is None:
+			continue
+		durations.setdefault((category, name), []).append(duration * 1000)
+	summary = {}
+	for key, values in durations.iteritems():
+		values.sort()
+		summary[key] = {
+			"count": len(values),
+			"mean": sum(values) / len(values),
+			"p50": _percentile(values, 50),
+			"p90": _percentile(values, 90),
+			"p99": _percentile(values, 99),
+			"max": values[-1],
+		}
+	return summary
+
+def formatSummary():
+	"""Formats L{getSummary} as text, with the spans taking the most total time first.
+	@rtype: str
+	"""
+	summary = getSummary()
+	lines = ["%-40s %7s %9s %9s %9s %9s %9s" % ("span", "count", "mean", "p50", "p90", "p99", "max")]
+	for key in sorted(summary, key=lambda key: summary[key]["mean"] * summary[key]["count"], reverse=True):
+		stats = summary[key]
+		lines.append("%-40s %7d %9.3f %9.3f %9.3f %9.3f %9.3f" % (
+			"%s: %s" % key, stats["count"], stats["mean"], stats["p50"], stats["p90"], stats["p99"], stats["max"]
+		))
+	return "\n".join(lines)
+
+def getChromeTraceEvents():
+	"""Converts the records to events in the Chrome trace event format.
+	@rtype: list of dict
+	"""
+	events = []
+	for category, name, startTime, duration, threadId, args in list(_records):
+		event = {
+			"name": name,
+			"cat": category,
+			"ts": (startTime - _startTime) * 1000000,
+			"pid": 0,
+			"tid": threadId,
+		}
+		if duration is None:
+			event["ph"] = "C"
+		else:
+			event["ph"] = "X"
+			event["dur"] = duration * 1000000
+		if args:
+			event["args"] = args
+		events.append(event)
+	return events
+
+def dumpChromeTrace(fileName=None):
+	"""Saves the records to a file in the Chrome trace event format.
+	@param fileName: The file to write, or C{None} to write nvda_trace.json in the temporary directory.
+	@type fileName: basestring
+	@return: The name of the file written.
+	@rtype: basestring
+	"""
+	if not fileName:
+		fileName = os.path.join(tempfile.gettempdir(), "nvda_trace.json")
+	with open(fileName, "w") as f:
+		json.dump({"traceEvents": getChromeTraceEvents(), "displayTimeUnit": "ms"}, f)
+	log.info("Trace with %d records saved to %s" % (len(_records), fileName))
+	return fileName
@@ -265,15 +265,31 @@ class VirtualBufferTextInfo(browseMode.BrowseModeDocumentTextInfo,textInfos.offs
 		text=NVDAHelper.VBuf_getTextInRange(self.obj.VBufHandle,start,end,True)
 		if not text:
 			return ""
-		commandList=XMLFormatting.XMLTextParser().parse(text)
-		for index in xrange(len(commandList)):
-			if isinstance(commandList[index],textInfos.FieldCommand):
-				field=commandList[index].field
-				if isinstance(field,textInfos.ControlField):
-					commandList[index].field=self._normalizeControlField(field)
-				elif isinstance(field,textInfos.FormatField):
-					commandList[index].field=self._normalizeFormatField(field)
-		return commandList
+		return self._getXMLTextParser().parse(text)
+
+	def _iterFieldsInRange(self,start,end):
+		text=NVDAHelper.VBuf_getTextInRange(self.obj.VBufHandle,start,end,True)
+		if not text:
+			return iter(())
+		return self._getXMLTextParser().iterParse(text)
+
+	#: The parser used for the text of this TextInfo, created when first needed.
+	#: @type: L{XMLFormatting.XMLTextParser}
+	_xmlTextParser=None
+
+	def _getXMLTextParser(self):
+		parser=self._xmlTextParser
+		if parser:
+			return parser
+		# The parser is kept by this TextInfo, so only hold a weak reference to it here to avoid a reference cycle.
+		selfRef=weakref.ref(self)
+		# The same fields are fetched over and over as the user moves through the document,
+		# so share them rather than keeping many equal copies.
+		parser=self._xmlTextParser=XMLFormatting.XMLTextParser(
+			normalizeControlField=lambda field: textInfos.internField(selfRef()._normalizeControlField(field)),
+			normalizeFormatField=lambda field: textInfos.internField(selfRef()._normalizeFormatField(field)),
+		)
+		return parser
 
 	def getTextWithFields(self,formatConfig=None):
 		start=self._startOffset
@@ -282,6 +298,17 @@ class VirtualBufferTextInfo(browseMode.BrowseModeDocumentTextInfo,textInfos.offs
 			return ""
 		return self._getFieldsInRange(start,end)
 
+	def _iterTextWithFields(self):
+		"""Yields the same text and fields as L{getTextWithFields} as they are parsed,
+		so that callers which only need the initial fields can stop early without parsing the rest.
+		@rtype: iterator
+		"""
+		start=self._startOffset
+		end=self._endOffset
+		if start==end:
+			return iter(())
+		return self._iterFieldsInRange(start,end)
+
 	def _getWordOffsets(self,offset):
 		#Use VBuf_getBufferLineOffsets with out screen layout to find out the range of the current field
 		lineStart=ctypes.c_int()
@@ -649,7 +676,7 @@ class VirtualBuffer(browseMode.BrowseModeDocumentTreeInterceptor):
 		formatConfig=config.conf['documentFormatting'].copy()
 		formatConfig.update({"reportBlockQuotes":True,"reportTables":True,"reportLists":True,"reportFrames":True})
 		controlFields=[]
-		for cmd in range.getTextWithFields():
+		for cmd in range._iterTextWithFields():
 			if not isinstance(cmd,textInfos.FieldCommand) or cmd.command!="controlStart":
 				break
 			controlFields.append(cmd.field)
@@ -686,7 +713,7 @@ class VirtualBuffer(browseMode.BrowseModeDocumentTreeInterceptor):
 		info = self.makeTextInfo(obj)
 		info.collapse()
 		info.expand(textInfos.UNIT_CHARACTER)
-		for item in info.getTextWithFields():
+		for item in info._iterTextWithFields():
 			if not isinstance(item, textInfos.FieldCommand) or not item.field:
 				continue
 			fieldId = item.field.get("controlIdentifier_ID")
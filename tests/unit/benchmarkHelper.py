@@ -0,0 +1,94 @@
+#tests/unit/benchmarkHelper.py
+#A part of NonVisual Desktop Access (NVDA)
+#This file is covered by the GNU General Public License.
+#See the file COPYING for more details.
+#Copyright (C) 2018 NV Access Limited
+
+"""Support for benchmark modules, which measure the performance of NVDA code without a running NVDA.
+A benchmark module provides a C{benchmark} function returning L{results<findRegressions>}
+and a C{main} function which passes it to L{runBenchmark},
+so that it can be run from the top of the repository::
+	python -m tests.unit.<module> [--baseline file] [--save file]
+L{brailleDisplayEmulator} benchmarks braille display drivers in the same way.
+"""
+
+import os
+import json
+import timeit
+
+def timeCall(func, number, repeat=5):
+	"""Times calls to a function.
+	The fastest of several runs is used, as slower runs are usually slowed by other processes.
+	@param func: The function to call without arguments.
+	@type func: callable
+	@param number: The number of calls in each run.
+	@type number: int
+	@param repeat: The number of runs.
+	@type repeat: int
+	@return: The time per call in milliseconds.
+	@rtype: float
+	"""
+	return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1000
+
+def findRegressions(results, baseline, metrics, tolerance=0.25):
+	"""Compares benchmark results with a baseline.
+	@param results: Maps the name of each benchmarked case to a dict mapping metric names to values.
+	@type results: dict
+	@param baseline: Earlier results in the same form.
+	@type baseline: dict
+	@param metrics: The names of the metrics for which higher values are regressions.
+	@type metrics: tuple of str
+	@param tolerance: The fraction by which a metric may exceed its baseline value.
+	@type tolerance: float
+	@return: A description of each regression.
+	@rtype: list of str
+	"""
+	regressions = []
+	for name, caseMetrics in sorted(results.iteritems()):
+		baselineMetrics = baseline.get(name)
+		if not baselineMetrics:
+			continue
+		for metric in metrics:
+			old = baselineMetrics.get(metric)
+			new = caseMetrics.get(metric)
+			if old is None or new is None:
+				continue
+			if new > old * (1 + tolerance):
+				regressions.append("%s: %s increased from %.4g to %.4g" % (name, metric, old, new))
+	return regressions
+
+def runBenchmark(description, benchmark, metrics, args):
+	"""Runs a benchmark from the command line, printing its results.
+	@param description: The description of the benchmark for the command line help.
+	@type description: str
+	@param benchmark: A function without arguments returning results as described for L{findRegressions}.
+	@type benchmark: callable
+	@param metrics: The names of the metrics for which higher values are regressions.
+	@type metrics: tuple of str
+	@param args: The command line arguments.
+	@type args: list of str
+	@return: The exit code; 1 if there were regressions, 0 otherwise.
+	@rtype: int
+	"""
+	import argparse
+	import tests.unit
+	parser = argparse.ArgumentParser(description=description)
+	parser.add_argument("--baseline", help="A file with earlier results to check for regressions")
+	parser.add_argument("--save", help="A file in which to save the results")
+	args = parser.parse_args(args)
+	# Importing the unit test package changes the current directory.
+	makePath = lambda path: os.path.join(tests.unit.TOP_DIR, path)
+	results = benchmark()
+	for name, caseMetrics in sorted(results.iteritems()):
+		print("%s: %s" % (name, ", ".join("%s %.4g" % item for item in sorted(caseMetrics.iteritems()))))
+	if args.save:
+		with open(makePath(args.save), "w") as f:
+			json.dump(results, f, indent=1, sort_keys=True)
+	if args.baseline:
+		with open(makePath(args.baseline)) as f:
+			regressions = findRegressions(results, json.load(f), metrics)
+		for regression in regressions:
+			print("Regression: %s" % regression)
+		if regressions:
+			return 1
+	return 0
@@ -0,0 +1,241 @@
+#tests/unit/brailleDisplayEmulator.py
+#A part of NonVisual Desktop Access (NVDA)
+#This file is covered by the GNU General Public License.
+#See the file COPYING for more details.
+#Copyright (C) 2018 NV Access Limited
+
+"""Emulation of braille displays for testing and benchmarking braille display drivers without hardware.
+A L{Recording} holds the bytes a display sends in response to the driver's requests
+and for a number of gestures.
+L{emulatedDisplay} connects a driver to a L{DisplayEmulator} replaying a recording
+over a L{hwIoFraming.Loopback} transport instead of a serial port.
+L{benchmark} measures gesture decoding latency, write throughput and CPU time per update,
+and L{benchmarkHelper.findRegressions} compares the results with a baseline.
+To benchmark all recorded drivers from the top of the repository, run::
+	python -m tests.unit.brailleDisplayEmulator [--baseline file] [--save file]
+"""
+
+import os
+import sys
+import contextlib
+from timeit import default_timer
+import hwIo
+import hwIoFraming
+import inputCore
+import bdDetect
+import braille
+import benchmarkHelper
+
+class Recording(object):
+	"""Bytes recorded from the exchange between a braille display and its driver.
+	"""
+
+	def __init__(self, name, driverName, numCells, responses, gestures):
+		"""
+		@param name: The name of this recording; e.g. the driver and model.
+		@type name: str
+		@param driverName: The name of the driver for the display.
+		@type driverName: str
+		@param numCells: The number of cells the driver should detect.
+		@type numCells: int
+		@param responses: Tuples of (request, response).
+			When the driver writes data starting with a request, the display sends the response.
+		@type responses: list
+		@param gestures: Tuples of (data, gesture id) for the bytes the display sends for a gesture
+			and the id of the gesture the driver should execute for them.
+		@type gestures: list
+		"""
+		self.name = name
+		self.driverName = driverName
+		self.numCells = numCells
+		self.responses = responses
+		self.gestures = gestures
+
+def _htExtendedPacket(modelId, data):
+	return b"\x79" + modelId + chr(len(data)) + data + b"\x16"
+
+def _htKey(key):
+	# Key press, then release.
+	return _htExtendedPacket(b"\x74", b"\x04" + chr(key)) + _htExtendedPacket(b"\x74", b"\x04" + chr(key | 0x80))
+
+def _ebPacket(packetType, packetSubType, data=b""):
+	size = len(data) + 4
+	return b"\x02" + chr(size >> 8) + chr(size & 0xff) + packetType + packetSubType + data + b"\x03"
+
+def _alvaMessage(cmd, value):
+	return b"\x1b" + cmd + value
+
+def _alvaKey(group, number):
+	return _alvaMessage(b"K", chr(group) + chr(number)) + _alvaMessage(b"K", chr(group | 0x80) + chr(number))
+
+#: Recordings for drivers of serial displays.
+RECORDINGS = [
+	Recording("handyTech Braille Star 40", "handyTech", 40,
+		responses=[
+			# Reset; the display answers with OK and its model id.
+			(b"\xff", b"\xfe\x74"),
+		],
+		gestures=[
+			(_htKey(0x03), "b1"),
+			(_htKey(0x0C), "leftTakTop"),
+			(_htKey(0x20 + 5), "routing"),
+		]
+	),
+	Recording("eurobraille Esys 40", "eurobraille", 40,
+		responses=[
+			(_ebPacket(b"S", b"I"),
+				_ebPacket(b"S", b"T", b"\x08") + _ebPacket(b"S", b"G", b"\x28") + _ebPacket(b"S", b"I")),
+		],
+		gestures=[
+			(_ebPacket(b"K", b"C", b"\x00\x00\x00\x02") + _ebPacket(b"K", b"C", b"\x00\x00\x00\x00"), "switch1Left"),
+			(_ebPacket(b"K", b"I", b"\x01\x06"), "routing"),
+			(_ebPacket(b"K", b"B", b"\x00\x03"), "dot1+dot2"),
+		]
+	),
+	Recording("alva BC640", "alva", 40,
+		responses=[
+			(_alvaMessage(b"?", b"?"), _alvaMessage(b"?", b"\x40")),
+			(_alvaMessage(b"E", b"?"), _alvaMessage(b"E", b"\x28")),
+			# A year of 0 means that the display doesn't have a clock.
+			(_alvaMessage(b"H", b"?"), _alvaMessage(b"H", b"\x00" * 7)),
+			(_alvaMessage(b"r", b"?"), _alvaMessage(b"r", b"\x00")),
+		],
+		gestures=[
+			(_alvaKey(0x71, 0), "t1"),
+			(_alvaKey(0x74, 5), "routing"),
+		]
+	),
+]
+
+class DisplayEmulator(object):
+	"""Emulates a braille display by replaying a L{Recording}.
+	It also stands in for L{inputCore.manager} to record the gestures executed by the driver.
+	"""
+
+	def __init__(self, recording):
+		self.recording = recording
+		#: The transport connecting the driver to this emulator.
+		#: @type: L{hwIoFraming.Loopback}
+		self.transport = None
+		#: The data written by the driver.
+		self.written = []
+		#: Tuples of (time, gesture id) for the gestures executed by the driver.
+		self.gestures = []
+
+	def makeTransport(self, *args, **kwargs):
+		"""Creates the transport; a replacement for L{hwIo.Serial}.
+		"""
+		self.transport = hwIoFraming.Loopback(kwargs["onReceive"],
+			onReceiveSize=kwargs.get("onReceiveSize", 1), onWrite=self._onWrite)
+		return self.transport
+
+	def _onWrite(self, data):
+		self.written.append(data)
+		for request, response in self.recording.responses:
+			if data.startswith(request):
+				self.transport.receive(response)
+				break
+
+	def sendGesture(self, data):
+		"""Sends the bytes for a gesture to the driver and waits for it to process them.
+		"""
+		self.transport.receive(data)
+		self.transport.dispatch()
+
+	def executeGesture(self, gesture):
+		self.gestures.append((default_timer(), gesture.id))
+
+@contextlib.contextmanager
+def emulatedDisplay(recording):
+	"""Connects the driver for a recording to an emulated display.
+	This is a context manager which gives the driver and the L{DisplayEmulator},
+	and terminates the driver on exit.
+	"""
+	emulator = DisplayEmulator(recording)
+	driverClass = braille._getDisplayDriver(recording.driverName)
+	origSerial = hwIo.Serial
+	origManager = inputCore.manager
+	hwIo.Serial = emulator.makeTransport
+	inputCore.manager = emulator
+	try:
+		driver = driverClass(bdDetect.DeviceMatch(bdDetect.KEY_SERIAL, "emulated", "emulated", {}))
+		# Drivers wait for real displays to settle when terminating.
+		driver.timeout = 0
+		try:
+			yield driver, emulator
+		finally:
+			driver.terminate()
+	finally:
+		hwIo.Serial = origSerial
+		inputCore.manager = origManager
+
+def _makeUpdates(numCells, count):
+	"""Makes cells as they are written while reading;
+	a cursor blinking on a line with a new line every ten updates,
+	and every fifth update repeating the one before, as for a caret update which changes nothing.
+	"""
+	updates = []
+	for index in xrange(count):
+		if index % 5 == 4:
+			updates.append(list(updates[-1]))
+			continue
+		line = index // 10
+		cells = [(line * 7 + pos * 13) & 0x3f for pos in xrange(numCells)]
+		if index % 5 % 2:
+			cells[line % numCells] |= 0xc0
+		updates.append(cells)
+	return updates
+
+#: The metrics for which higher values are regressions.
+#: bytesPerSecond is informative only, as it decreases when fewer bytes are written.
+REGRESSION_METRICS = ("gestureLatency", "updateTime", "updateCpu", "bytesPerUpdate")
+
+def benchmark(recording, updates=1000, gestureRepeats=50):
+	"""Measures the performance of the driver for a recording.
+	@return: The mean latency from receiving the bytes for a gesture until it is executed (gestureLatency),
+		the mean wall clock and CPU time per cell update (updateTime and updateCpu),
+		all in milliseconds,
+		and the bytes written per update (bytesPerUpdate) and per second of update time (bytesPerSecond).
+	@rtype: dict
+	"""
+	with emulatedDisplay(recording) as (driver, emulator):
+		latencies = []
+		for repeat in xrange(gestureRepeats):
+			for data, gestureId in recording.gestures:
+				del emulator.gestures[:]
+				start = default_timer()
+				emulator.sendGesture(data)
+				if [executedId for executedTime, executedId in emulator.gestures] != [gestureId]:
+					raise AssertionError("Expected gesture %s, got %r" % (gestureId, emulator.gestures))
+				latencies.append(emulator.gestures[0][0] - start)
+		cellUpdates = _makeUpdates(driver.numCells, updates)
+		bytesBefore = emulator.transport.getWriteStatistics()["bytes"]
+		cpuStart = sum(os.times()[:2])
+		start = default_timer()
+		for cells in cellUpdates:
+			# Write cells as the braille handler does, so unchanged cells are skipped.
+			driver._displayIfChanged(cells)
+		elapsed = default_timer() - start
+		cpuElapsed = sum(os.times()[:2]) - cpuStart
+		bytesWritten = emulator.transport.getWriteStatistics()["bytes"] - bytesBefore
+	return {
+		"gestureLatency": sum(latencies) / len(latencies) * 1000,
+		"updateTime": elapsed / updates * 1000,
+		"updateCpu": cpuElapsed / updates * 1000,
+		"bytesPerUpdate": float(bytesWritten) / updates,
+		"bytesPerSecond": bytesWritten / elapsed if elapsed > 0 else 0.0,
+	}
+
+def benchmarkDrivers():
+	"""Benchmarks the drivers for all L{RECORDINGS}.
+	@return: Maps recording names to the results of L{benchmark}.
+	@rtype: dict
+	"""
+	return {recording.name: benchmark(recording) for recording in RECORDINGS}
+
+def main(args):
+	return benchmarkHelper.runBenchmark("Benchmark braille display drivers against emulated displays.",
+		benchmarkDrivers, REGRESSION_METRICS, args)
+
+if __name__ == "__main__":
+	sys.exit(main(sys.argv[1:]))
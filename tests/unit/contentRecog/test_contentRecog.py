@@ -8,6 +8,7 @@
 """
 
 import unittest
+import random
 import contentRecog
 import textInfos
 from locationHelper import RectLTWH
@@ -170,3 +171,61 @@ class TestLinesWordsResult(unittest.TestCase):
 	def test_copyTextInfo(self):
 		copy = self.textInfo.copy()
 		self.assertEqual(copy, self.textInfo)
+
+	def test_offsetFromPointInWord1(self):
+		self.assertEqual(self.textInfo._getOffsetFromPoint(100, 205), self.TOP)
+		# Characters are assumed to be of equal width; 2 pixels each for word1.
+		self.assertEqual(self.textInfo._getOffsetFromPoint(103, 205), self.WORD1_SECOND)
+		# The last character of word1, which is before the space included in WORD1_LAST.
+		self.assertEqual(self.textInfo._getOffsetFromPoint(109, 219), self.WORD1_LAST - 1)
+
+	def test_offsetFromPointInWord4(self):
+		self.assertEqual(self.textInfo._getOffsetFromPoint(110, 220), self.WORD4_OFFSETS[0])
+
+	def test_offsetFromPointOutsideWords(self):
+		self.assertRaises(LookupError, self.textInfo._getOffsetFromPoint, 99, 205)
+		self.assertRaises(LookupError, self.textInfo._getOffsetFromPoint, 120, 205)
+		self.assertRaises(LookupError, self.textInfo._getOffsetFromPoint, 105, 240)
+
+class TestLinesWordsResultIndexes(unittest.TestCase):
+	"""Tests the lookups of LinesWordsResult against linear searches for a dense result."""
+
+	def setUp(self):
+		rand = random.Random(0)
+		data = []
+		for lineIndex in xrange(20):
+			line = []
+			x = 0
+			for wordIndex in xrange(rand.randint(1, 30)):
+				width = rand.randint(5, 80)
+				line.append({"x": x, "y": lineIndex * 18, "width": width, "height": 16,
+					"text": u"w" * rand.randint(1, 12)})
+				x += width + rand.randint(0, 10)
+			data.append(line)
+		info = contentRecog.RecogImageInfo(0, 0, 1920, 1080, 1)
+		self.result = contentRecog.LinesWordsResult(data, info)
+		self.textInfo = self.result.makeTextInfo(FakeNVDAObject(), textInfos.POSITION_FIRST)
+
+	def test_offsets(self):
+		words = self.result.words
+		for offset in xrange(self.result.textLen + 2):
+			lineStart = max([0] + [end for end in self.result.lines if end <= offset])
+			lineEnd = min([end for end in self.result.lines if end > offset] or [self.result.textLen])
+			self.assertEqual(self.textInfo._getLineOffsets(offset), (lineStart, lineEnd))
+			word = [word for word in words if word.offset <= offset][-1]
+			wordEnd = min([w.offset for w in words if w.offset > offset] or [self.result.textLen])
+			self.assertEqual(self.textInfo._getWordOffsets(offset), (word.offset, wordEnd))
+			self.assertEqual(self.textInfo._getBoundingRectFromOffset(offset),
+				RectLTWH(word.left, word.top, word.width, word.height))
+
+	def test_offsetsFromPoints(self):
+		words = self.result.words
+		for x in xrange(0, 1200, 11):
+			for y in xrange(0, 380, 7):
+				matches = [word for word in words
+					if word.left <= x < word.left + word.width and word.top <= y < word.top + word.height]
+				if not matches:
+					self.assertRaises(LookupError, self.textInfo._getOffsetFromPoint, x, y)
+					continue
+				offset = self.textInfo._getOffsetFromPoint(x, y)
+				self.assertEqual(self.textInfo._getWordOffsets(offset)[0], matches[0].offset)
@@ -0,0 +1,130 @@
+#tests/unit/contentRecog/test_recogUi.py
+#A part of NonVisual Desktop Access (NVDA)
+#This file is covered by the GNU General Public License.
+#See the file COPYING for more details.
+#Copyright (C) 2018 NV Access Limited
+
+"""Unit tests for the caching of recognition results in the contentRecog.recogUi module.
+"""
+
+import unittest
+import ctypes
+import contentRecog
+from contentRecog import recogUi
+import queueHandler
+
+WIDTH = 20
+HEIGHT = 40
+
+def makePixels(rowValues):
+	"""Makes an image in which the first byte of each row is given by C{rowValues}.
+	"""
+	pixels = ((ctypes.c_ubyte * 4 * WIDTH) * len(rowValues))()
+	for y, value in enumerate(rowValues):
+		pixels[y][0][0] = value
+	return pixels
+
+class FakeRecognizer(contentRecog.ContentRecognizer):
+	"""Synchronously recognizes a line for each row of an image with a non-zero first byte.
+	"""
+
+	def __init__(self, language="en"):
+		self.language = language
+		#: The heights of the images passed to L{recognize}.
+		self.recognized = []
+		self.fail = False
+
+	def getCacheKey(self):
+		return (type(self), self.language)
+
+	def recognize(self, pixels, imageInfo, onResult):
+		self.recognized.append(imageInfo.recogHeight)
+		if self.fail:
+			onResult(RuntimeError("failed"))
+			return
+		data = [[{"x": 0, "y": y, "width": 1, "height": 1, "text": "row%d" % row[0][0]}]
+			for y, row in enumerate(pixels) if row[0][0]]
+		onResult(contentRecog.LinesWordsResult(data, imageInfo))
+
+	def cancel(self):
+		pass
+
+class UncachedRecognizer(FakeRecognizer):
+
+	def getCacheKey(self):
+		return None
+
+class TestRecognitionCache(unittest.TestCase):
+
+	def setUp(self):
+		recogUi.flushResultCache()
+		self.rows = [y + 1 for y in xrange(HEIGHT)]
+		self.imgInfo = contentRecog.RecogImageInfo(10, 20, WIDTH, HEIGHT, 1)
+
+	def recognize(self, recognizer, pixels, imgInfo=None, tileHeight=None):
+		results = []
+		recognizer.tileHeight = tileHeight
+		recogUi._recognize(recognizer, pixels, imgInfo or self.imgInfo, results.append)
+		# Tiled recognition continues in the main thread.
+		while queueHandler.isPendingItems(queueHandler.eventQueue):
+			queueHandler.flushQueue(queueHandler.eventQueue)
+		self.assertEqual(len(results), 1)
+		return results[0]
+
+	def test_sameImageReused(self):
+		recognizer = FakeRecognizer()
+		first = self.recognize(recognizer, makePixels(self.rows))
+		second = self.recognize(recognizer, makePixels(self.rows))
+		self.assertIs(second, first)
+		self.assertEqual(len(recognizer.recognized), 1)
+
+	def test_changedImageRecognized(self):
+		recognizer = FakeRecognizer()
+		self.recognize(recognizer, makePixels(self.rows))
+		self.rows[3] = 9
+		result = self.recognize(recognizer, makePixels(self.rows))
+		self.assertIn("row9", result.text)
+		self.assertEqual(len(recognizer.recognized), 2)
+
+	def test_locationAndRecognizerInKey(self):
+		recognizer = FakeRecognizer()
+		self.recognize(recognizer, makePixels(self.rows))
+		movedInfo = contentRecog.RecogImageInfo(11, 20, WIDTH, HEIGHT, 1)
+		self.recognize(recognizer, makePixels(self.rows), imgInfo=movedInfo)
+		self.assertEqual(len(recognizer.recognized), 2)
+		otherRecognizer = FakeRecognizer(language="de")
+		self.recognize(otherRecognizer, makePixels(self.rows))
+		self.assertEqual(len(otherRecognizer.recognized), 1)
+
+	def test_uncacheableRecognizer(self):
+		recognizer = UncachedRecognizer()
+		self.recognize(recognizer, makePixels(self.rows))
+		self.recognize(recognizer, makePixels(self.rows))
+		self.assertEqual(len(recognizer.recognized), 2)
+
+	def test_failureNotCached(self):
+		recognizer = FakeRecognizer()
+		recognizer.fail = True
+		self.assertIsInstance(self.recognize(recognizer, makePixels(self.rows)), RuntimeError)
+		recognizer.fail = False
+		self.assertIsInstance(self.recognize(recognizer, makePixels(self.rows)), contentRecog.LinesWordsResult)
+		self.assertEqual(len(recognizer.recognized), 2)
+
+	def test_tiledEqualsWhole(self):
+		whole = self.recognize(FakeRecognizer(), makePixels(self.rows))
+		recogUi.flushResultCache()
+		recognizer = FakeRecognizer()
+		tiled = self.recognize(recognizer, makePixels(self.rows), tileHeight=15)
+		self.assertEqual(recognizer.recognized, [15, 15, 10])
+		self.assertEqual(tiled.text, whole.text)
+		self.assertEqual(tiled.words, whole.words)
+
+	def test_onlyChangedTilesRecognized(self):
+		recognizer = FakeRecognizer()
+		self.recognize(recognizer, makePixels(self.rows), tileHeight=10)
+		del recognizer.recognized[:]
+		self.rows[25] = 9
+		result = self.recognize(recognizer, makePixels(self.rows), tileHeight=10)
+		self.assertEqual(recognizer.recognized, [10])
+		recogUi.flushResultCache()
+		self.assertEqual(result.text, self.recognize(FakeRecognizer(), makePixels(self.rows)).text)
@@ -0,0 +1,76 @@
+#tests/unit/eventHandlerBenchmark.py
+#A part of NonVisual Desktop Access (NVDA)
+#This file is covered by the GNU General Public License.
+#See the file COPYING for more details.
+#Copyright (C) 2018 NV Access Limited
+
+"""Benchmark of event dispatch.
+Fires synthetic events through L{eventHandler._EventExecuter} against stub objects
+with several numbers of running global plugins, only one of which handles the event.
+To run it from the top of the repository::
+	python -m tests.unit.eventHandlerBenchmark [--baseline file] [--save file]
+"""
+
+import sys
+import eventHandler
+import globalPluginHandler
+import benchmarkHelper
+
+#: The metrics for which higher values are regressions.
+REGRESSION_METRICS = ("dispatch", "dispatchUnhandled")
+
+class FakePlugin(object):
+
+	def event_gainFocus(self, obj, nextHandler):
+		nextHandler()
+
+class FakeHandlingPlugin(FakePlugin):
+
+	def event_nameChange(self, obj, nextHandler):
+		nextHandler()
+
+class FakeAppModule(object):
+
+	def event_nameChange(self, obj, nextHandler):
+		nextHandler()
+
+class FakeObject(object):
+	treeInterceptor = None
+
+	def __init__(self):
+		self.appModule = FakeAppModule()
+
+	def event_nameChange(self):
+		pass
+
+def benchmark(pluginCounts=(0, 5, 20, 100), number=20000):
+	"""Measures the dispatch of an event handled by a plugin, the app module and the object (dispatch)
+	and of an event handled by none of them (dispatchUnhandled).
+	@return: For each number of plugins, the time per event in milliseconds.
+	@rtype: dict
+	"""
+	obj = FakeObject()
+	origPlugins = set(globalPluginHandler.runningPlugins)
+	results = {}
+	try:
+		for count in pluginCounts:
+			globalPluginHandler.runningPlugins.clear()
+			globalPluginHandler.runningPlugins.update(FakePlugin() for index in xrange(count - 1))
+			if count:
+				globalPluginHandler.runningPlugins.add(FakeHandlingPlugin())
+			eventHandler.invalidateHandlerCaches()
+			results["%d plugins" % count] = {
+				"dispatch": benchmarkHelper.timeCall(lambda: eventHandler._EventExecuter("nameChange", obj, {}), number),
+				"dispatchUnhandled": benchmarkHelper.timeCall(lambda: eventHandler._EventExecuter("valueChange", obj, {}), number),
+			}
+	finally:
+		globalPluginHandler.runningPlugins.clear()
+		globalPluginHandler.runningPlugins.update(origPlugins)
+		eventHandler.invalidateHandlerCaches()
+	return results
+
+def main(args):
+	return benchmarkHelper.runBenchmark("Benchmark event dispatch.", benchmark, REGRESSION_METRICS, args)
+
+if __name__ == "__main__":
+	sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,77 @@
+#tests/unit/sayAllBenchmark.py
+#A part of NonVisual Desktop Access (NVDA)
+#This file is covered by the GNU General Public License.
+#See the file COPYING for more details.
+#Copyright (C) 2018 NV Access Limited
+
+"""Benchmark of the speech path used by say all.
+Feeds reading chunks such as those of L{sayAllHandler} through L{speech.speakWithoutPauses}
+into a stub synth which records the index commands it receives.
+To run it from the top of the repository::
+	python -m tests.unit.sayAllBenchmark [--baseline file] [--save file]
+"""
+
+import sys
+import speech
+from speech import IndexCommand
+import benchmarkHelper
+
+#: The metrics for which higher values are regressions.
+#: chunksPerSecond is informative only, as it is derived from chunkTime.
+REGRESSION_METRICS = ("chunkTime",)
+
+PARAGRAPH = u"The quick brown fox jumps over the lazy dog and keeps running through the forest without stopping for breath or food"
+
+class StubSynth(object):
+	"""Stands in for L{speech.speak}, recording the index commands spoken."""
+
+	def __init__(self):
+		self.indexes = []
+
+	def speak(self, speechSequence, symbolLevel=None):
+		self.indexes.extend(item.index for item in speechSequence if isinstance(item, IndexCommand))
+
+def makeChunks(count, sentenceEvery):
+	"""Makes chunks of an index and a paragraph of text, as say all speaks for each line of a document.
+	@param sentenceEvery: Every chunk with an index divisible by this number ends a sentence.
+	@type sentenceEvery: int
+	"""
+	return [[IndexCommand(index), PARAGRAPH + u". Then it stopped" if index % sentenceEvery == 0 else PARAGRAPH]
+		for index in xrange(count)]
+
+def benchmark(chunkCount=20000):
+	"""Measures speaking chunks in which every sentence ends in the first chunk (sentences),
+	in every fifth chunk (paragraphs) and only in the first of all the chunks (noSentences).
+	@return: For each case, the time per chunk in milliseconds (chunkTime) and the number of chunks per second (chunksPerSecond).
+	@rtype: dict
+	"""
+	origSpeak = speech.speak
+	results = {}
+	try:
+		for name, sentenceEvery in (("sentences", 1), ("paragraphs", 5), ("noSentences", chunkCount)):
+			chunks = makeChunks(chunkCount, sentenceEvery)
+			synth = StubSynth()
+			speech.speak = synth.speak
+			def sayAll():
+				# Speak anything left pending before the benchmark.
+				speech.speakWithoutPauses(None)
+				del synth.indexes[:]
+				for chunk in chunks:
+					speech.speakWithoutPauses(chunk)
+				speech.speakWithoutPauses(None)
+			chunkTime = benchmarkHelper.timeCall(sayAll, 1) / chunkCount
+			if synth.indexes != range(chunkCount):
+				raise AssertionError("Not all indexes were spoken in order")
+			results[name] = {
+				"chunkTime": chunkTime,
+				"chunksPerSecond": 1000 / chunkTime,
+			}
+	finally:
+		speech.speak = origSpeak
+	return results
+
+def main(args):
+	return benchmarkHelper.runBenchmark("Benchmark the speech path used by say all.", benchmark, REGRESSION_METRICS, args)
+
+if __name__ == "__main__":
+	sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,69 @@
+#tests/unit/speechDictBenchmark.py
+#A part of NonVisual Desktop Access (NVDA)
+#This file is covered by the GNU General Public License.
+#See the file COPYING for more details.
+#Copyright (C) 2018 NV Access Limited
+
+"""Benchmark of speech dictionary processing.
+Measures L{speechDictHandler.SpeechDict.sub} and compiling a dictionary for dictionaries of several sizes,
+as well as running each entry in sequence, which is what compiled dictionaries replace.
+To run it from the top of the repository::
+	python -m tests.unit.speechDictBenchmark [--baseline file] [--save file]
+"""
+
+import sys
+import random
+from speechDictHandler import SpeechDict, SpeechDictEntry, CompiledSpeechDict, ENTRY_TYPE_ANYWHERE, ENTRY_TYPE_WORD, ENTRY_TYPE_REGEXP
+import benchmarkHelper
+
+#: The metrics for which higher values are regressions.
+#: sequentialLine is informative only, as it measures the code which compiled dictionaries replace.
+REGRESSION_METRICS = ("compiledLine", "compile")
+
+def makeDict(numEntries, words):
+	"""Makes a dictionary mostly of whole word and anywhere entries, with every fiftieth entry a regular expression.
+	"""
+	speechDict = SpeechDict()
+	for index, word in enumerate(words[:numEntries]):
+		if index % 50 == 0:
+			speechDict.append(SpeechDictEntry(u"%s(\\d+)" % word, u"%s \\1" % word.upper(), u"", type=ENTRY_TYPE_REGEXP))
+		else:
+			speechDict.append(SpeechDictEntry(word, word.upper(), u"", caseSensitive=index % 2 == 0,
+				type=ENTRY_TYPE_WORD if index % 3 else ENTRY_TYPE_ANYWHERE))
+	return speechDict
+
+def benchmark(sizes=(100, 1000, 5000), numLines=200):
+	"""Measures the processing of lines of fifteen words, a tenth of which are in the dictionary.
+	@return: For each dictionary size, the time per line for compiled (compiledLine) and sequential (sequentialLine) processing
+		and the time to compile the dictionary (compile), all in milliseconds.
+	@rtype: dict
+	"""
+	rand = random.Random(0)
+	words = [u"".join(rand.choice(u"abcdefghijklmnop") for letter in xrange(rand.randint(4, 9)))
+		for index in xrange(max(sizes))]
+	results = {}
+	for size in sizes:
+		speechDict = makeDict(size, words)
+		lines = [u" ".join(rand.choice(words[:size]) if rand.random() < 0.1 else u"lorem" for word in xrange(15))
+			for index in xrange(numLines)]
+		def processCompiled():
+			for line in lines:
+				speechDict.sub(line)
+		def processSequentially():
+			for line in lines:
+				for entry in speechDict:
+					line = entry.sub(line)
+		# Compile the dictionary before timing.
+		speechDict.sub(u"")
+		results["%d entries" % size] = {
+			"compiledLine": benchmarkHelper.timeCall(processCompiled, 1) / numLines,
+			"sequentialLine": benchmarkHelper.timeCall(processSequentially, 1, repeat=1) / numLines,
+			"compile": benchmarkHelper.timeCall(lambda: CompiledSpeechDict(speechDict), 1),
+		}
+	return results
+
+def main(args):
+	return benchmarkHelper.runBenchmark("Benchmark speech dictionary processing.", benchmark, REGRESSION_METRICS, args)
+
+if __name__ == "__main__":
+	sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,60 @@
+#tests/unit/speechSequenceBenchmark.py
+#A part of NonVisual Desktop Access (NVDA)
+#This file is covered by the GNU General Public License.
+#See the file COPYING for more details.
+#Copyright (C) 2018 NV Access Limited
+
+"""Benchmark of speech sequence handling.
+Measures preparing long formatted speech sequences, as L{speech.speak} does before passing them to the synth,
+and creating the speech commands such sequences contain.
+L{speech.processText} is stubbed while preparing sequences,
+so that the results don't depend on speech dictionaries and symbol processing, which have benchmarks of their own.
+To run it from the top of the repository::
+	python -m tests.unit.speechSequenceBenchmark [--baseline file] [--save file]
+"""
+
+import sys
+import speech
+from speech import IndexCommand, CharacterModeCommand, LangChangeCommand, BreakCommand
+import benchmarkHelper
+
+#: The metrics for which higher values are regressions.
+REGRESSION_METRICS = ("prepare", "create")
+
+def makeSequence(repeats):
+	"""Makes a sequence such as the speech for formatted text;
+	index commands, headings, spelled characters and language changes.
+	"""
+	return [
+		IndexCommand(1), u"heading level 2", CharacterModeCommand(True), u"A", CharacterModeCommand(False),
+		LangChangeCommand("fr"), u"texte", LangChangeCommand(None), u"bold", IndexCommand(2), u"more text here",
+	] * repeats
+
+def createCommands():
+	return [IndexCommand(1), CharacterModeCommand(True), LangChangeCommand("fr"), BreakCommand(5)]
+
+def benchmark(repeats=(4, 40), number=2000):
+	"""Measures preparing sequences of several lengths (prepare) and creating four speech commands (create).
+	@return: For each sequence length and for the commands, the time in milliseconds.
+	@rtype: dict
+	"""
+	results = {
+		"4 commands": {"create": benchmarkHelper.timeCall(createCommands, number * 10)},
+	}
+	origProcessText = speech.processText
+	speech.processText = lambda locale, text, symbolLevel: text
+	try:
+		for count in repeats:
+			speechSequence = makeSequence(count)
+			results["%d items" % len(speechSequence)] = {
+				"prepare": benchmarkHelper.timeCall(lambda: speech.prepareSpeech(speechSequence), number),
+			}
+	finally:
+		speech.processText = origProcessText
+	return results
+
+def main(args):
+	return benchmarkHelper.runBenchmark("Benchmark speech sequence handling.", benchmark, REGRESSION_METRICS, args)
+
+if __name__ == "__main__":
+	sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,58 @@
+# -*- coding: UTF-8 -*-
+#tests/unit/test_XMLFormatting.py
+#A part of NonVisual Desktop Access (NVDA)
+#This file is covered by the GNU General Public License.
+#See the file COPYING for more details.
+#Copyright (C) 2018 NV Access Limited
+
+"""Unit tests for the XMLFormatting module."""
+
+import unittest
+import textInfos
+from XMLFormatting import XMLTextParser
+
+XML = (u'<control role="8" _startOfNode="1"><text bold="1">caf\xe9 \U0001f600 </text>'
+	u'<text><unich value="9731"/> snow &amp; ice</text></control>')
+
+def describe(commands):
+	return [(command.command, command.field) if isinstance(command, textInfos.FieldCommand) else command
+		for command in commands]
+
+class TestXMLTextParser(unittest.TestCase):
+
+	def test_parse(self):
+		commands = XMLTextParser().parse(XML)
+		self.assertEqual(describe(commands), [
+			("controlStart", {"role": "8", "_startOfNode": True}),
+			("formatChange", {"bold": "1"}),
+			u"caf\xe9 \U0001f600 ",
+			("formatChange", {}),
+			u"☃ snow & ice",
+			("controlEnd", None),
+		])
+
+	def test_normalizeFields(self):
+		def normalizeControlField(field):
+			field["role"] = int(field["role"])
+			return field
+		parser = XMLTextParser(normalizeControlField=normalizeControlField,
+			normalizeFormatField=textInfos.internField)
+		commands = parser.parse(XML)
+		self.assertEqual(commands[0].field["role"], 8)
+		self.assertIsInstance(commands[1].field, textInfos.FrozenFormatField)
+
+	def test_iterParseInChunks(self):
+		expected = describe(XMLTextParser().parse(XML))
+		for chunkSize in (1, 2, 5, len(XML)):
+			parser = XMLTextParser()
+			parser.CHUNK_SIZE = chunkSize
+			self.assertEqual(describe(parser.iterParse(XML)), expected, msg="chunk size %d" % chunkSize)
+
+	def test_iterParseStopsEarly(self):
+		parser = XMLTextParser()
+		parser.CHUNK_SIZE = 10
+		commands = parser.iterParse(XML)
+		self.assertEqual(next(commands).command, "controlStart")
+		commands.close()
+		# The parser can be reused.
+		self.assertEqual(len(parser.parse(XML)), 6)
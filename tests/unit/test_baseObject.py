@@ -7,7 +7,9 @@
 """Unit tests for the baseObject module, its classes and their derivatives."""
 
 import unittest
-from baseObject import AutoPropertyObject, ScriptableObject
+import gc
+import weakref
+from baseObject import AutoPropertyObject, ScriptableObject, CACHE_UNTIL_INVALIDATED
 from objectProvider import PlaceholderNVDAObject
 from scriptHandler import script
 from abc import abstractmethod
@@ -170,3 +172,69 @@ class TestAutoClassProperties(unittest.TestCase):
 		cls = AutoPropertyObjectWithClassProperty
 		self.assertIsInstance(cls.x, bool)
 		self.assertIsInstance(cls().x, bool)
+
+class AutoPropertyObjectWithCachedProperties(AutoPropertyObject):
+
+	def __init__(self):
+		self.fetches = 0
+
+	_cache_pumpValue = True
+	def _get_pumpValue(self):
+		self.fetches += 1
+		return self.fetches
+
+	_cache_constantValue = CACHE_UNTIL_INVALIDATED
+	def _get_constantValue(self):
+		self.fetches += 1
+		return self.fetches
+
+	_cache_parent = True
+	def _get_parent(self):
+		parent = AutoPropertyObjectWithCachedProperties()
+		# Create a reference cycle, as between NVDAObjects and their cached parents and children.
+		parent.child = self
+		return parent
+
+class TestCachedProperties(unittest.TestCase):
+
+	def tearDown(self):
+		AutoPropertyObject.enableCacheStatistics(False)
+
+	def test_cachedUntilInvalidateCaches(self):
+		obj = AutoPropertyObjectWithCachedProperties()
+		self.assertEqual(obj.pumpValue, 1)
+		self.assertEqual(obj.pumpValue, 1)
+		AutoPropertyObject.invalidateCaches()
+		self.assertEqual(obj.pumpValue, 2)
+		self.assertEqual(obj.pumpValue, 2)
+
+	def test_cachedUntilInvalidated(self):
+		obj = AutoPropertyObjectWithCachedProperties()
+		self.assertEqual(obj.constantValue, 1)
+		AutoPropertyObject.invalidateCaches()
+		self.assertEqual(obj.constantValue, 1)
+		obj.invalidateCache()
+		self.assertEqual(obj.constantValue, 2)
+
+	def test_invalidateCachesReleasesValues(self):
+		obj = AutoPropertyObjectWithCachedProperties()
+		parentRef = weakref.ref(obj.parent)
+		obj.constantValue
+		gc.disable()
+		try:
+			AutoPropertyObject.invalidateCaches()
+			# The cycle is broken without the cyclic garbage collector.
+			self.assertIsNone(parentRef())
+		finally:
+			gc.enable()
+		self.assertEqual(obj.constantValue, 1)
+
+	def test_statistics(self):
+		self.assertIsNone(AutoPropertyObject.getCacheStatistics())
+		AutoPropertyObject.enableCacheStatistics()
+		obj = AutoPropertyObjectWithCachedProperties()
+		obj.pumpValue
+		obj.pumpValue
+		obj.constantValue
+		stats = AutoPropertyObject.getCacheStatistics()
+		self.assertEqual(stats["%s.AutoPropertyObjectWithCachedProperties" % __name__], {"hits": 1, "misses": 2})
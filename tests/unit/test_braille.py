@@ -124,3 +124,105 @@ class TestDisplayTextForGestureIdentifier(unittest.TestCase):
 			(u'No braille', 'noKey1+noKey2')
 		)
 
+
+class TestBrailleBufferPositions(unittest.TestCase):
+	"""Tests for the positions maintained by L{braille.BrailleBuffer.update}."""
+
+	def setUp(self):
+		self.buffer = braille.BrailleBuffer(braille.handler)
+		self.regions = [braille.TextRegion(text) for text in (u"abc ", u"", u"de ", u"fghij")]
+		for region in self.regions:
+			region.update()
+			self.buffer.regions.append(region)
+		self.buffer.update()
+
+	def assertPositionsMatchRegions(self):
+		start = rawStart = 0
+		rawToBraillePos = []
+		brailleToRawPos = []
+		for region, regionStart, regionEnd in self.buffer.regionsWithPositions:
+			self.assertEqual((regionStart, regionEnd), (start, start + len(region.brailleCells)))
+			rawToBraillePos.extend(pos + start for pos in region.rawToBraillePos)
+			brailleToRawPos.extend(pos + rawStart for pos in region.brailleToRawPos)
+			for pos in xrange(len(region.brailleCells)):
+				self.assertEqual(self.buffer.bufferPosToRegionPos(start + pos), (region, pos))
+				self.assertEqual(self.buffer.regionPosToBufferPos(region, pos), start + pos)
+			start = regionEnd
+			rawStart += len(region.rawText)
+		self.assertEqual(list(self.buffer.rawToBraillePos), rawToBraillePos)
+		self.assertEqual(list(self.buffer.brailleToRawPos), brailleToRawPos)
+		self.assertEqual(len(self.buffer.brailleCells), start)
+		self.assertRaises(LookupError, self.buffer.bufferPosToRegionPos, start)
+
+	def test_fullUpdate(self):
+		self.assertPositionsMatchRegions()
+
+	def test_regionUpdate(self):
+		region = self.regions[0]
+		region.rawText = u"a longer text "
+		region.update()
+		self.buffer.update(region)
+		self.assertEqual(self.buffer.rawText, u"a longer text de fghij")
+		self.assertPositionsMatchRegions()
+		region = self.regions[1]
+		region.rawText = u"x "
+		region.update()
+		self.buffer.update(region)
+		self.assertEqual(self.buffer.rawText, u"a longer text x de fghij")
+		self.assertPositionsMatchRegions()
+
+class RecordingDisplayDriver(braille.BrailleDisplayDriver):
+	"""A display driver which records the cells it is asked to display."""
+	name = "recording"
+	numCells = 10
+
+	def __init__(self):
+		super(RecordingDisplayDriver, self).__init__()
+		self.calls = []
+
+	def display(self, cells):
+		self.calls.append(list(cells))
+
+	def displayChanged(self, cells, start, end):
+		self.calls.append((list(cells), start, end))
+
+class TestCellDiffing(unittest.TestCase):
+	"""Tests that writes of unchanged cells are skipped and that drivers are given the changed range."""
+
+	def setUp(self):
+		self.driver = RecordingDisplayDriver()
+		self.cells = [0] * 10
+
+	def test_unchangedWriteSkipped(self):
+		self.assertTrue(self.driver._displayIfChanged(self.cells))
+		self.assertFalse(self.driver._displayIfChanged(list(self.cells)))
+		self.assertEqual(self.driver.calls, [self.cells])
+		self.assertEqual((self.driver._cellWrites, self.driver._skippedCellWrites), (1, 1))
+
+	def test_writtenCellsAreCopied(self):
+		self.driver._displayIfChanged(self.cells)
+		self.cells[3] = 1
+		self.assertTrue(self.driver._displayIfChanged(self.cells))
+
+	def test_changedRange(self):
+		self.driver.supportsPartialUpdates = True
+		self.driver._displayIfChanged(self.cells)
+		changed = list(self.cells)
+		changed[3] = changed[6] = 0xff
+		self.driver._displayIfChanged(changed)
+		self.assertEqual(self.driver.calls, [(self.cells, 0, 10), (changed, 3, 7)])
+		self.assertEqual(self.driver._changedCellsWritten, 14)
+
+	def test_redrawAfterInvalidateCells(self):
+		self.driver._displayIfChanged(self.cells)
+		self.driver.invalidateCells()
+		self.assertTrue(self.driver._displayIfChanged(list(self.cells)))
+		self.assertEqual(self.driver.calls, [self.cells, self.cells])
+
+	def test_failedWriteNotRemembered(self):
+		def fail(cells):
+			raise IOError
+		self.driver.display = fail
+		self.assertRaises(IOError, self.driver._displayIfChanged, self.cells)
+		del self.driver.display
+		self.assertTrue(self.driver._displayIfChanged(self.cells))
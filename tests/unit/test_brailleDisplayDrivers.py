@@ -9,6 +9,7 @@
 
 import unittest
 import braille
+import queueHandler
 
 class TestGestureMap(unittest.TestCase):
 	"""Tests the integrity of braille display driver gesture maps."""
@@ -23,3 +24,104 @@ class TestGestureMap(unittest.TestCase):
 			for cls, gesture, scriptName in gmap.getScriptsForAllGestures():
 				if gesture.startswith("br"):
 					self.assertRegexpMatches(gesture, braille.BrailleDisplayGesture.ID_PARTS_REGEX)
+
+class TestHandyTechCellBytes(unittest.TestCase):
+	"""Tests the byte strings which the handyTech driver builds from cells."""
+
+	def test_partialUpdates(self):
+		from brailleDisplayDrivers import handyTech
+		model = handyTech.Model.__new__(handyTech.Model)
+		cells = [0x01, 0x02, 0x03, 0x04]
+		self.assertEqual(model._getCellBytes(cells), b"\x01\x02\x03\x04")
+		cells[1] = 0xff
+		self.assertEqual(model._getCellBytes(cells, 1, 2), b"\x01\xff\x03\x04")
+		# A change in the number of cells rebuilds the buffer.
+		self.assertEqual(model._getCellBytes([0x05] * 2, 1, 2), b"\x05\x05")
+
+class TestEmulatedDisplays(unittest.TestCase):
+	"""Tests drivers against displays emulated from recordings."""
+
+	def test_gestures(self):
+		from brailleDisplayEmulator import RECORDINGS, emulatedDisplay
+		for recording in RECORDINGS:
+			with emulatedDisplay(recording) as (driver, emulator):
+				self.assertEqual(driver.numCells, recording.numCells, msg=recording.name)
+				for data, gestureId in recording.gestures:
+					del emulator.gestures[:]
+					emulator.sendGesture(data)
+					self.assertEqual([executedId for executedTime, executedId in emulator.gestures], [gestureId],
+						msg=recording.name)
+
+	def test_display(self):
+		from brailleDisplayEmulator import RECORDINGS, emulatedDisplay
+		for recording in RECORDINGS:
+			with emulatedDisplay(recording) as (driver, emulator):
+				cells = [pos & 0xff for pos in xrange(1, driver.numCells + 1)]
+				del emulator.written[:]
+				driver._displayIfChanged(cells)
+				self.assertIn(b"".join(chr(cell) for cell in cells), b"".join(emulator.written), msg=recording.name)
+				del emulator.written[:]
+				driver._displayIfChanged(list(cells))
+				self.assertEqual(emulator.written, [], msg=recording.name)
+
+	def test_packetsSplitAcrossReads(self):
+		from brailleDisplayEmulator import RECORDINGS, emulatedDisplay
+		recording = next(recording for recording in RECORDINGS if recording.driverName == "eurobraille")
+		data = b"".join(data for data, gestureId in recording.gestures)
+		with emulatedDisplay(recording) as (driver, emulator):
+			# Read in bulk, as the packets are framed by the driver.
+			self.assertGreater(emulator.transport._readSize, 1)
+			del emulator.gestures[:]
+			# Packets split at every position, preceded by a byte which isn't part of a packet.
+			emulator.sendGesture(b"\x03" + data[:3])
+			for index in xrange(3, len(data)):
+				emulator.sendGesture(data[index])
+			self.assertEqual([executedId for executedTime, executedId in emulator.gestures],
+				[gestureId for data, gestureId in recording.gestures])
+
+	def test_redrawAfterReset(self):
+		from brailleDisplayEmulator import RECORDINGS, emulatedDisplay, _ebPacket
+		# Packets with which displays report that they no longer show the cells written by NVDA.
+		resetPackets = {
+			# The display was reset.
+			"handyTech": b"\xfe\x74",
+			# The display returned from internal mode.
+			"eurobraille": _ebPacket(b"R", b"P"),
+		}
+		origDisplay = braille.handler.display
+		origUpdate = braille.handler.update
+		try:
+			for recording in RECORDINGS:
+				packet = resetPackets.get(recording.driverName)
+				if not packet:
+					continue
+				with emulatedDisplay(recording) as (driver, emulator):
+					cells = [pos & 0xff for pos in xrange(1, driver.numCells + 1)]
+					driver._displayIfChanged(cells)
+					del emulator.written[:]
+					braille.handler.display = driver
+					# The handler redraws the same content.
+					braille.handler.update = lambda: driver._displayIfChanged(list(cells))
+					emulator.sendGesture(packet)
+					# Drivers might queue the update to the main thread.
+					queueHandler.flushQueue(queueHandler.eventQueue)
+					self.assertIn(b"".join(chr(cell) for cell in cells), b"".join(emulator.written), msg=recording.name)
+		finally:
+			braille.handler.display = origDisplay
+			braille.handler.update = origUpdate
+
+	def test_benchmark(self):
+		from brailleDisplayEmulator import RECORDINGS, benchmark, REGRESSION_METRICS
+		results = benchmark(RECORDINGS[0], updates=20, gestureRepeats=2)
+		for metric in REGRESSION_METRICS:
+			self.assertIn(metric, results)
+		# Every fifth update is unchanged, so only 16 of the 20 updates are written,
+		# each as a Handy Tech extended packet of 5 bytes and 40 cells.
+		self.assertEqual(results["bytesPerUpdate"], 16 * 45 / 20.0)
+
+	def test_findRegressions(self):
+		from brailleDisplayEmulator import REGRESSION_METRICS
+		from benchmarkHelper import findRegressions
+		baseline = {"a": {"updateTime": 1.0, "bytesPerUpdate": 50.0, "bytesPerSecond": 100.0}}
+		self.assertEqual(findRegressions({"a": {"updateTime": 1.2, "bytesPerUpdate": 50.0, "bytesPerSecond": 10.0}}, baseline, REGRESSION_METRICS), [])
+		self.assertEqual(len(findRegressions({"a": {"updateTime": 2.0, "bytesPerUpdate": 50.0}, "b": {"updateTime": 9.0}}, baseline, REGRESSION_METRICS)), 1)
@@ -0,0 +1,240 @@
+# -*- coding: UTF-8 -*-
+#tests/unit/test_characterProcessing.py
+#A part of NonVisual Desktop Access (NVDA)
+#This file is covered by the GNU General Public License.
+#See the file COPYING for more details.
+#Copyright (C) 2018 NV Access Limited
+
+"""Unit tests for the characterProcessing module."""
+
+import unittest
+import os
+import random
+import shutil
+import tempfile
+import threading
+import cPickle
+import globalVars
+import config
+import characterProcessing
+from characterProcessing import SpeechSymbolProcessor, SPEECH_SYMBOL_LEVELS
+
+def getSymbolLocales():
+	return sorted(locale for locale in os.listdir("locale")
+		if os.path.isfile(os.path.join("locale", locale, "symbols.dic")))
+
+class TestSymbolTranslationFastPath(unittest.TestCase):
+	"""Tests that processing text with translation tables for single character symbols
+	gives the same result as processing it with the full regular expression,
+	for the symbols of every shipped locale.
+	"""
+
+	def setUp(self):
+		# Don't persist symbol tables into the unit test directory.
+		self._saveSymbolTable = characterProcessing._saveSymbolTable
+		characterProcessing._saveSymbolTable = lambda *args: None
+
+	def tearDown(self):
+		characterProcessing._saveSymbolTable = self._saveSymbolTable
+
+	def makeTexts(self, processor):
+		identifiers = [identifier for identifier in processor.computedSymbols
+			if not processor.computedSymbols[identifier].pattern]
+		rand = random.Random(processor.locale)
+		pieces = identifiers + [u"word", u"Word", u"12", u"3.5", u" ", u"  ", u"\t", u"-", u".", u"'"]
+		texts = [u"".join(identifiers), u" ".join(identifiers), u"a sentence. Another! 1.5 -3 it's  "]
+		for identifier in identifiers:
+			texts.append(u"x%sy" % (identifier * 5))
+		for i in xrange(100):
+			texts.append(u"".join(rand.choice(pieces) for j in xrange(rand.randint(1, 15))))
+		return texts
+
+	def test_allLocales(self):
+		for locale in getSymbolLocales():
+			processor = SpeechSymbolProcessor(locale)
+			for text in self.makeTexts(processor):
+				for level in SPEECH_SYMBOL_LEVELS:
+					processor._level = level
+					expected = processor._regexp.sub(processor._regexpRepl, text)
+					self.assertEqual(processor.processText(text, level), expected,
+						msg="locale %s, level %d: %r" % (locale, level, text))
+
+	def test_nonUnicodeText(self):
+		processor = SpeechSymbolProcessor("en")
+		self.assertEqual(processor.processText("a+b", characterProcessing.SYMLVL_ALL), u"a plus b")
+
+class TestProcessedTextCache(unittest.TestCase):
+	"""Tests the cache of results of L{characterProcessing.processSpeechSymbols}."""
+
+	def setUp(self):
+		self._saveSymbolTable = characterProcessing._saveSymbolTable
+		characterProcessing._saveSymbolTable = lambda *args: None
+		self._processSpeechSymbols = characterProcessing._processSpeechSymbols
+		self.processed = []
+		def processSpeechSymbols(locale, text, level):
+			self.processed.append((locale, level, text))
+			return self._processSpeechSymbols(locale, text, level)
+		characterProcessing._processSpeechSymbols = processSpeechSymbols
+		characterProcessing._processedTextCache.clear()
+		characterProcessing._processedTextCache.resetStatistics()
+
+	def tearDown(self):
+		characterProcessing._saveSymbolTable = self._saveSymbolTable
+		characterProcessing._processSpeechSymbols = self._processSpeechSymbols
+		characterProcessing._processedTextCache.clear()
+
+	def process(self, text, level=characterProcessing.SYMLVL_ALL):
+		return characterProcessing.processSpeechSymbols("en", text, level)
+
+	def test_repeatedTextCached(self):
+		self.assertEqual(self.process(u"a+b"), u"a plus b")
+		self.assertEqual(self.process(u"a+b"), u"a plus b")
+		self.assertEqual(self.processed, [("en", characterProcessing.SYMLVL_ALL, u"a+b")])
+		statistics = characterProcessing.getProcessedTextCacheStatistics()
+		self.assertEqual((statistics["hits"], statistics["misses"], statistics["size"]), (1, 1, 1))
+		# The level is part of the key.
+		self.process(u"a+b", characterProcessing.SYMLVL_NONE)
+		self.assertEqual(len(self.processed), 2)
+
+	def assertCleared(self, clear):
+		self.process(u"a+b")
+		clear()
+		self.assertEqual(characterProcessing.getProcessedTextCacheStatistics()["size"], 0)
+		self.assertEqual(self.process(u"a+b"), u"a plus b")
+		self.assertEqual(len(self.processed), 2)
+
+	def test_clearedWhenLocaleInvalidated(self):
+		self.assertCleared(lambda: characterProcessing._localeSpeechSymbolProcessors.invalidateLocaleData("en"))
+
+	def test_clearedWhenAllDataInvalidated(self):
+		self.assertCleared(characterProcessing._localeSpeechSymbolProcessors.invalidateAllData)
+
+	def test_clearedOnConfigProfileSwitch(self):
+		self.assertCleared(characterProcessing.handlePostConfigProfileSwitch)
+
+class TestSymbolTablePersistence(unittest.TestCase):
+	"""Tests the symbol tables persisted in the configuration directory."""
+
+	def setUp(self):
+		self._configPath = globalVars.appArgs.configPath
+		self._secure = globalVars.appArgs.secure
+		self.configPath = globalVars.appArgs.configPath = unicode(tempfile.mkdtemp())
+		# Drop symbols loaded from the previous configuration directory.
+		characterProcessing.clearSpeechSymbols()
+		self.includeCLDR = config.conf["speech"]["includeCLDR"]
+		self.key = characterProcessing._getSymbolTableKey("en", self.includeCLDR)
+
+	def tearDown(self):
+		globalVars.appArgs.configPath = self._configPath
+		globalVars.appArgs.secure = self._secure
+		characterProcessing.clearSpeechSymbols()
+		shutil.rmtree(self.configPath)
+
+	def writeUserSymbols(self, text):
+		with open(os.path.join(self.configPath, "symbols-en.dic"), "wb") as f:
+			f.write(text)
+		characterProcessing.clearSpeechSymbols()
+
+	def loadTable(self):
+		return characterProcessing._loadSymbolTable("en", self.includeCLDR,
+			characterProcessing._getSymbolTableKey("en", self.includeCLDR))
+
+	def getTableFileName(self):
+		return characterProcessing._getSymbolTableFileName("en", self.includeCLDR)
+
+	def test_keyChangesWithSourceFiles(self):
+		self.writeUserSymbols(b"symbols:\r\n")
+		added = characterProcessing._getSymbolTableKey("en", self.includeCLDR)
+		self.assertNotEqual(added, self.key)
+		self.writeUserSymbols(b"symbols:\r\n+\tpositive\tall\r\n")
+		self.assertNotEqual(characterProcessing._getSymbolTableKey("en", self.includeCLDR), added)
+
+	def test_tableReused(self):
+		processor = SpeechSymbolProcessor("en")
+		table = self.loadTable()
+		self.assertIsNotNone(table)
+		self.assertEqual([fields[0] for fields in table["symbols"]], list(processor.computedSymbols))
+		buildSymbolTable = characterProcessing._buildSymbolTable
+		characterProcessing._buildSymbolTable = None
+		try:
+			self.assertEqual(SpeechSymbolProcessor("en").computedSymbols.keys(), processor.computedSymbols.keys())
+		finally:
+			characterProcessing._buildSymbolTable = buildSymbolTable
+
+	def test_corruptTableRebuilt(self):
+		fileName = self.getTableFileName()
+		os.makedirs(os.path.dirname(fileName))
+		with open(fileName, "wb") as f:
+			f.write(b"not a pickle")
+		self.assertIsNone(self.loadTable())
+		processor = SpeechSymbolProcessor("en")
+		self.assertEqual(processor.processText(u"a+b", characterProcessing.SYMLVL_ALL), u"a plus b")
+		self.assertIsNotNone(self.loadTable())
+
+	def test_unexpectedTableIgnored(self):
+		fileName = self.getTableFileName()
+		os.makedirs(os.path.dirname(fileName))
+		with open(fileName, "wb") as f:
+			cPickle.dump([self.key], f, cPickle.HIGHEST_PROTOCOL)
+		self.assertIsNone(self.loadTable())
+
+	def test_staleTableIgnored(self):
+		SpeechSymbolProcessor("en")
+		self.assertIsNotNone(self.loadTable())
+		self.writeUserSymbols(b"symbols:\r\n+\tpositive\tall\r\n")
+		self.assertIsNone(self.loadTable())
+		processor = SpeechSymbolProcessor("en")
+		self.assertEqual(processor.processText(u"a+b", characterProcessing.SYMLVL_ALL), u"a positive b")
+
+	def test_editingSymbolsDiscardsTable(self):
+		characterProcessing._localeSpeechSymbolProcessors.fetchLocaleData("en")
+		fileName = self.getTableFileName()
+		self.assertTrue(os.path.isfile(fileName))
+		# The symbols dialog does this after the user edits symbols.
+		characterProcessing._localeSpeechSymbolProcessors.invalidateLocaleData("en")
+		self.assertFalse(os.path.isfile(fileName))
+
+	def test_notPersistedWhenSecure(self):
+		SpeechSymbolProcessor("en")
+		globalVars.appArgs.secure = True
+		# Tables persisted earlier aren't loaded.
+		self.assertIsNone(self.loadTable())
+		characterProcessing._discardSymbolTables("en")
+		self.assertTrue(os.path.isfile(self.getTableFileName()))
+		shutil.rmtree(os.path.join(self.configPath, "symbolTables"))
+		SpeechSymbolProcessor("en")
+		self.assertFalse(os.path.exists(os.path.join(self.configPath, "symbolTables")))
+
+	def test_warmUpConcurrentWithLoad(self):
+		buildSymbolTable = characterProcessing._buildSymbolTable
+		warmUpBuilding = threading.Event()
+		continueWarmUp = threading.Event()
+		def buildInWarmUp(locale, sources):
+			if threading.current_thread() is not mainThread:
+				warmUpBuilding.set()
+				continueWarmUp.wait(10)
+			return buildSymbolTable(locale, sources)
+		mainThread = threading.current_thread()
+		characterProcessing._buildSymbolTable = buildInWarmUp
+		try:
+			warmUp = threading.Thread(target=characterProcessing._warmUpSymbolTables, args=(["en"], self.includeCLDR))
+			warmUp.start()
+			self.assertTrue(warmUpBuilding.wait(10))
+			# The main thread doesn't wait for the warm up, which is still building the same table.
+			processor = SpeechSymbolProcessor("en")
+			continueWarmUp.set()
+			warmUp.join(10)
+			self.assertFalse(warmUp.is_alive())
+		finally:
+			continueWarmUp.set()
+			characterProcessing._buildSymbolTable = buildSymbolTable
+		table = self.loadTable()
+		self.assertEqual([fields[0] for fields in table["symbols"]], list(processor.computedSymbols))
+		self.assertEqual(SpeechSymbolProcessor("en").processText(u"a+b", characterProcessing.SYMLVL_ALL), u"a plus b")
+
+	def test_warmUpCompilesPattern(self):
+		characterProcessing._warmUpSymbolTables(["en"], self.includeCLDR)
+		pattern = self.loadTable()["pattern"]
+		compiled = characterProcessing._compiledSymbolPatterns[pattern]
+		self.assertIs(SpeechSymbolProcessor("en")._regexp, compiled)
+		self.assertNotIn(pattern, characterProcessing._compiledSymbolPatterns)
@@ -0,0 +1,56 @@
+#tests/unit/test_config.py
+#A part of NonVisual Desktop Access (NVDA)
+#This file is covered by the GNU General Public License.
+#See the file COPYING for more details.
+#Copyright (C) 2018 NV Access Limited
+
+"""Unit tests for the config module."""
+
+import unittest
+import config
+
+class TestConfigCaches(unittest.TestCase):
+
+	def setUp(self):
+		self.rate = config.conf["speech"]["rate"]
+		self.reportFontName = config.conf["documentFormatting"]["reportFontName"]
+
+	def tearDown(self):
+		config.conf["speech"]["rate"] = self.rate
+		config.conf["documentFormatting"]["reportFontName"] = self.reportFontName
+
+	def test_getValue(self):
+		self.assertEqual(config.conf.getValue(("speech", "rate")), config.conf["speech"]["rate"])
+		self.assertIs(config.conf.getValue(("speech",)), config.conf.getValue(("speech",)))
+		with self.assertRaises(KeyError):
+			config.conf.getValue(("speech", "noSuchSetting"))
+
+	def test_getValueAfterWrite(self):
+		generation = config.conf.generation
+		config.conf.getValue(("speech", "rate"))
+		config.conf["speech"]["rate"] = self.rate + 1
+		self.assertGreater(config.conf.generation, generation)
+		self.assertEqual(config.conf.getValue(("speech", "rate")), self.rate + 1)
+
+	def test_snapshot(self):
+		section = config.conf["documentFormatting"]
+		snapshot = section.snapshot()
+		self.assertEqual(snapshot, section.copy())
+		self.assertIs(section.snapshot(), snapshot)
+		with self.assertRaises(TypeError):
+			snapshot["reportFontName"] = True
+		copy = snapshot.copy()
+		copy["reportFontName"] = not self.reportFontName
+		self.assertEqual(snapshot["reportFontName"], self.reportFontName)
+
+	def test_snapshotAfterWrite(self):
+		section = config.conf["documentFormatting"]
+		snapshot = section.snapshot()
+		section["reportFontName"] = not self.reportFontName
+		self.assertEqual(snapshot["reportFontName"], self.reportFontName)
+		self.assertEqual(section.snapshot()["reportFontName"], not self.reportFontName)
+
+	def test_nestedSnapshot(self):
+		snapshot = config.conf.rootSection.snapshot()
+		self.assertIsInstance(snapshot["speech"], config.SectionSnapshot)
+		self.assertEqual(snapshot["speech"]["rate"], self.rate)
@@ -0,0 +1,157 @@
+#tests/unit/test_eventHandler.py
+#A part of NonVisual Desktop Access (NVDA)
+#This file is covered by the GNU General Public License.
+#See the file COPYING for more details.
+#Copyright (C) 2018 NV Access Limited
+
+"""Unit tests for the eventHandler module."""
+
+import unittest
+import queueHandler
+import eventHandler
+import globalPluginHandler
+
+class FakeObject(object):
+	appModule = None
+	eventCoalescingKey = None
+
+class FakeObjectWithKey(FakeObject):
+	"""An object which is equal to other instances created for the same key,
+	as when an API creates a new object for every event.
+	"""
+
+	def __init__(self, key):
+		self.eventCoalescingKey = key
+
+	def __eq__(self, other):
+		return isinstance(other, FakeObjectWithKey) and other.eventCoalescingKey == self.eventCoalescingKey
+
+	def __ne__(self, other):
+		return not self == other
+
+class TestEventQueue(unittest.TestCase):
+
+	def setUp(self):
+		self.executed = []
+		self._executeEvent = eventHandler.executeEvent
+		eventHandler.executeEvent = lambda eventName, obj, **kwargs: self.executed.append((eventName, obj))
+		self._deferrableTimeBudget = queueHandler.deferrableTimeBudget
+		eventHandler.resetEventStatistics()
+
+	def tearDown(self):
+		eventHandler.executeEvent = self._executeEvent
+		queueHandler.deferrableTimeBudget = self._deferrableTimeBudget
+		eventHandler.lastQueuedFocusObject = None
+
+	def test_coalescedEvents(self):
+		first, second = FakeObject(), FakeObject()
+		eventHandler.queueEvent("nameChange", first)
+		eventHandler.queueEvent("nameChange", second)
+		eventHandler.queueEvent("gainFocus", second)
+		eventHandler.queueEvent("nameChange", first)
+		eventHandler.queueEvent("liveRegionChange", first)
+		eventHandler.queueEvent("liveRegionChange", first)
+		self.assertTrue(eventHandler.isPendingEvents("nameChange", first))
+		queueHandler.flushQueue(queueHandler.eventQueue)
+		self.assertEqual(self.executed, [
+			("nameChange", second), ("gainFocus", second), ("nameChange", first),
+			("liveRegionChange", first), ("liveRegionChange", first),
+		])
+		self.assertFalse(eventHandler.isPendingEvents())
+		self.assertEqual(eventHandler.getEventStatistics(), {None: {"merged": 1, "deferred": 0}})
+
+	def test_equalObjectsCoalesced(self):
+		first, second, other = FakeObjectWithKey(1), FakeObjectWithKey(1), FakeObjectWithKey(2)
+		self.assertIsNot(first, second)
+		eventHandler.queueEvent("nameChange", first)
+		eventHandler.queueEvent("nameChange", other)
+		eventHandler.queueEvent("nameChange", second)
+		queueHandler.flushQueue(queueHandler.eventQueue)
+		self.assertEqual(self.executed, [("nameChange", other), ("nameChange", second)])
+		self.assertIs(self.executed[-1][1], second)
+		self.assertFalse(eventHandler.isPendingEvents())
+		self.assertEqual(eventHandler.getEventStatistics(), {None: {"merged": 1, "deferred": 0}})
+
+	def test_eventsWithArgumentsNotCoalesced(self):
+		obj = FakeObject()
+		eventHandler.queueEvent("valueChange", obj, value=1)
+		eventHandler.queueEvent("valueChange", obj, value=2)
+		queueHandler.flushQueue(queueHandler.eventQueue)
+		self.assertEqual(len(self.executed), 2)
+
+	def test_backgroundEventsDeferred(self):
+		focus, background = FakeObject(), FakeObject()
+		eventHandler.queueEvent("gainFocus", focus)
+		queueHandler.flushQueue(queueHandler.eventQueue)
+		del self.executed[:]
+		queueHandler.deferrableTimeBudget = -1
+		eventHandler.queueEvent("valueChange", background)
+		eventHandler.queueEvent("valueChange", focus)
+		eventHandler.queueEvent("caret", focus)
+		queueHandler.flushQueue(queueHandler.eventQueue)
+		self.assertEqual(self.executed, [("valueChange", focus), ("caret", focus)])
+		self.assertTrue(queueHandler.isPendingItems(queueHandler.eventQueue))
+		self.assertTrue(eventHandler.isPendingEvents("valueChange", background))
+		queueHandler.deferrableTimeBudget = self._deferrableTimeBudget
+		queueHandler.flushQueue(queueHandler.eventQueue)
+		self.assertEqual(self.executed[-1], ("valueChange", background))
+		self.assertFalse(queueHandler.isPendingItems(queueHandler.eventQueue))
+		self.assertEqual(eventHandler.getEventStatistics(), {None: {"merged": 0, "deferred": 1}})
+
+class FakeHandler(object):
+
+	def __init__(self, name, calls):
+		self.name = name
+		self.calls = calls
+
+	def event_nameChange(self, obj, nextHandler):
+		self.calls.append(self.name)
+		nextHandler()
+
+class FakeObjectWithHandler(FakeObject):
+	treeInterceptor = None
+
+	def __init__(self, calls):
+		self.calls = calls
+
+	def event_nameChange(self):
+		self.calls.append("obj")
+
+class TestEventExecuter(unittest.TestCase):
+
+	def setUp(self):
+		self.calls = []
+		self._runningPlugins = set(globalPluginHandler.runningPlugins)
+		globalPluginHandler.runningPlugins.clear()
+		globalPluginHandler.runningPlugins.add(FakeHandler("plugin", self.calls))
+		eventHandler.invalidateHandlerCaches()
+
+	def tearDown(self):
+		globalPluginHandler.runningPlugins.clear()
+		globalPluginHandler.runningPlugins.update(self._runningPlugins)
+		eventHandler.invalidateHandlerCaches()
+
+	def test_handlerChain(self):
+		obj = FakeObjectWithHandler(self.calls)
+		obj.appModule = FakeHandler("app", self.calls)
+		for i in range(2):
+			eventHandler._EventExecuter("nameChange", obj, {})
+		self.assertEqual(self.calls, ["plugin", "app", "obj"] * 2)
+		del self.calls[:]
+		eventHandler._EventExecuter("valueChange", obj, {})
+		self.assertEqual(self.calls, [])
+
+	def test_instanceHandler(self):
+		obj = FakeObjectWithHandler(self.calls)
+		eventHandler._EventExecuter("valueChange", obj, {})
+		obj.event_valueChange = lambda: self.calls.append("valueChange")
+		eventHandler._EventExecuter("valueChange", obj, {})
+		self.assertEqual(self.calls, ["valueChange"])
+
+	def test_pluginsChanged(self):
+		obj = FakeObjectWithHandler(self.calls)
+		eventHandler._EventExecuter("nameChange", obj, {})
+		globalPluginHandler.runningPlugins.clear()
+		eventHandler.invalidateHandlerCaches()
+		eventHandler._EventExecuter("nameChange", obj, {})
+		self.assertEqual(self.calls, ["plugin", "obj", "obj"])
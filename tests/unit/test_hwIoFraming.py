@@ -0,0 +1,104 @@
+#tests/unit/test_hwIoFraming.py
+#A part of NonVisual Desktop Access (NVDA)
+#This file is covered by the GNU General Public License.
+#See the file COPYING for more details.
+#Copyright (C) 2018 NV Access Limited
+
+"""Unit tests for the hwIoFraming module."""
+
+import unittest
+import hwIoFraming
+from hwIoFraming import FramedReader, FixedSizeFramer, LengthPrefixedFramer, DelimitedFramer, FirstByteFramer, Loopback
+
+STX = b"\x02"
+ETX = b"\x03"
+ACK = b"\x06"
+
+def makeEurobraillePacket(data):
+	# The length includes the two bytes of the length itself.
+	return STX + chr((len(data) + 2) >> 8) + chr((len(data) + 2) & 0xff) + data + ETX
+
+class TestFramedReader(unittest.TestCase):
+
+	def setUp(self):
+		self.batches = []
+
+	def makeReader(self, framer):
+		return FramedReader(framer, self.batches.append)
+
+	def test_fixedSizeBatched(self):
+		reader = self.makeReader(FixedSizeFramer(2))
+		reader.feed(b"abcde")
+		reader.feed(b"f")
+		self.assertEqual(self.batches, [[b"ab", b"cd"], [b"ef"]])
+		self.assertEqual((reader.packets, reader.batches), (3, 2))
+
+	def test_lengthPrefixedSplitAcrossChunks(self):
+		reader = self.makeReader(LengthPrefixedFramer(1, lengthSize=2, extraLength=-1, startByte=STX))
+		data = makeEurobraillePacket(b"SI") + makeEurobraillePacket(b"KT\x01")
+		for byte in data:
+			reader.feed(byte)
+		self.assertEqual(self.batches, [[makeEurobraillePacket(b"SI")], [makeEurobraillePacket(b"KT\x01")]])
+
+	def test_lengthPrefixedResynchronises(self):
+		reader = self.makeReader(LengthPrefixedFramer(1, lengthSize=2, extraLength=-1, startByte=STX))
+		reader.feed(b"junk" + makeEurobraillePacket(b"SI") + b"x")
+		self.assertEqual(self.batches, [[makeEurobraillePacket(b"SI")]])
+		self.assertEqual(reader.bytesDiscarded, 5)
+
+	def test_delimitedWithEscape(self):
+		reader = self.makeReader(DelimitedFramer(b"\n", escape=b"\\"))
+		reader.feed(b"ab\ncd\\\nef\\")
+		self.assertEqual(self.batches, [[b"ab"]])
+		reader.feed(b"\\\n")
+		self.assertEqual(self.batches, [[b"ab"], [b"cd\nef\\"]])
+
+	def test_firstByte(self):
+		reader = self.makeReader(FirstByteFramer({
+			ACK: FixedSizeFramer(2),
+			STX: LengthPrefixedFramer(1, lengthSize=2, extraLength=-1),
+		}))
+		reader.feed(ACK + b"\x20\xff" + makeEurobraillePacket(b"SI") + ACK)
+		self.assertEqual(self.batches, [[ACK + b"\x20", makeEurobraillePacket(b"SI")]])
+		reader.feed(b"\x21")
+		self.assertEqual(self.batches[-1], [ACK + b"\x21"])
+
+	def test_bufferLimit(self):
+		reader = self.makeReader(DelimitedFramer(b"\n"))
+		reader.maxBufferSize = 4
+		reader.feed(b"abcdef")
+		reader.feed(b"g\n")
+		self.assertEqual(self.batches, [[b"g"]])
+
+class TestLoopback(unittest.TestCase):
+
+	def test_synchronousReads(self):
+		packets = []
+		def onReceive(data):
+			# Read the rest of the packet synchronously, as many drivers do.
+			self.assertEqual(data, STX)
+			length = ord(dev.read(2)[1]) - 2
+			packets.append(dev.read(length))
+			self.assertEqual(dev.read(1), ETX)
+		dev = Loopback(onReceive)
+		dev.receive(makeEurobraillePacket(b"SI") + makeEurobraillePacket(b"KT"))
+		self.assertTrue(dev.waitForRead(0.1))
+		self.assertEqual(packets, [b"SI", b"KT"])
+		self.assertFalse(dev.waitForRead(0.1))
+
+	def test_bulkReads(self):
+		batches = []
+		reader = FramedReader(FixedSizeFramer(2), batches.append)
+		dev = Loopback(reader.feed, onReceiveSize=64)
+		dev.receive(b"abcdef")
+		dev.dispatch()
+		self.assertEqual(batches, [[b"ab", b"cd", b"ef"]])
+
+	def test_writes(self):
+		written = []
+		dev = Loopback(None, onWrite=written.append)
+		dev.write(b"abc")
+		dev.write(b"de")
+		self.assertEqual(written, [b"abc", b"de"])
+		stats = dev.getWriteStatistics()
+		self.assertEqual((stats["writes"], stats["bytes"]), (2, 5))
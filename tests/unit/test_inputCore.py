@@ -0,0 +1,58 @@
+#tests/unit/test_inputCore.py
+#A part of NonVisual Desktop Access (NVDA)
+#This file is covered by the GNU General Public License.
+#See the file COPYING for more details.
+#Copyright (C) 2018 NV Access Limited
+
+"""Unit tests for the inputCore module."""
+
+import unittest
+import sys
+import types
+import inputCore
+
+MODULE_NAME = "_testInputCoreModule"
+
+def makeModule():
+	module = types.ModuleType(MODULE_NAME)
+	module.Cls = type("Cls", (object,), {})
+	return module
+
+class TestGlobalGestureMap(unittest.TestCase):
+
+	def setUp(self):
+		self.gestureMap = inputCore.GlobalGestureMap({
+			"inputCore.InputManager": {"foo": "kb:a", "None": "kb:b"},
+			MODULE_NAME + ".Cls": {"bar": "kb:a"},
+		})
+
+	def tearDown(self):
+		sys.modules.pop(MODULE_NAME, None)
+
+	def test_getScriptsForGesture(self):
+		self.assertEqual(self.gestureMap.getScriptsForGesture("kb:a"), ((inputCore.InputManager, "foo"),))
+		self.assertEqual(self.gestureMap.getScriptsForGesture("kb:b"), ((inputCore.InputManager, None),))
+		self.assertEqual(self.gestureMap.getScriptsForGesture("kb:c"), ())
+
+	def test_moduleImportedLater(self):
+		self.gestureMap.getScriptsForGesture("kb:a")
+		module = sys.modules[MODULE_NAME] = makeModule()
+		self.assertIn((module.Cls, "bar"), self.gestureMap.getScriptsForGesture("kb:a"))
+		# Reloading a module replaces its classes.
+		module = sys.modules[MODULE_NAME] = makeModule()
+		self.assertIn((module.Cls, "bar"), self.gestureMap.getScriptsForGesture("kb:a"))
+
+	def test_mapChanged(self):
+		self.gestureMap.getScriptsForGesture("kb:a")
+		self.gestureMap.add("kb:a", "inputCore", "InputManager", "baz")
+		self.assertEqual(len(self.gestureMap.getScriptsForGesture("kb:a")), 2)
+		self.gestureMap.remove("kb:a", "inputCore", "InputManager", "foo")
+		self.assertEqual(self.gestureMap.getScriptsForGesture("kb:a"), ((inputCore.InputManager, "baz"),))
+		self.gestureMap.clear()
+		self.assertEqual(self.gestureMap.getScriptsForGesture("kb:a"), ())
+
+class TestNormalizeGestureIdentifier(unittest.TestCase):
+
+	def test_normalize(self):
+		for i in range(2):
+			self.assertEqual(inputCore.normalizeGestureIdentifier("kb:shift+alt+downArrow"), u"kb:alt+downarrow+shift")
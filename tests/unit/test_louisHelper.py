@@ -0,0 +1,53 @@
+#tests/unit/test_louisHelper.py
+#A part of NonVisual Desktop Access (NVDA)
+#This file is covered by the GNU General Public License.
+#See the file COPYING for more details.
+#Copyright (C) 2018 NV Access Limited
+
+"""Unit tests for the louisHelper module."""
+
+import unittest
+import os
+import louis
+import louisHelper
+import brailleTables
+
+TABLES = [os.path.join(brailleTables.TABLES_DIR, "en-ueb-g2.ctb"), "braille-patterns.cti"]
+TEXT = u"the quick brown fox"
+
+class TestTranslationCache(unittest.TestCase):
+
+	def setUp(self):
+		louisHelper.flushTranslationCache()
+
+	def test_cachedEqualsUncached(self):
+		for cursorPos in (None, 0, 5, len(TEXT)):
+			for mode in (louis.dotsIO, louis.dotsIO | louis.compbrlAtCursor):
+				expected = louisHelper._translate(TABLES, TEXT, None, cursorPos, mode)
+				louisHelper.translate(TABLES, TEXT, cursorPos=cursorPos, mode=mode)
+				self.assertEqual(louisHelper.translate(TABLES, TEXT, cursorPos=cursorPos, mode=mode), expected)
+
+	def test_cursorMovesWithinText(self):
+		louisHelper.translate(TABLES, TEXT, cursorPos=0, mode=louis.dotsIO)
+		hits = louisHelper.getTranslationCacheStatistics()["hits"]
+		for cursorPos in xrange(len(TEXT)):
+			expected = louisHelper._translate(TABLES, TEXT, None, cursorPos, louis.dotsIO)
+			self.assertEqual(louisHelper.translate(TABLES, TEXT, cursorPos=cursorPos, mode=louis.dotsIO), expected)
+		self.assertEqual(louisHelper.getTranslationCacheStatistics()["hits"], hits + len(TEXT))
+
+	def test_cursorWithIndicators(self):
+		# Capital and number indicators add cells before the characters they apply to,
+		# so the braille cursor position must still match liblouis for every character.
+		text = u"The QUICK fox 123 jumps 4.5 M"
+		for mode in (louis.dotsIO, louis.dotsIO | louis.compbrlAtCursor):
+			louisHelper.flushTranslationCache()
+			louisHelper.translate(TABLES, text, cursorPos=0, mode=mode)
+			for cursorPos in xrange(len(text) + 1):
+				expected = louisHelper._translate(TABLES, text, None, cursorPos, mode)
+				self.assertEqual(louisHelper.translate(TABLES, text, cursorPos=cursorPos, mode=mode), expected,
+					msg="mode %d, cursor %d" % (mode, cursorPos))
+
+	def test_resultsAreCopies(self):
+		cells = louisHelper.translate(TABLES, TEXT)[0]
+		cells[0] = 255
+		self.assertNotEqual(louisHelper.translate(TABLES, TEXT)[0][0], 255)
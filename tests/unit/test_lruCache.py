@@ -0,0 +1,36 @@
+#tests/unit/test_lruCache.py
+#A part of NonVisual Desktop Access (NVDA)
+#This file is covered by the GNU General Public License.
+#See the file COPYING for more details.
+#Copyright (C) 2018 NV Access Limited
+
+"""Unit tests for the lruCache module."""
+
+import unittest
+from lruCache import LRUCache
+
+class TestLRUCache(unittest.TestCase):
+
+	def test_evictsLeastRecentlyUsed(self):
+		cache = LRUCache(maxSize=2)
+		cache["a"] = 1
+		cache["b"] = 2
+		self.assertEqual(cache.get("a"), 1)
+		cache["c"] = 3
+		self.assertNotIn("b", cache)
+		self.assertIn("a", cache)
+		self.assertIn("c", cache)
+		self.assertEqual(len(cache), 2)
+
+	def test_statistics(self):
+		cache = LRUCache(maxSize=10)
+		cache["a"] = 1
+		cache.get("a")
+		cache.get("b")
+		cache.get("b", 0)
+		self.assertEqual(cache.getStatistics(), {"hits": 1, "misses": 2, "size": 1, "maxSize": 10})
+		cache.clear()
+		self.assertEqual(len(cache), 0)
+		self.assertEqual(cache.hits, 1)
+		cache.resetStatistics()
+		self.assertEqual((cache.hits, cache.misses), (0, 0))
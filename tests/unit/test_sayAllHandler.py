@@ -0,0 +1,109 @@
+#tests/unit/test_sayAllHandler.py
+#A part of NonVisual Desktop Access (NVDA)
+#This file is covered by the GNU General Public License.
+#See the file COPYING for more details.
+#Copyright (C) 2018 NV Access Limited
+
+"""Unit tests for the sayAllHandler module."""
+
+import unittest
+import config
+import api
+import speech
+import textInfos
+import sayAllHandler
+from .textProvider import BasicTextProvider
+
+class FakeProfileTrigger(object):
+
+	def __enter__(self):
+		pass
+
+	def __exit__(self, excType, excVal, traceback):
+		pass
+
+class TestReadAhead(unittest.TestCase):
+	"""Tests reading text with speech prepared ahead of time; i.e. with the sayAllReadAhead setting."""
+
+	READ_AHEAD = 5
+
+	def setUp(self):
+		self.fetched = []
+		self.spoken = []
+		self.reviewPositions = []
+		#: The index the fake synth reports as last spoken.
+		self.lastSpeechIndex = None
+		self._orig = {name: getattr(speech, name) for name in
+			("speakTextInfo", "prepareSpeech", "speakPreparedSpeech", "speak", "getLastSpeechIndex")}
+		speech.speakTextInfo = self.speakTextInfo
+		speech.prepareSpeech = lambda speechSequence, symbolLevel=None: list(speechSequence)
+		speech.speakPreparedSpeech = self.speakPreparedSpeech
+		speech.speak = self.speak
+		speech.getLastSpeechIndex = lambda: self.lastSpeechIndex
+		self._getReviewPosition = api.getReviewPosition
+		self._setReviewPosition = api.setReviewPosition
+		api.setReviewPosition = lambda info, isCaret=False: self.reviewPositions.append(info.bookmark.startOffset)
+		self._SayAllProfileTrigger = sayAllHandler.SayAllProfileTrigger
+		sayAllHandler.SayAllProfileTrigger = FakeProfileTrigger
+		self._readAhead = config.conf["speech"]["sayAllReadAhead"]
+		config.conf["speech"]["sayAllReadAhead"] = self.READ_AHEAD
+
+	def tearDown(self):
+		for name, func in self._orig.iteritems():
+			setattr(speech, name, func)
+		api.getReviewPosition = self._getReviewPosition
+		api.setReviewPosition = self._setReviewPosition
+		sayAllHandler.SayAllProfileTrigger = self._SayAllProfileTrigger
+		config.conf["speech"]["sayAllReadAhead"] = self._readAhead
+
+	def speakTextInfo(self, info, index=None, returnSpeech=False, **kwargs):
+		self.assertTrue(returnSpeech)
+		self.fetched.append(index)
+		return [speech.IndexCommand(index), info.text]
+
+	def speakPreparedSpeech(self, speechSequence, preparedSequence):
+		self.spoken.append(preparedSequence[0].index)
+
+	def speak(self, speechSequence):
+		# Say all waits for a final index when the text is finished.
+		self.finalIndex = speechSequence[0].index
+		self.lastSpeechIndex = self.finalIndex
+
+	def startReading(self, lineCount):
+		obj = BasicTextProvider(text=u"".join(u"Line %d.\n" % line for line in xrange(lineCount)))
+		api.getReviewPosition = lambda: obj.makeTextInfo(textInfos.POSITION_FIRST)
+		return sayAllHandler.readTextHelper_generator(sayAllHandler.CURSOR_REVIEW)
+
+	def iterate(self, generator, count):
+		"""Runs a number of iterations of the say all loop.
+		@return: Whether say all finished.
+		"""
+		for iteration in xrange(count):
+			try:
+				next(generator)
+			except StopIteration:
+				return True
+		return False
+
+	def test_throttling(self):
+		generator = self.startReading(40)
+		self.assertFalse(self.iterate(generator, 20))
+		# Prepared speech is sent until 10 chunks are ahead of the synth,
+		# and no more chunks are fetched than the read ahead size.
+		self.assertEqual(self.spoken, range(1, 12))
+		self.assertEqual(self.fetched, range(1, 12 + self.READ_AHEAD))
+		self.lastSpeechIndex = 3
+		self.assertFalse(self.iterate(generator, 2))
+		self.assertEqual(self.spoken, range(1, 15))
+		# The review position follows the chunk being spoken.
+		self.assertEqual(self.reviewPositions, [len(u"Line 0.\n") * 2])
+
+	def test_finishesAfterLastChunkSpoken(self):
+		generator = self.startReading(3)
+		self.assertFalse(self.iterate(generator, 50))
+		self.assertEqual(self.spoken, [1, 2, 3])
+		self.lastSpeechIndex = 2
+		self.assertFalse(self.iterate(generator, 50))
+		self.lastSpeechIndex = 3
+		self.assertTrue(self.iterate(generator, 50))
+		self.assertEqual(self.finalIndex, 4)
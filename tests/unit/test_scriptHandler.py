@@ -7,7 +7,10 @@
 """Unit tests for the scriptHandler module."""
 
 import unittest
+import weakref
+import scriptHandler
 from scriptHandler import *
+from baseObject import ScriptableObject
 from inputCore import SCRCAT_MISC
 from sayAllHandler import CURSOR_CARET
 
@@ -33,3 +36,75 @@ class TestScriptDecorator(unittest.TestCase):
 		self.assertTrue(script_test.canPropagate)
 		self.assertTrue(script_test.bypassInputHelp)
 		self.assertEqual(script_test.resumeSayAllMode, CURSOR_CARET)
+
+class FakeGesture(object):
+
+	def __init__(self, identifier):
+		self.normalizedIdentifiers = [identifier]
+
+class FakeScriptableObject(ScriptableObject):
+
+	def script_a(self, gesture):
+		pass
+
+	def script_b(self, gesture):
+		pass
+
+	__gestures = {"kb:a": "a"}
+
+class OverriddenScriptableObject(FakeScriptableObject):
+
+	def getScript(self, gesture):
+		self.lookups += 1
+		return super(OverriddenScriptableObject, self).getScript(gesture)
+
+class TestObjScriptCache(unittest.TestCase):
+	"""Tests the caching of scripts found on objects by L{scriptHandler._getCachedObjScript}."""
+
+	def setUp(self):
+		scriptHandler._objScriptCache.clear()
+		self.lookups = 0
+		self._getObjScript = scriptHandler._getObjScript
+		def getObjScript(obj, gesture, globalMapScripts):
+			self.lookups += 1
+			return self._getObjScript(obj, gesture, globalMapScripts)
+		scriptHandler._getObjScript = getObjScript
+
+	def tearDown(self):
+		scriptHandler._getObjScript = self._getObjScript
+		scriptHandler._objScriptCache.clear()
+
+	def getScript(self, obj, identifier):
+		return scriptHandler._getCachedObjScript(obj, FakeGesture(identifier), (identifier,), ())
+
+	def test_hit(self):
+		obj = FakeScriptableObject()
+		self.assertEqual(self.getScript(obj, "kb:a"), obj.script_a)
+		self.assertEqual(self.getScript(obj, "kb:a"), obj.script_a)
+		self.assertIsNone(self.getScript(obj, "kb:b"))
+		self.assertIsNone(self.getScript(obj, "kb:b"))
+		self.assertEqual(self.lookups, 2)
+
+	def test_invalidatedByGestureMapChange(self):
+		obj = FakeScriptableObject()
+		self.assertIsNone(self.getScript(obj, "kb:b"))
+		obj.bindGesture("kb:b", "b")
+		self.assertEqual(self.getScript(obj, "kb:b"), obj.script_b)
+		obj.removeGestureBinding("kb:b")
+		self.assertIsNone(self.getScript(obj, "kb:b"))
+		self.assertEqual(self.lookups, 3)
+
+	def test_bypassedWhenGetScriptOverridden(self):
+		obj = OverriddenScriptableObject()
+		obj.lookups = 0
+		self.assertEqual(self.getScript(obj, "kb:a"), obj.script_a)
+		self.assertEqual(self.getScript(obj, "kb:a"), obj.script_a)
+		self.assertEqual(obj.lookups, 2)
+		self.assertEqual(len(scriptHandler._objScriptCache), 0)
+
+	def test_objectNotKeptAlive(self):
+		obj = FakeScriptableObject()
+		self.getScript(obj, "kb:a")
+		objRef = weakref.ref(obj)
+		del obj
+		self.assertIsNone(objRef())
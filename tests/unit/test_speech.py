@@ -0,0 +1,142 @@
+#tests/unit/test_speech.py
+#A part of NonVisual Desktop Access (NVDA)
+#This file is covered by the GNU General Public License.
+#See the file COPYING for more details.
+#Copyright (C) 2018 NV Access Limited
+
+"""Unit tests for the speech module."""
+
+import unittest
+import config
+import textInfos
+import speech
+from speech import IndexCommand, LangChangeCommand
+
+class TestPhraseAccumulator(unittest.TestCase):
+
+	def test_noBoundary(self):
+		accumulator = speech._PhraseAccumulator()
+		self.assertEqual(accumulator.add([u"hello", u"world"]), [])
+		self.assertEqual(accumulator.flush(), [u"hello", u"world"])
+		self.assertEqual(accumulator.flush(), [])
+
+	def test_boundary(self):
+		accumulator = speech._PhraseAccumulator()
+		index = IndexCommand(1)
+		lang = LangChangeCommand("fr")
+		accumulator.add([u"first"])
+		self.assertEqual(accumulator.add([lang, u"second. third", index, u"fourth"]),
+			[u"first", lang, u"second. "])
+		self.assertEqual(accumulator.flush(), [lang, u"third", index, u"fourth"])
+
+	def test_lastBoundaryUsed(self):
+		accumulator = speech._PhraseAccumulator()
+		self.assertEqual(accumulator.add([u"one. two", u"three! four"]), [u"one. two", u"three! "])
+		self.assertEqual(list(accumulator.pending), [u"four"])
+
+	def test_byteStrings(self):
+		accumulator = speech._PhraseAccumulator()
+		self.assertEqual(accumulator.add(["caf\xc3\xa9"]), [])
+		self.assertEqual(accumulator.add(["done. "]), ["caf\xc3\xa9", "done. "])
+
+class TestSpeechReadAhead(unittest.TestCase):
+
+	def setUp(self):
+		self._prepareSpeech = speech.prepareSpeech
+		speech.prepareSpeech = lambda speechSequence, symbolLevel=None: list(speechSequence)
+
+	def tearDown(self):
+		speech.prepareSpeech = self._prepareSpeech
+
+	def getReady(self, readAhead):
+		return [speechSequence for speechSequence, preparedSequence, lastIndex in readAhead._ready]
+
+	def test_preparesCompletedPhrases(self):
+		readAhead = speech.SpeechReadAhead()
+		first, second = IndexCommand(1), IndexCommand(2)
+		readAhead.add([first, u"one"])
+		self.assertEqual(len(readAhead), 0)
+		readAhead.add([second, u"two. three"])
+		self.assertEqual(self.getReady(readAhead), [[first, u"one", second, u"two. "]])
+		self.assertEqual(readAhead.lastPreparedIndex, 2)
+		readAhead.flush()
+		self.assertEqual(self.getReady(readAhead)[1], [u"three"])
+
+	def test_breakCommands(self):
+		readAhead = speech.SpeechReadAhead()
+		readAhead.add([u"one", speech.SpeakWithoutPausesBreakCommand(), u"two"])
+		self.assertEqual(self.getReady(readAhead), [[u"one"]])
+		readAhead.flush()
+		self.assertEqual(self.getReady(readAhead), [[u"one"], [u"two"]])
+		self.assertIsNone(readAhead.lastPreparedIndex)
+
+	def test_speakNext(self):
+		spoken = []
+		speakPreparedSpeech = speech.speakPreparedSpeech
+		lastSentIndex = speech.speakWithoutPauses.lastSentIndex
+		speech.speakPreparedSpeech = lambda speechSequence, preparedSequence: spoken.append((speechSequence, preparedSequence))
+		try:
+			readAhead = speech.SpeechReadAhead()
+			first, second = IndexCommand(1), IndexCommand(2)
+			readAhead.add([first, u"one. ", second, u"two. ", u"three"])
+			readAhead.flush()
+			self.assertEqual(readAhead.speakNext(), 2)
+			self.assertEqual(spoken, [([first, u"one. ", second, u"two. "], [first, u"one. ", second, u"two. "])])
+			self.assertEqual(speech.speakWithoutPauses.lastSentIndex, 2)
+			# The last index sent is kept when speaking a sequence without indexes.
+			self.assertIsNone(readAhead.speakNext())
+			self.assertEqual(spoken[1], ([u"three"], [u"three"]))
+			self.assertEqual(speech.speakWithoutPauses.lastSentIndex, 2)
+			self.assertEqual(len(readAhead), 0)
+		finally:
+			speech.speakPreparedSpeech = speakPreparedSpeech
+			speech.speakWithoutPauses.lastSentIndex = lastSentIndex
+
+class TestSpeechCommands(unittest.TestCase):
+
+	def test_characterModeShared(self):
+		self.assertIs(speech.CharacterModeCommand(True), speech.CharacterModeCommand(True))
+		self.assertIsNot(speech.CharacterModeCommand(True), speech.CharacterModeCommand(False))
+		self.assertFalse(speech.CharacterModeCommand(False).state)
+		with self.assertRaises(ValueError):
+			speech.CharacterModeCommand(1)
+
+	def test_langChangeShared(self):
+		self.assertIs(LangChangeCommand("fr"), LangChangeCommand("fr"))
+		self.assertEqual(LangChangeCommand("de").lang, "de")
+		self.assertIsNone(LangChangeCommand(None).lang)
+
+	def test_slots(self):
+		with self.assertRaises(AttributeError):
+			IndexCommand(1).extra = True
+
+class TestFieldSpeechCache(unittest.TestCase):
+
+	def setUp(self):
+		self.formatConfig = config.conf["documentFormatting"].snapshot()
+		speech._fieldSpeechCache.clear()
+
+	def test_formatFieldCached(self):
+		normal = textInfos.FormatField({"font-name": "Arial", "bold": False})
+		bold = textInfos.FormatField({"font-name": "Arial", "bold": True})
+		expected = []
+		attrsCache = {}
+		for attrs in (normal, bold, bold, normal):
+			expected.append(speech._getFormatFieldSpeech(attrs, attrsCache, self.formatConfig, None, None, False, False, speech.CHUNK_SEPARATOR))
+		for attempt in xrange(2):
+			attrsCache = {}
+			for attrs, text in zip((normal, bold, bold, normal), expected):
+				self.assertEqual(speech.getFormatFieldSpeech(attrs, attrsCache, self.formatConfig), text)
+				self.assertEqual(attrsCache, attrs)
+		self.assertEqual(speech.getFieldSpeechCacheStatistics()["size"], 4)
+
+	def test_unhashableValues(self):
+		attrs = textInfos.FormatField({"table-info": {"table-id": 1, "row-number": 1, "column-number": 1}, "other": [1]})
+		text = speech.getFormatFieldSpeech(attrs, None, self.formatConfig)
+		self.assertEqual(speech.getFormatFieldSpeech(attrs, None, self.formatConfig), text)
+
+	def test_clearedOnConfigChange(self):
+		speech.getFormatFieldSpeech(textInfos.FormatField({"font-name": "Arial"}), None, self.formatConfig)
+		self.assertEqual(len(speech._getFieldSpeechCache()), 1)
+		config.conf._handleChange()
+		self.assertEqual(len(speech._getFieldSpeechCache()), 0)
@@ -0,0 +1,98 @@
+# -*- coding: UTF-8 -*-
+#tests/unit/test_speechDictHandler.py
+#A part of NonVisual Desktop Access (NVDA)
+#This file is covered by the GNU General Public License.
+#See the file COPYING for more details.
+#Copyright (C) 2018 NV Access Limited
+
+"""Unit tests for the speechDictHandler module."""
+
+import unittest
+import random
+import speechDictHandler
+from speechDictHandler import SpeechDict, SpeechDictEntry, ENTRY_TYPE_ANYWHERE, ENTRY_TYPE_WORD, ENTRY_TYPE_REGEXP
+
+def subSequentially(speechDict, text):
+	for entry in speechDict:
+		text = entry.sub(text)
+	return text
+
+class TestCompiledSpeechDict(unittest.TestCase):
+	"""Tests that compiled speech dictionaries produce the same output as running each entry in sequence."""
+
+	def assertSameOutput(self, speechDict, texts):
+		for text in texts:
+			self.assertEqual(speechDict.sub(text), subSequentially(speechDict, text), msg=repr(text))
+
+	def test_anywhereAndWord(self):
+		d = SpeechDict()
+		d.append(SpeechDictEntry(u"nvda", u"non visual desktop access", u"", caseSensitive=False))
+		d.append(SpeechDictEntry(u"desk", u"table", u"", type=ENTRY_TYPE_WORD))
+		d.append(SpeechDictEntry(u"able", u"ABLE", u""))
+		self.assertSameOutput(d, [u"NVDA on my desk", u"desktop", u"table able", u""])
+		self.assertEqual(d.sub(u"NVDA"), u"non visual desktop access")
+
+	def test_replacementCreatesLaterMatch(self):
+		d = SpeechDict()
+		d.append(SpeechDictEntry(u"a", u"bc", u""))
+		d.append(SpeechDictEntry(u"cb", u"x", u""))
+		d.append(SpeechDictEntry(u"b", u"", u"", type=ENTRY_TYPE_WORD))
+		self.assertSameOutput(d, [u"aba", u"a b", u"cab"])
+
+	def test_overlappingPatterns(self):
+		d = SpeechDict()
+		d.append(SpeechDictEntry(u"ab", u"1", u""))
+		d.append(SpeechDictEntry(u"b", u"2", u""))
+		d.append(SpeechDictEntry(u"abc", u"3", u""))
+		d.append(SpeechDictEntry(u"bc", u"4", u""))
+		self.assertSameOutput(d, [u"abc", u"bcab", u"aabbcc"])
+
+	def test_regexpEntries(self):
+		d = SpeechDict()
+		d.append(SpeechDictEntry(u"([a-z])([A-Z])", r"\1 \2", u"", type=ENTRY_TYPE_REGEXP))
+		d.append(SpeechDictEntry(u"(a)\\1", u"double", u"", type=ENTRY_TYPE_REGEXP))
+		d.append(SpeechDictEntry(u"(?P<x>b)c", u"y", u"", type=ENTRY_TYPE_REGEXP))
+		d.append(SpeechDictEntry(u"(?P<x>c)d", u"z", u"", type=ENTRY_TYPE_REGEXP))
+		d.append(SpeechDictEntry(u"(?i)Q", u"kew", u"", type=ENTRY_TYPE_REGEXP))
+		d.append(SpeechDictEntry(u"e*", u"-", u"", type=ENTRY_TYPE_REGEXP))
+		self.assertSameOutput(d, [u"aaBcd", u"camelCase", u"qQ", u"", u"bcd"])
+
+	def test_emptyPattern(self):
+		d = SpeechDict()
+		d.append(SpeechDictEntry(u"", u"-", u""))
+		d.append(SpeechDictEntry(u"", u"+", u"", type=ENTRY_TYPE_WORD))
+		self.assertSameOutput(d, [u"ab cd", u""])
+
+	def test_recompiledAfterEdit(self):
+		d = SpeechDict()
+		d.append(SpeechDictEntry(u"a", u"b", u""))
+		self.assertEqual(d.sub(u"a"), u"b")
+		d[0] = SpeechDictEntry(u"a", u"c", u"")
+		self.assertEqual(d.sub(u"a"), u"c")
+		d.append(SpeechDictEntry(u"c", u"d", u""))
+		self.assertEqual(d.sub(u"a"), u"d")
+		del d[:]
+		self.assertEqual(d.sub(u"a"), u"a")
+
+	def test_randomDictionaries(self):
+		rand = random.Random(0)
+		alphabet = u"abAB é_1"
+		patterns = [u"([a-z])([A-Z])", u"(a)\\1", u"b+", u"(?i)x", u"^a", u"e$", u"a*", u"\\d", u"(?=a)"]
+		randomText = lambda maxLength: u"".join(rand.choice(alphabet) for i in xrange(rand.randint(0, maxLength)))
+		for trial in xrange(200):
+			d = SpeechDict()
+			for i in xrange(rand.randint(0, 12)):
+				entryType = rand.choice((ENTRY_TYPE_ANYWHERE, ENTRY_TYPE_ANYWHERE, ENTRY_TYPE_WORD, ENTRY_TYPE_REGEXP))
+				pattern = rand.choice(patterns) if entryType == ENTRY_TYPE_REGEXP else randomText(3)
+				d.append(SpeechDictEntry(pattern, randomText(3), u"", caseSensitive=rand.random() < 0.5, type=entryType))
+			self.assertSameOutput(d, [randomText(30) for i in xrange(5)])
+
+class TestLiteralTrie(unittest.TestCase):
+
+	def test_findValues(self):
+		trie = speechDictHandler._LiteralTrie()
+		for index, string in enumerate((u"he", u"she", u"his", u"hers")):
+			trie.add(string, index)
+		trie.finalize()
+		self.assertEqual(trie.findValues(u"ushers"), {0, 1, 3})
+		self.assertEqual(trie.findValues(u"hi"), set())
@@ -8,8 +8,9 @@
 """Unit tests for the textInfos module, its submodules and classes."""
 
 import unittest
-from .textProvider import BasicTextProvider
+from .textProvider import BasicTextProvider, BasicTextInfo
 import textInfos
+from textInfos import offsets
 from textInfos.offsets import Offsets
 
 class TestCharacterOffsets(unittest.TestCase):
@@ -129,3 +130,128 @@ class TestCharacterOffsets(unittest.TestCase):
 		ti.move(textInfos.UNIT_CHARACTER, -1)
 		ti.expand(textInfos.UNIT_CHARACTER) # Range at a
 		self.assertEqual(ti.offsets, (0, 1)) # One offset
+
+class TestLineStartIndex(unittest.TestCase):
+	"""Tests that line offsets looked up in a L{textInfos.offsets.LineStartIndex}
+	are the same as those found by searching the text.
+	"""
+
+	TEXTS = (u"", u"a", u"\n", u"ab\ncd", u"ab\r\ncd\r\n", u"\n\nab\n\r\n", u"ab\rcd\ref", u"a\rb\nc\r\nd\r")
+
+	def test_lineOffsets(self):
+		for text in self.TEXTS:
+			index = offsets.LineStartIndex(text)
+			for offset in range(len(text) + 2):
+				expected = [offsets.findStartOfLine(text, offset), offsets.findEndOfLine(text, offset)]
+				self.assertEqual(index.getLineOffsets(offset), expected, msg="%r at %d" % (text, offset))
+
+	def test_lineNumbers(self):
+		index = offsets.LineStartIndex(u"ab\ncd\r\n\nef")
+		self.assertEqual([index.getLineNumFromOffset(offset) for offset in range(10)], [0, 0, 0, 1, 1, 1, 1, 2, 3, 3])
+		self.assertEqual(index.lineCount, 4)
+
+	def test_reusedForSameText(self):
+		text = u"ab\ncd"
+		index = offsets.getLineStartIndex(text)
+		self.assertIs(offsets.getLineStartIndex(text), index)
+		self.assertIsNot(offsets.getLineStartIndex(u"ab\ncde"), index)
+		# Texts are not compared by value.
+		self.assertIsNot(offsets.getLineStartIndex(u"".join(text)), offsets.getLineStartIndex(text))
+
+class TestWordBoundaries(unittest.TestCase):
+	"""Tests that word offsets from L{textInfos.offsets.WordBoundaries}
+	are the same as those found by searching the text.
+	"""
+
+	TEXTS = (u"", u"a", u" ", u"ab cd", u"  ab,cd  ", u"ab\tcd\n", u"e\u0301t\xe9 12.5 \u3000x", u"a\u200bb -- c")
+
+	def test_wordOffsets(self):
+		for text in self.TEXTS:
+			boundaries = offsets.WordBoundaries(text)
+			for offset in range(len(text) + 2):
+				expected = [offsets.findStartOfWord(text, offset), offsets.findEndOfWord(text, offset)]
+				self.assertEqual(boundaries.getWordOffsets(offset), expected, msg="%r at %d" % (text, offset))
+
+	def test_keptPerLine(self):
+		index = offsets.LineStartIndex(u"ab cd\nef\xa0gh")
+		boundaries = index.getWordBoundaries(0, 6)
+		self.assertIs(index.getWordBoundaries(0, 6), boundaries)
+		self.assertEqual(boundaries.getWordOffsets(3), [3, 6])
+		# Non-breaking space separates words.
+		self.assertEqual(index.getWordBoundaries(6, 11).getWordOffsets(0), [0, 3])
+
+	def test_lineTextNotExtracted(self):
+		obj = BasicTextProvider(text=u"one two\nthree")
+		ti = obj.makeTextInfo(Offsets(4, 4))
+		ti._getTextRange = None
+		ti.expand(textInfos.UNIT_WORD)
+		self.assertEqual(ti.offsets, (4, 8))
+
+	def test_moveByWord(self):
+		obj = BasicTextProvider(text=u"one, two\nthree")
+		ti = obj.makeTextInfo(Offsets(0, 0))
+		words = []
+		while True:
+			ti.expand(textInfos.UNIT_WORD)
+			words.append(ti.text)
+			ti.collapse()
+			if not ti.move(textInfos.UNIT_WORD, 1):
+				break
+		self.assertEqual(words, [u"one", u", ", u"two\n", u"three"])
+
+class SearchedLinesTextInfo(BasicTextInfo):
+	useLineStartIndex = False
+
+class SearchedLinesTextProvider(BasicTextProvider):
+	TextInfo = SearchedLinesTextInfo
+
+class TestLineMovement(unittest.TestCase):
+	"""Tests that moving by lines with a line start index gives the same result as searching the text for each line."""
+
+	TEXT = u"one\ntwo\r\n\nthree\nfour\r\nfive\n"
+
+	def test_moveByLines(self):
+		obj = BasicTextProvider(text=self.TEXT)
+		searchedObj = SearchedLinesTextProvider(text=self.TEXT)
+		for start in range(len(self.TEXT) + 1):
+			for direction in (-10, -4, -2, -1, 1, 2, 4, 10):
+				for endPoint in (None, "start", "end"):
+					ti = obj.makeTextInfo(Offsets(start, start))
+					expected = searchedObj.makeTextInfo(Offsets(start, start))
+					self.assertEqual(
+						(ti.move(textInfos.UNIT_LINE, direction, endPoint), ti.offsets),
+						(expected.move(textInfos.UNIT_LINE, direction, endPoint), expected.offsets),
+						msg="%d lines from %d" % (direction, start)
+					)
+
+class TestInternField(unittest.TestCase):
+
+	def test_equalFieldsShared(self):
+		first = textInfos.internField(textInfos.ControlField(role=1, states={2, 3}))
+		second = textInfos.internField(textInfos.ControlField(role=1, states={3, 2}))
+		self.assertIs(first, second)
+		self.assertIsInstance(first, textInfos.ControlField)
+		self.assertEqual(first["states"], frozenset({2, 3}))
+		self.assertIsNot(first, textInfos.internField(textInfos.FormatField(role=1, states={2, 3})))
+
+	def test_comparison(self):
+		field = textInfos.internField(textInfos.FormatField(bold=True))
+		self.assertEqual(field, {"bold": True})
+		self.assertNotEqual(field, textInfos.internField(textInfos.FormatField(bold=False)))
+		self.assertFalse(field != textInfos.FormatField(bold=True))
+		self.assertEqual(hash(field), hash(textInfos.internField(textInfos.FormatField(bold=True))))
+
+	def test_immutable(self):
+		field = textInfos.internField(textInfos.FormatField(bold=True))
+		with self.assertRaises(TypeError):
+			field["bold"] = False
+		with self.assertRaises(TypeError):
+			del field["bold"]
+		copy = field.copy()
+		copy["bold"] = False
+		self.assertIs(type(copy), textInfos.FormatField)
+		self.assertTrue(field["bold"])
+
+	def test_unhashableValues(self):
+		field = textInfos.FormatField({"table-info": {"row-number": 1}})
+		self.assertIs(textInfos.internField(field), field)
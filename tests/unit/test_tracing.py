@@ -0,0 +1,68 @@
+#tests/unit/test_tracing.py
+#A part of NonVisual Desktop Access (NVDA)
+#This file is covered by the GNU General Public License.
+#See the file COPYING for more details.
+#Copyright (C) 2018 NV Access Limited
+
+"""Unit tests for the tracing module."""
+
+import unittest
+import json
+import os
+import tempfile
+import tracing
+
+class TestTracing(unittest.TestCase):
+
+	def setUp(self):
+		tracing.clear()
+		tracing.isEnabled = True
+
+	def tearDown(self):
+		tracing.isEnabled = False
+		tracing.clear()
+
+	def test_disabled(self):
+		tracing.isEnabled = False
+		with tracing.span(tracing.CATEGORY_EVENT, "gainFocus"):
+			pass
+		tracing.markInput("kb:a")
+		tracing.markOutput("speech")
+		self.assertEqual(tracing.getSummary(), {})
+
+	def test_summary(self):
+		for duration in xrange(1, 101):
+			tracing.record(tracing.CATEGORY_SCRIPT, "script_test", 0, duration / 1000.0)
+		tracing.recordCounter("eventQueue", 3)
+		stats = tracing.getSummary()[(tracing.CATEGORY_SCRIPT, "script_test")]
+		self.assertEqual(stats["count"], 100)
+		self.assertAlmostEqual(stats["mean"], 50.5)
+		self.assertAlmostEqual(stats["p90"], 90)
+		self.assertAlmostEqual(stats["max"], 100)
+		self.assertIn("script: script_test", tracing.formatSummary())
+
+	def test_latency(self):
+		tracing.markInput("kb:a")
+		tracing.markOutput("speech")
+		tracing.markOutput("speech")
+		tracing.markOutput("braille")
+		summary = tracing.getSummary()
+		self.assertEqual(summary[(tracing.CATEGORY_LATENCY, "input to speech")]["count"], 1)
+		self.assertEqual(summary[(tracing.CATEGORY_LATENCY, "input to braille")]["count"], 1)
+
+	def test_chromeTrace(self):
+		with tracing.span(tracing.CATEGORY_EVENT, "gainFocus"):
+			with tracing.span(tracing.CATEGORY_SCRIPT, "script_test"):
+				pass
+		tracing.recordCounter("eventQueue", 3)
+		fileName = os.path.join(tempfile.gettempdir(), "test_tracing.json")
+		tracing.dumpChromeTrace(fileName)
+		try:
+			with open(fileName) as f:
+				events = json.load(f)["traceEvents"]
+		finally:
+			os.remove(fileName)
+		self.assertEqual([(event["name"], event["ph"]) for event in events],
+			[("script_test", "X"), ("gainFocus", "X"), ("eventQueue", "C")])
+		self.assertGreaterEqual(events[1]["dur"], events[0]["dur"])
+		self.assertEqual(events[2]["args"], {"eventQueue": 3})